@@ -0,0 +1,125 @@
+"""Benchmark num2fawords.
+
+Run from the project root, e.g.::
+
+    python benchmark --json before.json
+    # ... change the code ...
+    python benchmark --compare before.json
+
+The same cases can also be run using pyperf (bench_pyperf.py) or
+pytest-benchmark (``pytest benchmark/bench_pytest.py``).
+"""
+
+import json
+import platform
+import sys
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from statistics import median
+from timeit import Timer
+
+from cases import CASES
+
+
+def run(cases, repeat: int) -> dict:
+    """Return the timings of cases in seconds per call."""
+    results = {}
+    for case in cases:
+        with case as func:
+            timer = Timer(func)
+            loops, _ = timer.autorange()
+            times = [t / loops for t in timer.repeat(repeat, loops)]
+        results[case.name] = {
+            'best': min(times),
+            'median': median(times),
+            'loops': loops,
+        }
+        print('{:40} {:>12.3f} us'.format(case.name, min(times) * 1e6))
+    return results
+
+
+def compare(old: dict, new: dict, threshold: float) -> int:
+    """Print the changes between two results. Return the regression count."""
+    regressions = 0
+    for name, timing in new.items():
+        if name not in old:
+            continue
+        ratio = timing['best'] / old[name]['best']
+        if ratio > 1 + threshold:
+            flag = 'slower'
+            regressions += 1
+        elif ratio < 1 - threshold:
+            flag = 'faster'
+        else:
+            flag = ''
+        print('{:40} {:>10.3f} -> {:>10.3f} us {:>6.2f}x {}'.format(
+            name, old[name]['best'] * 1e6, timing['best'] * 1e6, ratio, flag))
+    return regressions
+
+
+def main():
+    parser = ArgumentParser(prog='python benchmark')
+    parser.add_argument(
+        '-k', dest='pattern', default='*',
+        help='only run the cases, or with --comparisons the comparisons'
+        ' without their bench_ prefix, whose names match this glob pattern',
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=5, help='timing repetitions per case',
+    )
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument(
+        '--compare', metavar='JSON',
+        help='compare the results with a previous --json file and exit with'
+        ' status 1 if any case is slower by more than the threshold',
+    )
+    parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help='relative change reported as a regression (default: 0.1)',
+    )
+    parser.add_argument(
+        '--comparisons', action='store_true',
+        help='compare optimized code paths with the ones they replaced',
+    )
+    parser.add_argument(
+        '--startup', action='store_true',
+        help='measure the import time and check it against a budget',
+    )
+    args = parser.parse_args()
+
+    if args.startup:
+        import startup
+        return startup.main()
+
+    if args.comparisons:
+        import comparisons
+        comparisons.run_all(args.pattern)
+        return 0
+
+    results = run(
+        [case for case in CASES if fnmatch(case.name, args.pattern)],
+        args.repeat,
+    )
+    if args.json:
+        with open(args.json, 'w', encoding='utf8') as f:
+            json.dump({
+                'metadata': {
+                    'python': sys.version,
+                    'implementation': platform.python_implementation(),
+                    'platform': platform.platform(),
+                    'date': datetime.now(timezone.utc).isoformat(),
+                },
+                'benchmarks': results,
+            }, f, indent=1, sort_keys=True)
+    if args.compare:
+        with open(args.compare, encoding='utf8') as f:
+            old = json.load(f)['benchmarks']
+        print()
+        if compare(old, results, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""Run the benchmark cases using pyperf.
+
+For example::
+
+    python benchmark/bench_pyperf.py -o before.json
+    python benchmark/bench_pyperf.py -o after.json
+    python -m pyperf compare_to before.json after.json
+"""
+
+from time import perf_counter
+
+import pyperf
+
+from cases import CASES
+
+
+def time_case(loops: int, case) -> float:
+    with case as func:
+        range_it = range(loops)
+        t0 = perf_counter()
+        for _ in range_it:
+            func()
+        return perf_counter() - t0
+
+
+if __name__ == '__main__':
+    runner = pyperf.Runner()
+    for case in CASES:
+        runner.bench_time_func(case.name, time_case, case)
@@ -0,0 +1,19 @@
+"""Run the benchmark cases using pytest-benchmark.
+
+For example::
+
+    pytest benchmark/bench_pytest.py --benchmark-json=before.json
+    pytest benchmark/bench_pytest.py --benchmark-compare
+"""
+
+import pytest
+
+from cases import CASES
+
+pytest.importorskip('pytest_benchmark')
+
+
+@pytest.mark.parametrize('case', CASES, ids=[case.name for case in CASES])
+def test_case(benchmark, case):
+    with case as func:
+        benchmark(func)
@@ -0,0 +1,177 @@
+"""The benchmark cases shared by all the benchmark runners.
+
+Each case converts a single input through one public code path. Inputs
+span small, typical, and near the CLASSES limit (36 digits) magnitudes.
+"""
+
+import subprocess
+import sys
+from decimal import Decimal
+from fractions import Fraction
+from io import StringIO
+from os.path import abspath, dirname
+from unittest.mock import patch
+
+PROJECT_ROOT = dirname(dirname(abspath(__file__)))
+# Benchmark the working tree, even if num2fawords is installed.
+sys.path.insert(0, PROJECT_ROOT)
+
+from num2fawords import (
+    Formatter, change_defaults, disable_cache, enable_cache, ordinal_words,
+    parse_words, transliterate_text, words, words_many,
+)
+from num2fawords.__main__ import main as cli_main
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+MAGNITUDES = {
+    'small': 7,
+    'typical': 123456789,
+    'limit': 987654321987654321987654321987654321,
+}
+
+_PERSIAN_DIGITS = str.maketrans('0123456789', '۰۱۲۳۴۵۶۷۸۹')
+
+_CUSTOM_DEFAULTS = (
+    'مثبت ', 'منهای ', ' ممیز ', ' روی ', False, ' در ده به توان ',
+)
+_DEFAULTS = ('', 'منفی ', ' و ', ' ', True, ' در ده به توان ')
+
+
+class Case:
+
+    """A benchmark case.
+
+    func is called without arguments. setup and teardown, if given, are
+    called before and after timing it.
+    """
+
+    __slots__ = ('name', 'func', 'setup', 'teardown')
+
+    def __init__(self, name: str, func, setup=None, teardown=None):
+        self.name = name
+        self.func = func
+        self.setup = setup
+        self.teardown = teardown
+
+    def __enter__(self):
+        if self.setup is not None:
+            self.setup()
+        return self.func
+
+    def __exit__(self, *_):
+        if self.teardown is not None:
+            self.teardown()
+
+
+def _customize():
+    change_defaults(*_CUSTOM_DEFAULTS)
+
+
+def _reset():
+    change_defaults(*_DEFAULTS)
+
+
+def _persian(n: int) -> str:
+    return '{:,}'.format(n).replace(',', '٬').translate(_PERSIAN_DIGITS)
+
+
+def _run_cli(*args, stdin=None):
+    subprocess.run(
+        (sys.executable, '-m', 'num2fawords') + args, input=stdin,
+        stdout=subprocess.DEVNULL, check=True, cwd=PROJECT_ROOT,
+        universal_newlines=True,
+    )
+
+
+def _stream_cli(stdin: str):
+    with patch('sys.stdin', StringIO(stdin)), patch('sys.stdout', StringIO()):
+        cli_main(['-'])
+
+
+def _cases() -> list:
+    cases = []
+    add = cases.append
+    formatter = Formatter(*_CUSTOM_DEFAULTS)
+    for magnitude, n in MAGNITUDES.items():
+        digits = str(n)
+        float_ = float(digits[:3] + '.' + digits[3:6]) if n > 10 else 7.25
+        if magnitude == 'limit':
+            float_ = float(n)  # rendered in scientific notation
+        text = words(n)
+        values = (
+            ('int', n),
+            ('negative-int', -n),
+            ('float', float_),
+            ('str', digits),
+            ('str-persian', _persian(n)),
+            ('str-decimal', digits + '.25'),
+            ('str-scientific', digits[:1] + '.' + digits[1:6] + 'e-7'),
+            ('decimal', Decimal(digits + '.25')),
+            ('fraction', Fraction(n, 7)),
+        )
+        for name, value in values:
+            add(Case(
+                'words/{}/{}'.format(name, magnitude),
+                lambda value=value: words(value),
+            ))
+        add(Case(
+            'words/keywords/{}'.format(magnitude),
+            lambda n=n: words(
+                n, positive='مثبت ', negative='منهای ',
+                decimal_separator=' ممیز ', fraction_separator=' روی ',
+                ordinal_denominator=False,
+                scientific_separator=' در ده به توان ',
+            ),
+        ))
+        add(Case(
+            'words/change_defaults/{}'.format(magnitude),
+            lambda value=Decimal(digits + '.25'): words(value),
+            _customize, _reset,
+        ))
+        add(Case(
+            'words/cached/{}'.format(magnitude),
+            lambda n=n: words(n), enable_cache, disable_cache,
+        ))
+        add(Case(
+            'formatter/{}'.format(magnitude),
+            lambda n=n: formatter.words(n),
+        ))
+        add(Case(
+            'ordinal_words/{}'.format(magnitude),
+            lambda n=n: ordinal_words(n),
+        ))
+        add(Case(
+            'ordinal_words/suffix/{}'.format(magnitude),
+            lambda n=n: ordinal_words(n, suffix='ین'),
+        ))
+        add(Case(
+            'parse_words/{}'.format(magnitude),
+            lambda text=text: parse_words(text),
+        ))
+    numbers = list(range(10 ** 5, 10 ** 5 + 1000))
+    add(Case('words_many/1000', lambda: words_many(numbers)))
+    if numpy is not None:
+        array = numpy.array(numbers)
+        add(Case('words_many/ndarray-1000', lambda: words_many(array)))
+    stdin = '\n'.join(map(str, numbers)) + '\n'
+    text = ''.join(
+        'در سال {} مبلغ {:,} ریال پرداخت شد. '.format(1300 + i % 100, n)
+        for i, n in enumerate(numbers)
+    )
+    add(Case(
+        'transliterate_text/1000', lambda: ''.join(transliterate_text(text)),
+    ))
+    add(Case('cli/stdin/1000', lambda: _stream_cli(stdin)))
+    add(Case('cli/process/number', lambda: _run_cli('123456789')))
+    add(Case(
+        'cli/process/stdin-1000', lambda: _run_cli('-', stdin=stdin),
+    ))
+    return cases
+
+
+CASES = _cases()
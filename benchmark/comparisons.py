@@ -0,0 +1,564 @@
+"""Compare optimized code paths with the approaches they replaced.
+
+Run from the project root using ``python benchmark --comparisons``, add
+``-k workers`` to only run bench_workers.
+"""
+
+import os
+from fnmatch import fnmatch
+from random import Random
+from timeit import repeat
+
+import num2fawords
+from num2fawords import Formatter, words, words_many
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Typical 6 to 12 digit invoice amounts.
+TYPICAL_INTS = [
+    250000, 1999000, 48500000, 123456789, 7250000000, 987654321012,
+]
+
+
+def best_of(stmt, number=10000, repeat_=5) -> float:
+    """Return the best time of a single call to stmt in microseconds."""
+    return min(repeat(stmt, number=number, repeat=repeat_)) / number * 1e6
+
+
+class _ComputedGroupWords:
+
+    """Compute the group words on every lookup, like before the table."""
+
+    def __getitem__(self, number):
+        return num2fawords._three_digit_words(number)
+
+
+def bench_group_words():
+    """Compare the precomputed group table with per-group computation."""
+    print('group words (6 to 12 digit ints):')
+    engine = num2fawords._engine()
+    group_words = engine.group_words
+    for n in TYPICAL_INTS:
+        table = best_of(lambda: words(n))
+        engine.group_words = _ComputedGroupWords()
+        try:
+            computed = best_of(lambda: words(n))
+        finally:
+            engine.group_words = group_words
+        print('  {:>12}: {:6.2f} us -> {:6.2f} us ({:.2f}x)'.format(
+            n, computed, table, computed / table))
+
+
+def bench_words_many():
+    """Compare words_many on an integer NumPy array with a words loop."""
+    if numpy is None:
+        print('words_many: skipped, numpy is not installed')
+        return
+    random = Random(0)
+    values = [random.randrange(10 ** 5, 10 ** 12) for _ in range(100000)]
+    array = numpy.array(values)
+    loop = best_of(lambda: [words(n) for n in values], 1, 3)
+    many = best_of(lambda: words_many(array), 1, 3)
+    print('words_many ({} ints): {:.0f} ms -> {:.0f} ms ({:.2f}x)'.format(
+        len(values), loop / 1e3, many / 1e3, loop / many))
+
+
+def bench_int_words():
+    """Compare the integer engine with converting the int to str first."""
+    print('int engine:')
+    engine = num2fawords._engine()
+    for digits in (6, 12, 24, 30, 36):
+        n = int('987654321' * 4) % 10 ** digits
+        via_str = best_of(lambda: engine.natural_words(str(n)))
+        direct = best_of(lambda: engine.int_words(n))
+        print('  {:>2} digits: {:6.2f} us -> {:6.2f} us ({:.2f}x)'.format(
+            digits, via_str, direct, via_str / direct))
+
+
+def bench_large_ints():
+    """Show how the time grows with the number of digits beyond CLASSES.
+
+    The scale names nest the last class once per chunk of groups, so the
+    length of the words grows linearly with the number of digits.
+    """
+    print('large ints:')
+    for digits in (1000, 2000, 4000, 8000, 16000):
+        n = 10 ** digits // 7
+        s = ('142857' * digits)[:digits]  # the digits of n
+        int_time = best_of(lambda: words(n), 10, 3)
+        str_time = best_of(lambda: words(s), 10, 3)
+        print(
+            '  {:>5} digits: int {:8.0f} us, str {:8.0f} us, {} chars'.format(
+                digits, int_time, str_time, len(words(n))))
+
+
+def bench_formatter():
+    """Compare Formatter methods with passing the options to words."""
+    options = {
+        'positive': 'مثبت ',
+        'negative': 'منهای ',
+        'decimal_separator': ' ممیز ',
+        'fraction_separator': ' روی ',
+        'ordinal_denominator': False,
+        'scientific_separator': ' ضربدر ده به توان ',
+    }
+    formatter_words = Formatter(**options).words
+    print('Formatter:')
+    for n in (7, 123456789, -3.25, '۱۲۳٬۴۵۶'):
+        keywords = best_of(lambda: words(n, **options))
+        formatter = best_of(lambda: formatter_words(n))
+        print('  {!r:>11}: {:6.2f} us -> {:6.2f} us ({:.2f}x)'.format(
+            n, keywords, formatter, keywords / formatter))
+
+
+def bench_cache():
+    """Compare words with and without the cache on skewed workloads.
+
+    With the C engine ints are not cached, see enable_cache.
+    """
+    random = Random(0)
+    values = [random.randrange(1, 32) for _ in range(5000)]
+    values += [random.randrange(1300, 1451) for _ in range(5000)]
+    values += [random.randrange(1, 100) * 10000 for _ in range(5000)]
+    random.shuffle(values)
+    print('cache ({} skewed values):'.format(len(values)))
+    for name, workload in (
+        ('ints', values),
+        ('amounts', ['{}.{:02}'.format(n, n % 100) for n in values]),
+    ):
+        uncached = best_of(lambda: [words(n) for n in workload], 1, 5)
+        num2fawords.enable_cache(1024)
+        try:
+            cached = best_of(lambda: [words(n) for n in workload], 1, 5)
+            info = num2fawords.cache_info()
+        finally:
+            num2fawords.disable_cache()
+        lookups = info.hits + info.misses
+        print(
+            '  {:>7}: {:5.1f} ms -> {:5.1f} ms ({:.2f}x),'
+            ' hit rate {:.1%}'.format(
+                name, uncached / 1e3, cached / 1e3, uncached / cached,
+                info.hits / lookups if lookups else 0,
+            ))
+
+
+def bench_persistent_cache():
+    """Compare Formatter.words_many with a warm PersistentCache."""
+    from decimal import Decimal
+    from tempfile import TemporaryDirectory
+    from num2fawords.persistent import PersistentCache
+    formatter = Formatter()
+    count = 100000
+    print('persistent cache ({} values, warm):'.format(count))
+    for name, values in (
+        ('ints', TYPICAL_INTS * (count // len(TYPICAL_INTS))),
+        ('decimals', [
+            Decimal(n).scaleb(-6) + 123456789012 for n in range(count)]),
+    ):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'words.sqlite')
+            with PersistentCache(path, formatter) as cache:
+                cache.words_many(values)
+            direct = best_of(lambda: formatter.words_many(values), 1, 3)
+            with PersistentCache(path, formatter) as cache:
+                cached = best_of(lambda: cache.words_many(values), 1, 3)
+        print('  {:>8}: {:7.1f} ms -> {:7.1f} ms ({:.2f}x)'.format(
+            name, direct / 1e3, cached / 1e3, direct / cached))
+
+
+def bench_aio():
+    """Compare the event loop latency of words_many and awords_many."""
+    import asyncio
+    from time import perf_counter
+    from num2fawords.aio import awords_many
+    formatter = Formatter()
+    values = TYPICAL_INTS * 20000 + [10 ** 5000 // 7]
+
+    async def max_latency(convert) -> float:
+        latencies = []
+
+        async def tick():
+            while True:
+                t0 = perf_counter()
+                await asyncio.sleep(0)
+                latencies.append(perf_counter() - t0)
+
+        ticker = asyncio.ensure_future(tick())
+        await asyncio.sleep(0)
+        t0 = perf_counter()
+        await convert()
+        total = perf_counter() - t0
+        await asyncio.sleep(0)  # let the ticker see the last delay
+        ticker.cancel()
+        return max(latencies) * 1e3, total * 1e3
+
+    async def inline():
+        formatter.words_many(values)
+
+    for name, convert in (
+        ('words_many', inline),
+        ('awords_many', lambda: awords_many(values, formatter)),
+    ):
+        latency, total = asyncio.run(max_latency(convert))
+        print('{:>12} ({} values): {:7.1f} ms, max loop latency {:.1f} ms'
+              .format(name, len(values), total, latency))
+
+
+def bench_workers():
+    """Measure how words_many scales with the number of worker processes."""
+    random = Random(0)
+    values = [random.randrange(10 ** 5, 10 ** 12) for _ in range(400000)]
+    print('words_many workers ({} ints, {} CPUs):'.format(
+        len(values), os.cpu_count()))
+    serial = best_of(lambda: words_many(values), 1, 3)
+    print('  1: {:.0f} ms'.format(serial / 1e3))
+    for workers in (2, 4, 8):
+        parallel = best_of(
+            lambda: words_many(values, workers=workers), 1, 3)
+        print('  {}: {:.0f} ms ({:.2f}x)'.format(
+            workers, parallel / 1e3, serial / parallel))
+
+
+def bench_parse_words():
+    """Compare verifying amounts by parsing words with re-rendering them."""
+    random = Random(0)
+    amounts = [random.randrange(10 ** 5, 10 ** 12) for _ in range(1000)]
+    texts = [words(n) for n in amounts]
+    pairs = list(zip(amounts, texts))
+    parse_words = num2fawords.parse_words
+    render = best_of(lambda: [words(n) == t for n, t in pairs], 10, 5)
+    parse = best_of(lambda: [parse_words(t) == n for n, t in pairs], 10, 5)
+    print('verify {} amounts: render {:.2f} ms, parse {:.2f} ms'.format(
+        len(pairs), render / 1e3, parse / 1e3))
+
+
+def bench_str_words():
+    """Compare the single-pass str tokenizer with normalizing first."""
+    engine = num2fawords._engine()
+    table = num2fawords._NORMALIZATION_TABLE
+    options = ('', 'منفی ', ' و ', ' ', True, ' در ده به توان ')
+    print('str input:')
+    for s in (
+        '1234567', '۱۲۳۴۵۶۷', '12.75', '۱۲٫۷۵', '3.5e-7', '1,234,567',
+        '۱۲۳٬۴۵۶', '-1,234.5', '3/4', '۱/۲',
+    ):
+        normalized = best_of(lambda: engine.normalized_str_words(
+            str(s).strip().translate(table), *options))
+        single_pass = best_of(lambda: engine.str_words(s, *options))
+        print('  {!r:>11}: {:6.2f} us -> {:6.2f} us ({:.2f}x)'.format(
+            s, normalized, single_pass, normalized / single_pass))
+
+
+def bench_scientific():
+    """Compare the precomputed exponent words with converting the exponent.
+    """
+    from decimal import Decimal
+    print('scientific notation:')
+    engine = num2fawords._engine()
+    exponents = engine.exponents
+    for n in (
+        1.5e-07, 6.02214076e+23, 5e-324, '1.5e-7', '6.02214076E+23',
+        Decimal('1.25E-12'),
+    ):
+        table = best_of(lambda: words(n))
+        engine.exponents = {}
+        try:
+            parsed = best_of(lambda: words(n))
+        finally:
+            engine.exponents = exponents
+        print('  {!r:>24}: {:6.2f} us -> {:6.2f} us ({:.2f}x)'.format(
+            n, parsed, table, parsed / table))
+    formatter = Formatter(normalize_mantissa=True)
+    n = '602.214076e21'
+    print('  normalize_mantissa {!r}: {:.2f} us -> {:.2f} us'.format(
+        n, best_of(lambda: words(n)), best_of(lambda: formatter.words(n))))
+
+
+def bench_threads(count=200000):
+    """Compare the throughput of a Formatter in 1 to 8 threads.
+
+    With the GIL the threads take turns, so the throughput stays flat. On a
+    free-threaded build (python3.13t) it should grow with the number of
+    cores, as the conversions do not share any mutable state.
+    """
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+    from time import perf_counter
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)
+    formatter = Formatter()
+    values = TYPICAL_INTS * (count // len(TYPICAL_INTS))
+    print('threads ({} ints, GIL {}, {} CPUs):'.format(
+        len(values), 'enabled' if is_gil_enabled() else 'disabled',
+        os.cpu_count()))
+    base = None
+    for workers in (1, 2, 4, 8):
+        size = -(-len(values) // workers)
+        chunks = [values[i:i + size] for i in range(0, len(values), size)]
+        with ThreadPoolExecutor(workers) as executor:
+            best = float('inf')
+            for _ in range(3):
+                t0 = perf_counter()
+                list(executor.map(formatter.words_many, chunks))
+                best = min(best, perf_counter() - t0)
+        rate = len(values) / best
+        if base is None:
+            base = rate
+        print('  {} threads: {:9.0f} numbers/s ({:.2f}x)'.format(
+            workers, rate, rate / base))
+
+
+def bench_dispatch():
+    """Compare the exact int and str fast path with singledispatch."""
+    num2fawords._register_types()
+    dispatch = num2fawords._words
+    options = ('', 'منفی ', ' و ', ' ', True, ' در ده به توان ')
+    print('words dispatch:')
+    for n in (7, -7, 123456789, '7', '123456789'):
+        singledispatch = best_of(lambda: dispatch(n, *options))
+        fast_path = best_of(lambda: words(n))
+        print('  {!r:>11}: {:6.2f} us -> {:6.2f} us ({:.2f}x)'.format(
+            n, singledispatch, fast_path, singledispatch / fast_path))
+
+
+def bench_stats():
+    """Compare words with and without the instrumentation enabled."""
+    print('instrumentation:')
+    for n in (7, 123456789, '123456789', 1.5):
+        disabled = best_of(lambda: words(n))
+        num2fawords.enable_stats()
+        try:
+            enabled = best_of(lambda: words(n))
+        finally:
+            num2fawords.disable_stats()
+        print('  {!r:>11}: {:6.2f} us disabled, {:6.2f} us enabled'.format(
+            n, disabled, enabled))
+
+
+def bench_ordinal_words():
+    """Compare the direct ordinal engine with patching the cardinal words."""
+    from fractions import Fraction
+    engine = num2fawords._engine()
+    signed_int_words = engine.signed_int_words
+    ordinal_form = num2fawords._ordinal_form
+
+    def patched(n):
+        return ordinal_form(signed_int_words(int(n), '', 'منفی '))
+
+    random = Random(0)
+    workloads = (
+        ('days', list(range(1, 32)) * 30),
+        ('years', [random.randrange(1300, 1451) for _ in range(1000)]),
+        ('ranks', [random.randrange(1, 10 ** 6) for _ in range(1000)]),
+    )
+    print('ordinal words:')
+    for name, values in workloads:
+        before = best_of(lambda: [patched(n) for n in values], 10, 5)
+        after = best_of(lambda: [
+            engine.ordinal_words(n, '', 'منفی ') for n in values], 10, 5)
+        suffix = best_of(lambda: [
+            engine.ordinal_words(n, '', 'منفی ', 'ین') for n in values], 10, 5)
+        print('  {:>9}: {:7.1f} us -> {:7.1f} us ({:.2f}x), -ین {:7.1f} us'
+              .format(name, before, after, before / after, suffix))
+    fractions = [Fraction(1, random.randrange(2, 1000)) for _ in range(1000)]
+    print('  fractions: {:7.1f} us'.format(
+        best_of(lambda: [words(f) for f in fractions], 10, 5)))
+
+
+def bench_lazy_words():
+    """Compare words with lazy_words when only some parts are needed."""
+    from decimal import Decimal
+    lazy_words = num2fawords.lazy_words
+    print('lazy words:')
+    for value in (123456789, Decimal('987654321987.25'), 10 ** 30 // 7):
+        full = best_of(lambda: words(value))
+        length = best_of(lambda: len(lazy_words(value)))
+        integer = best_of(lambda: lazy_words(value).integer_words)
+        classes = best_of(lambda: len(lazy_words(value).integer))
+        print(
+            '  {!r:>32}: words {:5.2f} us, len {:5.2f} us,'
+            ' integer_words {:5.2f} us, class count {:5.2f} us'.format(
+                value, full, length, integer, classes))
+
+
+def bench_columns(rows=10 ** 6):
+    """Compare per-row words with words_many on Fraction and Decimal columns.
+    """
+    from decimal import Decimal
+    from fractions import Fraction
+    random = Random(0)
+    formatter = Formatter()
+    denominators = (100, 360, 1000)
+    columns = (
+        ('fractions', [
+            Fraction(random.randrange(1, 1000), random.choice(denominators))
+            for _ in range(rows)]),
+        ('decimals', [
+            Decimal(random.randrange(10 ** 7)).scaleb(-2)
+            for _ in range(rows)]),
+    )
+    print('columns ({} rows):'.format(rows))
+    for name, column in columns:
+        convert = formatter.words
+        per_row = best_of(lambda: [convert(n) for n in column], 1, 1)
+        batch = best_of(lambda: formatter.words_many(column), 1, 1)
+        print('  {:>9}: {:7.0f} ms -> {:7.0f} ms ({:.2f}x)'.format(
+            name, per_row / 1e3, batch / 1e3, per_row / batch))
+
+
+def bench_convert_column(rows=100000):
+    """Compare loading a CSV file and calling words on each cell with
+    convert_column. Memory is the peak traced by tracemalloc.
+    """
+    import csv
+    import tracemalloc
+    from tempfile import TemporaryDirectory
+    from num2fawords.columns import convert_column
+    random = Random(0)
+
+    def load_and_convert(source, destination):
+        with open(source, newline='', encoding='utf8') as f:
+            table = list(csv.reader(f))
+        table[0].append('amount_words')
+        for row in table[1:]:
+            row.append(words(row[1]))
+        with open(destination, 'w', newline='', encoding='utf8') as f:
+            csv.writer(f).writerows(table)
+
+    def measure(convert, source, destination):
+        seconds = best_of(lambda: convert(source, destination), 1, 1) / 1e6
+        # tracemalloc slows down allocations, so it is not used for timing.
+        tracemalloc.start()
+        convert(source, destination)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return seconds, peak / 2 ** 20
+
+    print('convert_column (CSV, decimal amounts):')
+    with TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'in.csv')
+        destination = os.path.join(directory, 'out.csv')
+        for size in (rows // 10, rows, rows * 4):
+            with open(source, 'w', encoding='utf8') as f:
+                f.write('id,amount\n')
+                for i in range(size):
+                    f.write('{},{}.{:02d}\n'.format(
+                        i, random.randrange(10 ** 9), random.randrange(100)))
+            before = measure(load_and_convert, source, destination)
+            after = measure(
+                lambda s, d: convert_column(s, d, 'amount'),
+                source, destination,
+            )
+            print(
+                '  {:>7} rows: {:5.2f} s {:6.1f} MiB -> {:5.2f} s {:6.1f} MiB'
+                .format(size, *before + after))
+
+
+_SPEEDUPS_CODE = """
+from timeit import repeat
+from num2fawords import words
+for n in {!r}:
+    print(min(repeat(lambda: words(n), number=10000, repeat=5)) * 100)
+"""
+
+
+def bench_speedups():
+    """Compare the C implementation of the engine with the Python one.
+
+    Each implementation is timed in its own process because the engine
+    class is chosen on import, see NUM2FAWORDS_PURE_PYTHON.
+    """
+    import subprocess
+    import sys
+    if num2fawords._EngineBase is num2fawords._PyEngineBase:
+        print('C engine: not built, see setup.py')
+        return
+    numbers = (
+        7, 1403, 123456789, 987654321987654321987654321987654321,
+        '1403', '000123456789',
+    )
+
+    def run(pure_python: str) -> list:
+        env = dict(os.environ, NUM2FAWORDS_PURE_PYTHON=pure_python)
+        return [float(line) for line in subprocess.run(
+            (sys.executable, '-c', _SPEEDUPS_CODE.format(numbers)),
+            env=env, check=True, stdout=subprocess.PIPE,
+            universal_newlines=True,
+        ).stdout.split()]
+
+    print('C engine:')
+    for n, before, after in zip(numbers, run('1'), run('')):
+        print('  {!r:>38}: {:6.2f} us -> {:6.2f} us ({:.2f}x)'.format(
+            n, before, after, before / after))
+
+
+_PATHS_CODE = """
+from comparisons import bench_cache, bench_ordinal_words, bench_words_many
+bench_words_many()
+bench_cache()
+bench_ordinal_words()
+"""
+
+
+def bench_engine_paths():
+    """Run the benchmarks of the paths built on the engine with each one.
+
+    words_many, the cache, and ordinal_words are compared with the plain
+    loops they replace using the Python engine and then the C engine.
+    """
+    import subprocess
+    import sys
+    if not num2fawords._C_ENGINE:
+        print('engine paths: skipped, the C engine is not built')
+        return
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name, pure_python in (('Python', '1'), ('C', '')):
+        print('with the {} engine:'.format(name))
+        env = dict(
+            os.environ, NUM2FAWORDS_PURE_PYTHON=pure_python,
+            PYTHONPATH=os.pathsep.join((os.path.dirname(here), here)),
+        )
+        subprocess.run(
+            (sys.executable, '-c', _PATHS_CODE), env=env, check=True)
+
+
+def bench_float_words():
+    """Compare the float engine with converting str(number) as before."""
+    engine = num2fawords._engine()
+    options = ('', 'منفی ', ' و ', ' ', True, ' در ده به توان ')
+    formatter = Formatter(places=2)
+
+    def str_float_words(f):
+        if f < 0:
+            return options[1] + engine.exp_words(
+                str(f)[1:], *options[:3], options[5])
+        return options[0] + engine.exp_words(
+            str(f), *options[:3], options[5])
+
+    print('float input:')
+    for f in (42.0, 21.5, 1234.5678, -0.25, 1.5e-7, 6.02e23):
+        via_str = best_of(lambda: str_float_words(f))
+        direct = best_of(lambda: engine.float_words(
+            f, *options[:3], options[5]))
+        fixed = best_of(lambda: formatter.words(f))
+        print(
+            '  {!r:>10}: {:6.2f} us -> {:6.2f} us ({:.2f}x),'
+            ' 2 places: {:6.2f} us'.format(
+                f, via_str, direct, via_str / direct, fixed))
+
+
+def run_all(pattern: str = '*'):
+    """Run the comparisons whose names without bench_ match pattern."""
+    for bench in (
+        bench_dispatch, bench_speedups, bench_engine_paths, bench_stats,
+        bench_group_words, bench_words_many, bench_int_words, bench_large_ints,
+        bench_formatter, bench_cache, bench_persistent_cache, bench_aio,
+        bench_workers, bench_threads, bench_parse_words, bench_str_words,
+        bench_float_words, bench_scientific, bench_ordinal_words,
+        bench_lazy_words, bench_columns, bench_convert_column,
+    ):
+        if fnmatch(bench.__name__[len('bench_'):], pattern):
+            bench()
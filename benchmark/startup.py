@@ -0,0 +1,90 @@
+"""Measure the startup time of num2fawords using ``python -X importtime``.
+
+Run from the project root using ``python benchmark --startup``. Exit with
+status 1 if importing num2fawords takes longer than the budget, or if it
+imports any of the modules that should only be imported on first use.
+"""
+
+import subprocess
+import sys
+from os import environ
+from time import perf_counter
+
+from cases import PROJECT_ROOT
+
+# Modules that are slow to import and are not needed to convert ints,
+# floats, and simple strings, see num2fawords._load_numbers.
+DEFERRED_MODULES = ('decimal', 'fractions', 'typing', 're', 'argparse')
+
+# Cumulative import time of num2fawords, including its dependencies.
+IMPORT_BUDGET_MS = 10
+
+
+def _run(*args) -> subprocess.CompletedProcess:
+    env = environ.copy()
+    env.pop('PYTHONDONTWRITEBYTECODE', None)  # measure cached bytecode
+    return subprocess.run(
+        (sys.executable,) + args, cwd=PROJECT_ROOT, env=env, check=True,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+
+def import_time(module: str, runs: int) -> float:
+    """Return the best cumulative import time of module in milliseconds."""
+    _run('-c', 'import ' + module)  # write the bytecode cache
+    times = []
+    for _ in range(runs):
+        stderr = _run('-X', 'importtime', '-c', 'import ' + module).stderr
+        for line in stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            _, cumulative, name = line.split('|')
+            if name.strip() == module:
+                times.append(int(cumulative) / 1000)
+    return min(times)
+
+
+def wall_time(runs: int, *args) -> float:
+    """Return the best wall time of running python with args in ms."""
+    times = []
+    for _ in range(runs):
+        t0 = perf_counter()
+        _run(*args)
+        times.append(perf_counter() - t0)
+    return min(times) * 1000
+
+
+def imported_modules(*statements) -> list:
+    """Return the DEFERRED_MODULES that are imported by statements."""
+    return _run('-S', '-c', '\n'.join(statements + (
+        'import sys',
+        'print(*[m for m in {!r} if m in sys.modules], file=sys.stderr)'
+        .format(DEFERRED_MODULES),
+    ))).stderr.split()
+
+
+def main(runs: int = 20, budget: float = IMPORT_BUDGET_MS) -> int:
+    import_ms = import_time('num2fawords', runs)
+    python_ms = wall_time(runs, '-c', 'pass')
+    cli_ms = wall_time(runs, '-m', 'num2fawords', '123456789')
+    print('{:40} {:>9.2f} ms (budget: {} ms)'.format(
+        'import num2fawords', import_ms, budget))
+    print('{:40} {:>9.2f} ms'.format('python -c pass', python_ms))
+    print('{:40} {:>9.2f} ms'.format(
+        'python -m num2fawords 123456789', cli_ms))
+    failed = import_ms > budget
+    for statements in (
+        ('import num2fawords',),
+        ('from num2fawords import words',
+         'words(123)', 'words(-1.5)', "words('۱۲۳')"),
+        ('from num2fawords.__main__ import main', "main(['-o', '123'])"),
+    ):
+        modules = imported_modules(*statements)
+        if modules:
+            failed = True
+            print('{} imports {}'.format('; '.join(statements), modules))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
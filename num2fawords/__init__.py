@@ -1,18 +1,64 @@
 """Provide functions to convert a number to Persian words."""
 
-from decimal import Decimal
-from fractions import Fraction
-try:
-    from functools import singledispatch as _singledispatch
-except ImportError:  # pragma: no cover
-    # sys.version_info < (3, 4)
-    # noinspection PyUnresolvedReferences
-    from singledispatch import singledispatch as _singledispatch
-from itertools import chain as _chain
-from typing import Union as _Union
-
-
-ONES = [
+from functools import (
+    lru_cache as _lru_cache, partial as _partial,
+    singledispatch as _singledispatch,
+)
+from itertools import chain as _chain, islice as _islice
+from os import cpu_count as _cpu_count, environ as _environ
+from sys import modules as _modules
+from _thread import RLock as _RLock
+from time import perf_counter as _perf_counter
+from types import ModuleType as _ModuleType
+
+# decimal, fractions, typing, and re are slow to import compared to this
+# module. The first two are imported on first use, see _load_numbers, and
+# typing is only needed by type checkers.
+if False:  # pragma: no cover, typing.TYPE_CHECKING
+    from decimal import Decimal
+    from fractions import Fraction
+    from array import array
+    from typing import Iterable, Optional, Union
+
+
+# Serializes the changes to the module state: modifying the module tables,
+# building or replacing _ENGINE, change_defaults, and registering types.
+# Conversions never take it. They only read state that is replaced as a
+# whole, like _ENGINE, or never changes, like the engines and Formatters, so
+# they are safe to run in threads, including without the GIL.
+_LOCK = _RLock()
+
+
+class _WordList(list):
+
+    """A list of words that invalidates the derived tables on modification."""
+
+    __slots__ = ()
+
+
+def _invalidating(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        # An engine that is being built from the old contents is discarded.
+        with _LOCK:
+            result = method(self, *args, **kwargs)
+            _invalidate_tables()
+        return result
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in (
+    '__setitem__', '__delitem__', '__iadd__', '__imul__', 'append', 'extend',
+    'insert', 'pop', 'remove', 'clear', 'reverse', 'sort',
+):
+    setattr(_WordList, _name, _invalidating(_name))
+del _name
+
+
+ONES = _WordList([
     '',
     'یک',
     'دو',
@@ -23,9 +69,9 @@ ONES = [
     'هفت',
     'هشت',
     'نه',
-]
+])
 
-TENS = [
+TENS = _WordList([
     '',
     '',
     'بیست',
@@ -36,9 +82,9 @@ TENS = [
     'هفتاد',
     'هشتاد',
     'نود',
-]
+])
 
-TEN_TO_TWENTY = [
+TEN_TO_TWENTY = _WordList([
     'ده',
     'یازده',
     'دوازده',
@@ -49,9 +95,9 @@ TEN_TO_TWENTY = [
     'هفده',
     'هجده',
     'نوزده',
-]
+])
 
-HUNDREDS = [
+HUNDREDS = _WordList([
     '',
     'یکصد',
     'دویست',
@@ -62,9 +108,8 @@ HUNDREDS = [
     'هفتصد',
     'هشتصد',
     'نهصد',
-]
-
-CLASSES = [
+])
+CLASSES = _WordList([
     '',
     ' هزار',
     ' میلیون',
@@ -77,275 +122,2615 @@ CLASSES = [
     ' کادریلیارد',
     ' کوینتیلیون',
     ' کوانتینیارد',
-]
+])
+
+
+# The suffixes that ordinal_words precomputes the ordinal forms with, e.g.
+# سوم and سومین.
+ORDINAL_SUFFIXES = ('', 'ین')
 
-DECIMAL_PLACES = ['', ' دهم', ' صدم']
-DECIMAL_PLACES.extend(_chain.from_iterable(
-    (i, ' ده' + i, ' صد' + i)
-    for i in (i + 'م' for i in CLASSES[1:])
-))
+
+def _decimal_places(classes) -> list:
+    """Return the names of decimal places derived from classes."""
+    decimal_places = ['', ' دهم', ' صدم']
+    decimal_places.extend(_chain.from_iterable(
+        (i, ' ده' + i, ' صد' + i)
+        for i in (i + 'م' for i in classes[1:])
+    ))
+    return decimal_places
+
+
+DECIMAL_PLACES = _WordList(_decimal_places(CLASSES))
 
 _NORMALIZATION_TABLE = str.maketrans('E٫', 'e.', '_٬,+')
 
 
-def _three_digit_words(number: int) -> str:
-    """Return the word representation of 0 < number < 1000."""
+def _match_number(number: str):
+    """Match the common forms of numbers in a single pass.
+
+    The groups are sign, integer part (or numerator), denominator, fraction
+    part, and exponent. \\d also matches Persian digits. Other strings are
+    handled by normalizing them with _NORMALIZATION_TABLE first.
+
+    The pattern is compiled on first use and replaces this function.
+    """
+    global _match_number
+    from re import compile
+    _match_number = compile(
+        r'([-+]?)(\d+(?:[_٬,]\d+)*)'
+        r'(?:/(\d+)|(?:[.٫](\d+))?(?:[eE]([-+]?\d+))?)'
+    ).fullmatch
+    return _match_number(number)
+
+
+def _normalize_mantissa(number: str) -> str:
+    """Return number with one nonzero digit before the point if it is in
+    scientific notation, e.g. '12.50e3' -> '1.25e4', otherwise number.
+
+    Trailing zeros of the mantissa are dropped, and a zero mantissa is left
+    as is.
+    """
+    match = _match_number(number.strip())
+    if match is None:
+        match = _match_number(number.strip().translate(_NORMALIZATION_TABLE))
+        if match is None:
+            return number
+    sign, integer, denominator, fraction, exponent = match.groups()
+    if exponent is None:
+        return number
+    if not integer.isdigit():  # has grouping separators
+        integer = integer.translate(_NORMALIZATION_TABLE)
+    digits = integer + (fraction or '')
+    significant = digits.lstrip('0')
+    exponent = int(exponent) + len(integer) - len(digits) + len(significant)
+    significant = significant.rstrip('0')
+    if not significant:
+        return number
+    return '{}{}{}{}e{:d}'.format(
+        sign, significant[0], '.' if len(significant) > 1 else '',
+        significant[1:], exponent - 1)
+
+
+# The words of exponents of scientific notation up to this magnitude are
+# precomputed by each engine, see _Engine.exponent_words. Float exponents
+# are between -324 and 308.
+_EXPONENT_LIMIT = 400
+
+
+# Above this many bits, _int_groups splits the number recursively
+# instead of peeling off one group at a time.
+_SPLIT_BITS = 1000
+
+
+def _three_digit_words(
+    number: int,
+    ones=ONES,
+    tens=TENS,
+    ten_to_twenty=TEN_TO_TWENTY,
+    hundreds=HUNDREDS,
+) -> str:
+    """Return the word representation of 0 <= number < 1000."""
     h, t, o = number // 100, number % 100 // 10, number % 10
     if h == 0 or (t == o == 0):
-        w = HUNDREDS[h]
+        w = hundreds[h]
     else:
-        w = HUNDREDS[h] + ' و '
+        w = hundreds[h] + ' و '
     if t == 1:
-        return w + TEN_TO_TWENTY[o]
+        return w + ten_to_twenty[o]
     if o == 0 or t == 0:
-        w += TENS[t]
+        w += tens[t]
     else:
-        w += TENS[t] + ' و '
-    return w + ONES[o]
+        w += tens[t] + ' و '
+    return w + ones[o]
 
 
-# noinspection PyUnusedLocal
-@_singledispatch
-def words(
-    number: _Union[int, float, str, Decimal, Fraction],
-    positive: str = '',
-    negative: str = 'منفی ',
-    decimal_separator: str = ' و ',
-    fraction_separator: str = ' ',
-    ordinal_denominator: bool = True,
-    scientific_separator: str = ' در ده به توان ',
-) -> str:
-    """Return the word form of number.
+def _group_words(ones, tens, ten_to_twenty, hundreds) -> tuple:
+    """Return the words of all three-digit groups, indexed by their value.
+
+    Same as calling _three_digit_words for each group, but the words below
+    100 are computed once and reused for each hundred.
+    """
+    below_100 = [tens[0] + o for o in ones]
+    below_100.extend(ten_to_twenty)
+    for t in tens[2:]:
+        below_100.append(t + ones[0])
+        below_100.extend([t + ' و ' + o for o in ones[1:]])
+    group_words = [hundreds[0] + w for w in below_100]
+    for h in hundreds[1:]:
+        group_words.append(h + below_100[0])
+        h += ' و '
+        group_words.extend([h + w for w in below_100[1:]])
+    return tuple(group_words)
 
-    If input is a string it should be in the form of a valid Python
-    representation for one of the other accepted types. The only exceptions are
-    that digits can be in Persian, for example words('۴۲') is valid.
 
+def _int_groups(number: int) -> list:
+    """Return the three-digit groups of number >= 0, least significant first.
+
+    Taking one group at a time is quadratic in the length of the number,
+    large numbers are split into halves by a power of 1000 instead.
     """
-    raise TypeError('invalid input type for words function', number)
+    groups = []
+    if number.bit_length() > _SPLIT_BITS:
+        _split_groups(number, groups, 0)
+        return groups
+    append = groups.append
+    while number:
+        number, group = divmod(number, 1000)
+        append(group)
+    return groups
 
 
-@words.register(str)
-@words.register(Decimal)
-def _(
-    number: str,
-    positive: str = '',
-    negative: str = 'منفی ',
-    decimal_separator: str = ' و ',
-    fraction_separator: str = ' ',
-    ordinal_denominator: bool = True,
-    scientific_separator: str = ' در ده به توان ',
-) -> str:
-    # Normalize the str
-    number = str(number).strip().translate(_NORMALIZATION_TABLE)
-
-    # sign
-    c0 = number[0]
-    if c0 == '-':
-        sign = negative
-        number = number[1:]
-    elif c0 == '0':
-        sign = ''
+def _split_groups(number: int, groups: list, width: int):
+    """Append the groups of number to groups, padded with zeros to width."""
+    start = len(groups)
+    if number.bit_length() > _SPLIT_BITS:
+        # log10(2) ~ 0.3, half of the groups ~ digits / 6
+        half = (number.bit_length() * 3 // 10 + 5) // 6
+        high, low = divmod(number, 1000 ** half)
+        _split_groups(low, groups, half)
+        _split_groups(high, groups, width - half if width > half else 0)
     else:
-        sign = positive
+        append = groups.append
+        while number:
+            number, group = divmod(number, 1000)
+            append(group)
+    if width:
+        groups.extend([0] * (width - len(groups) + start))
 
-    numerator, e, denominator = number.partition('/')
 
-    if denominator:
-        if ordinal_denominator:
+class _PyEngineBase:
+
+    """The methods of _Engine that have a C implementation.
+
+    The C implementation in num2fawords._speedups is used instead of this
+    class if it is built, see _EngineBase.
+    """
+
+    __slots__ = ('group_words', 'classes')
+
+    def int_words(self, number: int) -> str:
+        """Return the words of number >= 0."""
+        if number == 0:
+            return 'صفر'
+        group_words = self.group_words
+        if number < 1000:
+            return group_words[number]
+        groups = _int_groups(number)
+        classes = self.classes
+        if len(groups) > len(classes):
+            return self.large_groups_words(groups)
+        parts = []
+        append = parts.append
+        for i in range(len(groups) - 1, 0, -1):
+            group = groups[i]
+            if group:
+                append(group_words[group] + classes[i])
+        if groups[0]:
+            append(group_words[groups[0]])
+        return ' و '.join(parts)
+
+    def signed_int_words(
+        self, number: int, positive: str, negative: str,
+    ) -> str:
+        if number == 0:
+            return 'صفر'
+        if number < 0:
+            return negative + self.int_words(-number)
+        return positive + self.int_words(number)
+
+    def natural_words(self, str_num: str) -> str:
+        if str_num == '0':
+            return 'صفر'
+        if not str_num.isdigit():
+            if str_num:
+                raise ValueError('invalid digits', str_num)
+            return ''
+        length = len(str_num)
+        if length > len(self.classes) * 3:
+            # Slicing the groups is linear and avoids the digit limit of int.
+            groups = [
+                int(str_num[max(i - 3, 0):i]) for i in range(length, 0, -3)]
+            while groups and not groups[-1]:
+                groups.pop()
+            if not groups:
+                return ''
+            return self.large_groups_words(groups)
+        number = int(str_num)
+        if number == 0:  # e.g. the '00' of '1.00'
+            return ''
+        return self.int_words(number)
+
+    def ordinal_int_words(self, number: int) -> str:
+        """Return the ordinal words of number >= 0."""
+        return _ordinal_form(self.int_words(number))
+
+
+# The C implementation of _PyEngineBase is optional. Set the environment
+# variable NUM2FAWORDS_PURE_PYTHON to use the Python one, e.g. to test it.
+if _environ.get('NUM2FAWORDS_PURE_PYTHON'):
+    _EngineBase = _PyEngineBase
+else:
+    try:
+        from num2fawords._speedups import EngineBase as _EngineBase
+    except ImportError:
+        _EngineBase = _PyEngineBase
+# Whether the C implementation is used.
+_C_ENGINE = _EngineBase is not _PyEngineBase
+
+
+class _Engine(_EngineBase):
+
+    """Convert numbers to words using a fixed snapshot of the word tables.
+
+    Engines are never modified after creation. The module-level functions use
+    the engine returned by _engine() which is replaced whenever the module
+    tables change, and each Formatter has its own.
+    """
+
+    __slots__ = (
+        'decimal_places', 'ordinal_group_words', 'ordinal_classes', 'units',
+        'scales', 'ordinals', 'places', 'exponents',
+    )
+
+    # Used by the C implementation for the cases it does not handle.
+    _py_int_words = _PyEngineBase.int_words
+    _py_signed_int_words = _PyEngineBase.signed_int_words
+    _py_natural_words = _PyEngineBase.natural_words
+    _py_ordinal_int_words = _PyEngineBase.ordinal_int_words
+
+    def __init__(
+        self, ones, tens, ten_to_twenty, hundreds, classes, decimal_places,
+    ):
+        # The words of all three-digit groups, indexed by their value.
+        self.group_words = _group_words(ones, tens, ten_to_twenty, hundreds)
+        self.classes = tuple(classes)
+        self.decimal_places = tuple(decimal_places)
+        # The unsigned words of exponents keyed by their digits as written
+        # after the e, including the two digit forms of repr, e.g. 1e-07.
+        # Zero is left out as it has no sign, see exponent_words.
+        group_words = self.group_words
+        exponents = {
+            str(i): group_words[i] for i in range(1, _EXPONENT_LIMIT + 1)}
+        exponents.update(
+            [('0' + str(i), group_words[i]) for i in range(1, 10)])
+        self.exponents = exponents
+        # The ordinal forms of group_words and classes for each suffix in
+        # ORDINAL_SUFFIXES, see ordinal_words.
+        ordinal_group_words = ('صفرم',) + tuple(map(
+            _ordinal_form, self.group_words[1:]))
+        ordinal_classes = tuple(map(_ordinal_form, self.classes))
+        self.ordinal_group_words = {
+            suffix: tuple([w + suffix for w in ordinal_group_words])
+            for suffix in ORDINAL_SUFFIXES
+        }
+        self.ordinal_classes = {
+            suffix: tuple([w + suffix for w in ordinal_classes])
+            for suffix in ORDINAL_SUFFIXES
+        }
+
+        # Token tables used by parse_words
+        units = dict(zip(ones[1:], range(1, 10)))
+        units.update(zip(ten_to_twenty, range(10, 20)))
+        units.update(zip(tens[2:], range(20, 100, 10)))
+        units.update(zip(hundreds[1:], range(100, 1000, 100)))
+        self.units = units
+        self.scales = {
+            class_.strip(): 1000 ** i
+            for i, class_ in enumerate(self.classes) if i
+        }
+        # ordinal form of a token -> its cardinal form
+        self.ordinals = {
+            _ordinal_form(w) + suffix: w
+            for w in _chain(units, self.scales, ('صفر',))
+            for suffix in ORDINAL_SUFFIXES
+        }
+        # name of a decimal place -> number of digits after the point
+        self.places = {
+            place.strip(): digits
+            for digits, place in enumerate(self.decimal_places) if digits
+        }
+
+    def large_groups_words(self, groups: list) -> str:
+        """Return the words of groups that do not fit in classes.
+
+        groups are the three-digit groups of the number, least significant
+        first. The number is split into chunks of the groups below the last
+        class and the names are nested like 'هزار میلیارد': each name of the
+        last class multiplies everything before it, e.g. with the default
+        classes 2 * 1000 ** 22 + 3 * 1000 ** 11 + 4 is
+        'دو کوانتینیارد و سه کوانتینیارد و چهار'. The last class is named
+        once per chunk, so the words grow linearly with the number of groups.
+        """
+        classes = self.classes
+        last = len(classes) - 1
+        if last < 1:
+            raise ValueError('out of range')
+        group_words = self.group_words
+        top_class = classes[last]
+        parts = []
+        append = parts.append
+        for start in range(len(groups) // last * last, -1, -last):
+            stop = min(start + last, len(groups))
+            chunk = [
+                group_words[groups[i]] + classes[i - start]
+                for i in range(stop - 1, start - 1, -1) if groups[i]
+            ]
+            if chunk:
+                if parts:
+                    append(' و ')
+                append(' و '.join(chunk))
+            if start and parts:
+                append(top_class)
+        return ''.join(parts)
+
+    def scale(self, i: int) -> str:
+        """Return the name of 1000 ** i, with a leading space if i > 0.
+
+        Scales beyond the last class are composed from the last class, like
+        'هزار میلیارد', e.g. with the default classes 1000 ** 12 is
+        ' هزار کوانتینیارد' and 1000 ** 22 is ' کوانتینیارد کوانتینیارد'.
+        Numbers are named by nesting these, see large_groups_words.
+        """
+        classes = self.classes
+        if i < len(classes):
+            return classes[i]
+        last = len(classes) - 1
+        if last < 1:
+            raise ValueError('out of range')
+        repeat, i = divmod(i, last)
+        return classes[i] + classes[last] * repeat
+
+    def decimal_place(self, digits: int) -> str:
+        """Return the name of the decimal place of 10 ** -digits."""
+        decimal_places = self.decimal_places
+        if digits < len(decimal_places):
+            return decimal_places[digits]
+        i, j = divmod(digits, 3)
+        return ('', ' ده', ' صد')[j] + self.scale(i) + 'م'
+
+    def point_words(self, number: str, decimal_separator: str) -> str:
+        before_p, p, after_p = number.partition('.')
+        natural_words = self.natural_words
+        if after_p:
+            if before_p == '0':
+                if after_p == '0':
+                    return 'صفر'
+                return (
+                    natural_words(after_p) + self.decimal_place(len(after_p))
+                )
+            if after_p != '0':
+                return (
+                    natural_words(before_p)
+                    + decimal_separator
+                    + natural_words(after_p)
+                    + self.decimal_place(len(after_p))
+                )
+            return natural_words(before_p)
+        return natural_words(before_p)
+
+    def exponent_words(
+        self, exponent: str, positive: str, negative: str,
+    ) -> str:
+        """Return the signed words of the exponent of scientific notation.
+
+        exponent is the str after the e, e.g. '-07'. Exponents up to
+        _EXPONENT_LIMIT are looked up in exponents instead of being parsed
+        and converted.
+        """
+        if exponent[0] == '-':
+            words = self.exponents.get(exponent[1:])
+            if words is not None:
+                return negative + words
+        else:
+            words = self.exponents.get(
+                exponent[1:] if exponent[0] == '+' else exponent)
+            if words is not None:
+                return positive + words
+        return self.signed_int_words(int(exponent), positive, negative)
+
+    def exp_words(
+        self,
+        number: str,
+        positive: str,
+        negative: str,
+        decimal_separator: str,
+        scientific_separator: str,
+    ) -> str:
+        base, e, exponent = number.partition('e')
+        if exponent:
+            return (
+                self.point_words(base, decimal_separator)
+                + scientific_separator
+                + self.exponent_words(exponent, positive, negative)
+            )
+        return self.point_words(base, decimal_separator)
+
+    def str_words(
+        self,
+        number: str,
+        positive: str,
+        negative: str,
+        decimal_separator: str,
+        fraction_separator: str,
+        ordinal_denominator: bool,
+        scientific_separator: str,
+    ) -> str:
+        number = str(number).strip()
+        if number.isdigit():  # the most common case
+            return (
+                ('' if number[0] == '0' else positive)
+                + self.natural_words(number)
+            )
+        # Fractions and grouped numbers are converted faster by translating
+        # and partitioning them than by matching them, e.g. '3/4' and
+        # '1,234,567'.
+        if '/' in number or ',' in number or '٬' in number:
+            match = None
+        else:
+            match = _match_number(number)
+        if match is None:
+            return self.normalized_str_words(
+                number.translate(_NORMALIZATION_TABLE), positive, negative,
+                decimal_separator, fraction_separator, ordinal_denominator,
+                scientific_separator,
+            )
+        sign, integer, denominator, fraction, exponent = match.groups()
+        if not integer.isdigit():  # has grouping separators
+            integer = integer.translate(_NORMALIZATION_TABLE)
+
+        if sign == '-':
+            sign = negative
+        elif integer[0] == '0':
+            sign = ''
+        else:
+            sign = positive
+
+        natural_words = self.natural_words
+        if denominator is not None:
+            if ordinal_denominator:
+                return (
+                    sign
+                    + natural_words(integer)
+                    + fraction_separator
+                    + self.ordinal_words(int(denominator), '', negative)
+                )
             return (
                 sign
-                + _natural_words(numerator)
+                + natural_words(integer)
                 + fraction_separator
-                + ordinal_words(denominator)
+                + natural_words(denominator)
+            )
+
+        if fraction is None or fraction == '0':
+            w = natural_words(integer)
+        elif integer == '0':
+            w = natural_words(fraction) + self.decimal_place(len(fraction))
+        else:
+            w = (
+                natural_words(integer)
+                + decimal_separator
+                + natural_words(fraction)
+                + self.decimal_place(len(fraction))
             )
+        if exponent is None:
+            return sign + w
         return (
             sign
-            + _natural_words(numerator)
-            + fraction_separator
-            + _natural_words(denominator)
+            + w
+            + scientific_separator
+            + self.exponent_words(exponent, positive, negative)
         )
-    return sign + _exp_words(
-        numerator, positive, negative, decimal_separator, scientific_separator,
-    )
 
+    def normalized_str_words(
+        self,
+        number: str,
+        positive: str,
+        negative: str,
+        decimal_separator: str,
+        fraction_separator: str,
+        ordinal_denominator: bool,
+        scientific_separator: str,
+    ) -> str:
+        """Convert a str that does not match _match_number.
 
-# noinspection PyUnusedLocal
-@words.register(Fraction)
-def _(
-    number: Fraction,
-    positive: str = '',
-    negative: str = 'منفی ',
-    decimal_separator: str = ' و ',
-    fraction_separator: str = ' ',
-    ordinal_denominator: bool = True,
-    scientific_separator: str = ' در ده به توان ',
-) -> str:
-    numerator = number.numerator
-    if numerator < 0:
-        sign = negative
-        numerator = str(numerator)[1:]
-    else:
-        sign = positive
-        numerator = str(numerator)
-    if ordinal_denominator:
+        number must be stripped and translated using _NORMALIZATION_TABLE.
+        """
+        # sign
+        c0 = number[0]
+        if c0 == '-':
+            sign = negative
+            number = number[1:]
+        elif c0 == '0':
+            sign = ''
+        else:
+            sign = positive
+
+        numerator, e, denominator = number.partition('/')
+
+        if denominator:
+            if ordinal_denominator:
+                return (
+                    sign
+                    + self.natural_words(numerator)
+                    + fraction_separator
+                    + self.ordinal_words(int(denominator), '', negative)
+                )
+            return (
+                sign
+                + self.natural_words(numerator)
+                + fraction_separator
+                + self.natural_words(denominator)
+            )
+        return sign + self.exp_words(
+            numerator, positive, negative, decimal_separator,
+            scientific_separator,
+        )
+
+    def fraction_words(
+        self,
+        number: 'Fraction',
+        positive: str,
+        negative: str,
+        fraction_separator: str,
+        ordinal_denominator: bool,
+    ) -> str:
+        numerator = number.numerator
+        if numerator < 0:
+            sign = negative
+            numerator = -numerator
+        else:
+            sign = positive
+        if ordinal_denominator:
+            return (
+                sign
+                + self.int_words(numerator)
+                + fraction_separator
+                # denominator has no sign
+                + self.ordinal_words(number.denominator, '', '')
+            )
         return (
             sign
-            + _natural_words(numerator)
+            + self.int_words(numerator)
             + fraction_separator
-            + ordinal_words(number.denominator)  # denominator has no sign
+            + self.int_words(number.denominator)  # denominator has no sign
         )
-    return (
-        sign
-        + _natural_words(numerator)
-        + fraction_separator
-        + _natural_words(str(number.denominator))  # denominator has no sign
-    )
-
-
-# noinspection PyUnusedLocal
-@words.register(int)
-def _(
-    number: int,
-    positive: str = '',
-    negative: str = 'منفی ',
-    decimal_separator: str = ' و ',
-    fraction_separator: str = ' ',
-    ordinal_denominator: bool = True,
-    scientific_separator: str = ' در ده به توان ',
-) -> str:
-    """Return the fa-word form for the given int."""
-    if number == 0:
-        return 'صفر'
-    if number < 0:
-        return negative + _natural_words(str(number)[1:])
-    return positive + _natural_words(str(number))
 
-
-# noinspection PyUnusedLocal
-@words.register(float)
-def _(
-    number: float,
-    positive: str = '',
-    negative: str = 'منفی ',
-    decimal_separator: str = ' و ',
-    fraction_separator: str = ' ',
-    ordinal_denominator: bool = True,
-    scientific_separator: str = ' در ده به توان ',
-) -> str:
-    """Return the fa-word form for the given float."""
-    if number == 0:
-        return 'صفر'
-    str_num = str(number)
-    if number < 0:
-        return negative + _exp_words(
-            str_num[1:],
-            positive,
-            negative,
-            decimal_separator,
+    def float_words(
+        self,
+        number: float,
+        positive: str,
+        negative: str,
+        decimal_separator: str,
+        scientific_separator: str,
+    ) -> str:
+        if number == 0:
+            return 'صفر'
+        if number < 0:
+            sign = negative
+            number = -number
+        else:
+            sign = positive
+        if number < 1e16 and number.is_integer():
+            # repr would be the same digits followed by .0
+            return sign + self.int_words(int(number))
+        # repr is the shortest string that round-trips, e.g. 1.1 rather
+        # than the exact 1.100000000000000088817841970012523233890533447265625
+        # Its digits are passed to natural_words as they are, the C engine
+        # converts digit strings faster than int() followed by int_words.
+        return sign + self.exp_words(
+            repr(number), positive, negative, decimal_separator,
             scientific_separator,
         )
-    return positive + _exp_words(
-        str_num, positive, negative, decimal_separator, scientific_separator,
-    )
 
+    def fixed_float_words(
+        self,
+        number: float,
+        places: int,
+        positive: str,
+        negative: str,
+        decimal_separator: str,
+    ) -> str:
+        """Return the words of number rounded to the given decimal places.
 
-def _exp_words(
-    number: str,
-    positive: str,
-    negative: str,
-    decimal_separator: str,
-    scientific_separator: str,
-) -> str:
-    # exponent
-    base, e, exponent = number.partition('e')
-    if exponent:
+        The exact binary value of number is rounded half to even, like
+        format(number, '.{places}f'), without formatting it as a string.
+        Trailing zeros are part of the name of the place, e.g. 1.5 with two
+        places is 'یک و پنجاه صدم'.
+        """
+        if number < 0:
+            sign = negative
+            number = -number
+        else:
+            sign = positive
+        try:
+            numerator, denominator = number.as_integer_ratio()
+        except (OverflowError, ValueError):  # inf or nan
+            raise ValueError('invalid digits', repr(number)) from None
+        scale = 10 ** places
+        scaled, remainder = divmod(numerator * scale, denominator)
+        remainder *= 2
+        if remainder > denominator or (
+            remainder == denominator and scaled & 1
+        ):
+            scaled += 1
+        if scaled == 0:
+            return 'صفر'
+        integer, fraction = divmod(scaled, scale)
+        if not fraction:
+            return sign + self.int_words(integer)
+        if not integer:
+            return (
+                sign + self.int_words(fraction) + self.decimal_place(places))
         return (
-            _point_words(base, decimal_separator=decimal_separator)
-            + scientific_separator
-            + words(int(exponent), positive, negative)
+            sign
+            + self.int_words(integer)
+            + decimal_separator
+            + self.int_words(fraction)
+            + self.decimal_place(places)
         )
-    return _point_words(base, decimal_separator=decimal_separator)
 
+    def ordinal_words(
+        self, number: 'Union[int, str]', positive: str, negative: str,
+        suffix: str = '',
+    ) -> str:
+        """Return the ordinal words of number followed by suffix.
 
-def _point_words(
-    number: str,
-    decimal_separator: str,
-) -> str:
-    before_p, p, after_p = number.partition('.')
-    if after_p:
-        if before_p == '0':
-            if after_p == '0':
-                return 'صفر'
-            return _natural_words(after_p) + DECIMAL_PLACES[len(after_p)]
-        if after_p != '0':
+        With the Python engine the ordinal form is built directly from
+        ordinal_group_words and ordinal_classes instead of patching the end
+        of the cardinal words. With the C engine, numbers of 1000 or more
+        are converted by ordinal_int_words.
+        """
+        if number.__class__ is not int:
+            number = int(number)
+        if number < 0:
+            number = -number
+            positive = negative
+        ordinal_group_words = self.ordinal_group_words.get(suffix)
+        if ordinal_group_words is None:  # suffix is not precomputed
+            return self.ordinal_words(number, positive, '') + suffix
+        if number < 1000:
+            if not number:  # zero has no sign
+                return ordinal_group_words[0]
+            return positive + ordinal_group_words[number]
+        if _C_ENGINE:
+            # The C ordinal_int_words is faster than building the ordinal
+            # form group by group in Python.
+            return positive + self.ordinal_int_words(number) + suffix
+        groups = _int_groups(number)
+        classes = self.classes
+        if len(groups) > len(classes):
             return (
-                _natural_words(before_p)
-                + decimal_separator
-                + _natural_words(after_p)
-                + DECIMAL_PLACES[len(after_p)]
-            )
-        return _natural_words(before_p)
-    return _natural_words(before_p)
-
-
-def _natural_words(str_num: str) -> str:
-    if str_num == '0':
-        return 'صفر'
-    length = len(str_num)
-    if length > len(CLASSES) * 3:
-        raise ValueError('out of range')
-
-    modulo_3 = length % 3
-    if modulo_3:
-        str_num = '0' * (3 - modulo_3) + str_num
-        length += 3 - modulo_3
-
-    groups = length // 3
-    group = groups
-    natural_words = ''
-    while group > 0:
-        three_digit = str_num[group * 3 - 3:group * 3]
-        word3 = _three_digit_words(int(three_digit))
-        if word3 and group != groups:
-            if natural_words:
-                natural_words = word3 + CLASSES[groups - group] + \
-                                ' و ' + natural_words
-            else:
-                natural_words = word3 + CLASSES[groups - group]
+                positive + _ordinal_form(self.large_groups_words(groups))
+                + suffix)
+        lowest = 0
+        while not groups[lowest]:
+            lowest += 1
+        group_words = self.group_words
+        parts = [positive]
+        append = parts.append
+        for i in range(len(groups) - 1, lowest, -1):
+            group = groups[i]
+            if group:
+                append(group_words[group] + classes[i])
+                append(' و ')
+        if lowest:
+            append(group_words[groups[lowest]])
+            append(self.ordinal_classes[suffix][lowest])
+        else:
+            append(ordinal_group_words[groups[0]])
+        return ''.join(parts)
+
+    def parse_words(
+        self,
+        text: str,
+        ordinal: bool,
+        positive: str,
+        negative: str,
+        decimal_separator: str,
+        fraction_separator: str,
+        scientific_separator: str,
+    ) -> 'Union[int, Decimal, Fraction]':
+        if not _NUMBERS_LOADED:
+            _load_numbers()
+        tokens = text.split()
+        negative_sign = _strip_tokens(tokens, negative.split())
+        if not negative_sign:
+            _strip_tokens(tokens, positive.split())
+        if not tokens:
+            raise ValueError('no number in text', text)
+
+        if ordinal:
+            value = self.parse_ordinal(tokens, 0)
         else:
-            natural_words = word3 + natural_words
-        group -= 1
+            mantissa, exponent = _split_tokens(
+                tokens, scientific_separator.split())
+            if exponent is None:
+                value = self.parse_unsigned(
+                    tokens, decimal_separator.split(),
+                    fraction_separator.split(),
+                )
+            else:
+                exponent_sign = _strip_tokens(exponent, negative.split())
+                if not exponent_sign:
+                    _strip_tokens(exponent, positive.split())
+                exponent = self.parse_natural(exponent, 0, len(exponent))
+                value = self.parse_unsigned(
+                    mantissa, decimal_separator.split(), (),
+                )
+                if value.__class__ is Fraction:
+                    raise ValueError(
+                        'a fraction cannot have an exponent', text)
+                sign, digits, exponent_ = Decimal(value).as_tuple()
+                value = Decimal((
+                    sign, digits,
+                    exponent_ - exponent if exponent_sign else
+                    exponent_ + exponent,
+                ))
+        if negative_sign:
+            if isinstance(value, Decimal):
+                return value.copy_negate()
+            return -value
+        return value
 
-    return natural_words
+    def parse_unsigned(
+        self, tokens: list, decimal_separator: list, fraction_separator: list,
+    ) -> 'Union[int, Decimal, Fraction]':
+        """Parse the words of a non-negative int, decimal, or fraction."""
+        end = len(tokens)
+        if fraction_separator:
+            numerator, denominator = _split_tokens(tokens, fraction_separator)
+            if denominator is not None:
+                return _fraction(
+                    self.parse_natural(numerator, 0, len(numerator)),
+                    self.parse_ordinal(denominator, 0),
+                )
 
+        value, stop = self.parse_natural_prefix(tokens, 0, end)
+        if stop == end:
+            return value
 
-def ordinal_words(
-    number: _Union[int, str],
-    positive: str = '',
-    negative: str = 'منفی ',
-) -> str:
-    """Return the number converted to ordinal words form."""
-    w = words(int(number), positive, negative)
+        # The name of a decimal place may be one or two words, e.g. 'ده هزارم'
+        places = self.places
+        for place_length in (2, 1):
+            if end > place_length:
+                digits = places.get(' '.join(tokens[-place_length:]))
+                if digits is not None:
+                    decimal = self.parse_decimal(
+                        tokens, end - place_length, digits, decimal_separator)
+                    if decimal is not None:
+                        return decimal
+        for digits, place_length in self.parse_large_place(tokens):
+            decimal = self.parse_decimal(
+                tokens, end - place_length, digits, decimal_separator)
+            if decimal is not None:
+                return decimal
+
+        if fraction_separator:
+            raise ValueError('unexpected words', ' '.join(tokens[stop:]))
+        # The fraction separator is a space, the denominator begins where
+        # the numerator stops.
+        return _fraction(value, self.parse_ordinal(tokens, stop))
+
+    def parse_decimal(
+        self, tokens: list, end: int, digits: int, decimal_separator: list,
+    ):
+        """Parse tokens[:end] followed by the name of a decimal place.
+
+        Return None if tokens[:end] is not the words of a number with at most
+        the given number of decimal digits.
+
+        If the decimal separator is also used to join groups, i.e. ' و ', the
+        words can be ambiguous. For example 'یک هزار و یک ده هزارم' is both
+        0.1001 and 1000.0001. The reading with the most decimal digits is
+        returned.
+        """
+        limit = 10 ** digits
+        value, stop = self.parse_natural_prefix(tokens, 0, end)
+        if stop == end and value < limit:
+            return _decimal(0, value, digits)
+        separator_length = len(decimal_separator)
+        if not separator_length:
+            return None
+        for i in range(1, end - separator_length):
+            if tokens[i:i + separator_length] != decimal_separator:
+                continue
+            integer, stop = self.parse_natural_prefix(tokens, 0, i)
+            if stop != i:
+                continue
+            fraction, stop = self.parse_natural_prefix(
+                tokens, i + separator_length, end)
+            if stop == end and fraction < limit:
+                return _decimal(integer, fraction, digits)
+        return None
+
+    def parse_large_place(self, tokens: list) -> list:
+        """Return the possible decimal places that tokens end with.
+
+        Only the places that are not in decimal_places are considered, see
+        decimal_place. Return a list of (digits, number of tokens) pairs,
+        longest first.
+        """
+        classes = [class_.strip() for class_ in self.classes]
+        last = len(classes) - 1
+        if last < 1 or tokens[-1] != _ordinal_form(classes[last]):
+            return []
+        # tokens[start:] are the scale of the place
+        start = len(tokens) - 1
+        while start > 1 and tokens[start - 1] == classes[last]:
+            start -= 1
+        i = (len(tokens) - start) * last
+        if start > 1 and tokens[start - 1] in classes[1:last]:
+            start -= 1
+            i += classes.index(tokens[start])
+        places = []
+        min_digits = len(self.decimal_places)
+        if start > 1 and tokens[start - 1] in ('ده', 'صد'):
+            digits = 3 * i + (1 if tokens[start - 1] == 'ده' else 2)
+            if digits >= min_digits:
+                places.append((digits, len(tokens) - start + 1))
+        if 3 * i >= min_digits:
+            places.append((3 * i, len(tokens) - start))
+        return places
+
+    def parse_ordinal(self, tokens: list, start: int) -> int:
+        """Parse tokens[start:] as the words of an ordinal or cardinal."""
+        cardinal = self.ordinals.get(tokens[-1])
+        if cardinal is None:
+            return self.parse_natural(tokens, start, len(tokens))
+        tokens = tokens[start:-1]
+        tokens.append(cardinal)
+        return self.parse_natural(tokens, 0, len(tokens))
+
+    def parse_natural(self, tokens: list, start: int, end: int) -> int:
+        """Parse tokens[start:end] as the words of a natural number."""
+        value, stop = self.parse_natural_prefix(tokens, start, end)
+        if stop != end:
+            raise ValueError('unexpected words', ' '.join(tokens[stop:end]))
+        return value
+
+    def parse_natural_prefix(self, tokens: list, start: int, end: int):
+        """Parse the longest natural number at the start of tokens[start:end].
+
+        Return the number and the index of the first token after it.
+        """
+        if start >= end:
+            raise ValueError('missing number')
+        if tokens[start] == 'صفر':
+            return 0, start + 1
+        units = self.units
+        scales = self.scales
+        # Each name of the last class multiplies all the words before it,
+        # see large_groups_words.
+        top_class = self.classes[-1].strip()
+        top_scale = scales.get(top_class)
+        total = group = 0
+        # Each unit in a group must be less than place and each scale less
+        # than the previous one.
+        place = 1000
+        last_scale = None
+        i = start
+        stop = None
+        while i < end:
+            unit = units.get(tokens[i])
+            if unit is None or unit >= place:
+                break
+            group += unit
+            place = 100 if unit >= 100 else 10 if unit >= 20 else 1
+            i += 1
+            stop = i
+            if i < end:
+                scale = scales.get(tokens[i])
+                if scale is not None and (
+                    scale == top_scale or last_scale is None
+                    or scale < last_scale
+                ):
+                    if scale == top_scale:
+                        total = (total + group) * scale
+                    else:
+                        total += group * scale
+                    i += 1
+                    while i < end and tokens[i] == top_class:
+                        total *= top_scale
+                        scale = top_scale
+                        i += 1
+                    group = 0
+                    place = 1000
+                    last_scale = scale
+                    stop = i
+            if i < end and tokens[i] == 'و':
+                i += 1
+            else:
+                break
+        if stop is None:
+            raise ValueError('unknown word', tokens[start])
+        return total + group, stop
+
+
+def _ordinal_form(w: str) -> str:
+    """Return the ordinal form of the cardinal words w."""
     if w[-2:] == 'سه':
         return w[:-2] + 'سوم'
     return w + 'م'
 
 
-def change_defaults(
-    positive: str = '',
-    negative: str = 'منفی ',
-    decimal_separator: str = ' و ',
-    fraction_separator: str = ' ',
-    ordinal_denominator: bool = True,
-    scientific_separator: str = ' در ده به توان ',
-):
-    """The the default values for words and ordinal_words functions."""
-    defaults = (
-        positive, negative, decimal_separator, fraction_separator,
-        ordinal_denominator, scientific_separator,
-    )
-    change_defaults.__defaults__ = defaults
-    for func in words.registry.values():
-        func.__defaults__ = defaults
-    ordinal_words.__defaults__ = (positive, negative)
+def _strip_tokens(tokens: list, prefix: list) -> bool:
+    """Remove prefix from the start of tokens. Return True if it was there."""
+    length = len(prefix)
+    if length and tokens[:length] == prefix:
+        del tokens[:length]
+        return True
+    return False
+
+
+def _split_tokens(tokens: list, separator: list):
+    """Split tokens at the first occurrence of separator.
+
+    Return the tokens before and after the separator or (tokens, None) if it
+    does not occur.
+    """
+    length = len(separator)
+    if length:
+        first = separator[0]
+        for i in range(len(tokens) - length + 1):
+            if tokens[i] == first and tokens[i:i + length] == separator:
+                return tokens[:i], tokens[i + length:]
+    return tokens, None
+
+
+def _decimal(integer: int, fraction: int, digits: int) -> 'Decimal':
+    """Return integer + fraction / 10 ** digits, without rounding."""
+    return Decimal('{}{}E-{}'.format(
+        integer or '', str(fraction).zfill(digits), digits))
+
+
+def _fraction(numerator: int, denominator: int) -> 'Fraction':
+    """Return Fraction(numerator, denominator) for parsed words.
+
+    Raise ValueError instead of ZeroDivisionError if denominator is 0.
+    """
+    if not denominator:
+        raise ValueError('the denominator is zero')
+    return Fraction(numerator, denominator)
+
+
+# The engine for the module tables, see _engine.
+_ENGINE = None
+
+
+def _engine() -> _Engine:
+    """Return the engine for the current module tables.
+
+    The engine is built on first use and rebuilt after any of the module
+    tables are modified. It is built while holding _LOCK, so that the tables
+    are not modified meanwhile, and published by a single assignment.
+    """
+    global _ENGINE
+    engine = _ENGINE
+    if engine is None:
+        with _LOCK:
+            engine = _ENGINE
+            if engine is None:
+                engine = _ENGINE = _new_engine(
+                    ONES, TENS, TEN_TO_TWENTY, HUNDREDS, CLASSES,
+                    DECIMAL_PLACES,
+                )
+    return engine
+
+
+def _invalidate_tables():
+    global _ENGINE
+    with _LOCK:
+        _ENGINE = None
+        if _CACHE is not None:
+            _CACHE.cache_clear()
+
+
+# The memoized _convert function when caching is enabled, see enable_cache.
+_CACHE = None
+
+
+def enable_cache(maxsize: int = 1024):
+    """Memoize the results of words and ordinal_words.
+
+    At most maxsize results are kept, the least recently used ones are
+    discarded first. If maxsize is None the cache can grow without bound.
+    Calling this function again replaces the current cache with an empty one.
+    The cache is cleared automatically when change_defaults is called, when
+    the module tables are modified, or when words.register is called. Ints
+    are not cached if the C engine is used, it converts them faster than the
+    cache looks them up.
+    """
+    global _CACHE
+    _register_types()  # words compares the types with Decimal
+    _CACHE = _lru_cache(maxsize, typed=True)(_convert)
+
+
+def disable_cache():
+    """Stop memoizing the results of words and ordinal_words."""
+    global _CACHE
+    _CACHE = None
+
+
+def cache_info():
+    """Return the hits, misses, maxsize, and currsize of the cache.
+
+    Return None if caching is not enabled.
+    """
+    cache = _CACHE
+    if cache is None:
+        return None
+    return cache.cache_info()
+
+
+def cache_clear():
+    """Clear the cache and its statistics."""
+    cache = _CACHE
+    if cache is not None:
+        cache.cache_clear()
+
+
+# The statistics of each phase while instrumentation is enabled, see
+# enable_stats. Each value is a list of [calls, seconds, self_seconds].
+_STATS = None
+_STATS_CALLBACK = None
+# The time spent in the timed methods called by the current call of each
+# thread, see _timed.
+_STATS_LOCAL = None
+_STATS_LOCK = None
+
+# The _Engine methods that are timed, each one is a phase of conversion.
+# The self time of str_words is mostly normalization, i.e. translate and
+# partition, and natural_words does the grouping of digit strings.
+_TIMED_METHODS = (
+    'int_words', 'signed_int_words', 'natural_words', 'point_words',
+    'exp_words', 'str_words', 'normalized_str_words', 'fraction_words',
+    'float_words', 'fixed_float_words', 'ordinal_words', 'parse_words',
+)
+
+
+def _record(name: str, seconds: float, self_seconds: float):
+    stats = _STATS
+    if stats is None:  # disabled while converting
+        return
+    with _STATS_LOCK:
+        entry = stats.get(name)
+        if entry is None:
+            entry = stats[name] = [0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] += self_seconds
+    callback = _STATS_CALLBACK
+    if callback is not None:
+        callback(name, seconds)
+
+
+def _timed(name: str, method):
+    """Return a wrapper of the _Engine method that records its timing."""
+    def timed(self, number, *args):
+        local = _STATS_LOCAL
+        outer = getattr(local, 'children', None)  # None for top-level calls
+        local.children = 0.0
+        t0 = _perf_counter()
+        try:
+            return method(self, number, *args)
+        finally:
+            seconds = _perf_counter() - t0
+            children = local.children
+            if outer is None:
+                local.children = None
+                if name != 'parse_words':
+                    _record(
+                        'type:' + number.__class__.__name__, seconds, seconds)
+            else:
+                local.children = outer + seconds
+            _record(name, seconds, seconds - children)
+    timed.__name__ = method.__name__
+    timed.__doc__ = method.__doc__
+    return timed
+
+
+class _InstrumentedEngine(_Engine):
+
+    """An _Engine that records the calls and time of _TIMED_METHODS."""
+
+    __slots__ = ()
+
+
+for _name in _TIMED_METHODS:
+    setattr(_InstrumentedEngine, _name, _timed(
+        _name, getattr(_Engine, _name)))
+del _name
+
+
+def _new_engine(*tables) -> _Engine:
+    """Return a new _Engine, an instrumented one if stats are enabled."""
+    if _STATS is None:
+        return _Engine(*tables)
+    t0 = _perf_counter()
+    engine = _InstrumentedEngine(*tables)
+    seconds = _perf_counter() - t0
+    _record('build_engine', seconds, seconds)
+    return engine
+
+
+def enable_stats(callback=None):
+    """Record the number of calls and time spent in each conversion phase.
+
+    The phases are the methods of the conversion engine, e.g. str_words,
+    natural_words, or ordinal_words, plus 'type:<name>' for the type of the
+    numbers that were converted, 'build_engine' for rebuilding the engine
+    after the tables are modified, and 'change_defaults'. See stats_info.
+
+    If callback is given it is called with the name of the phase and the
+    seconds spent in it after each timed call, e.g. to export them.
+
+    Only the module functions and the Formatters created while enabled are
+    instrumented. When disabled, which is the default, conversions run the
+    same code as if this function did not exist.
+    """
+    global _STATS, _STATS_CALLBACK, _STATS_LOCAL, _STATS_LOCK, _ENGINE
+    from _thread import _local, allocate_lock
+    _STATS_LOCAL = _local()
+    _STATS_LOCK = allocate_lock()
+    _STATS_CALLBACK = callback
+    with _LOCK:
+        _STATS = {}
+        _ENGINE = None  # rebuilt with instrumentation
+    cache_clear()  # cached results would not be counted
+
+
+def disable_stats():
+    """Stop recording statistics, see enable_stats."""
+    global _STATS, _STATS_CALLBACK, _ENGINE
+    with _LOCK:
+        _STATS = _STATS_CALLBACK = None
+        _ENGINE = None
+
+
+def stats_info() -> 'Optional[dict]':
+    """Return the statistics recorded since enable_stats or stats_clear.
+
+    The result maps the name of each phase to a dict of its number of
+    calls, cumulative seconds, and self_seconds, the seconds not spent in
+    other timed phases, e.g.
+
+        {'str_words': {'calls': 2, 'seconds': 2e-05, 'self_seconds': 1e-05}}
+
+    Return None if statistics are not enabled.
+    """
+    stats = _STATS
+    if stats is None:
+        return None
+    with _STATS_LOCK:
+        return {
+            name: {'calls': calls, 'seconds': seconds,
+                   'self_seconds': self_seconds}
+            for name, (calls, seconds, self_seconds) in stats.items()
+        }
+
+
+def stats_clear():
+    """Reset the recorded statistics."""
+    stats = _STATS
+    if stats is not None:
+        with _STATS_LOCK:
+            stats.clear()
+
+
+def _convert(function, number, *options) -> str:
+    return function(number, *options)
+
+
+def words(
+    number: 'Union[int, float, str, Decimal, Fraction]',
+    positive: str = '',
+    negative: str = 'منفی ',
+    decimal_separator: str = ' و ',
+    fraction_separator: str = ' ',
+    ordinal_denominator: bool = True,
+    scientific_separator: str = ' در ده به توان ',
+) -> str:
+    """Return the word form of number.
+
+    If input is a string it should be in the form of a valid Python
+    representation for one of the other accepted types. The only exceptions are
+    that digits can be in Persian, for example words('۴۲') is valid.
+
+    """
+    cache = _CACHE
+    cls = number.__class__
+    # The C engine converts ints faster than the cache can look them up.
+    if cache is None or cls is int and _C_ENGINE and _FAST_INT:
+        # Exact int and str go straight to the engine unless words.register
+        # replaced their implementations, see _update_words_types.
+        if cls is int and _FAST_INT:
+            return (_ENGINE or _engine()).signed_int_words(
+                number, positive, negative)
+        if cls is str and _FAST_STR:
+            return (_ENGINE or _engine()).str_words(
+                number, positive, negative, decimal_separator,
+                fraction_separator, ordinal_denominator, scientific_separator,
+            )
+        return _dispatch_words(number, (
+            positive, negative, decimal_separator, fraction_separator,
+            ordinal_denominator, scientific_separator,
+        ))
+    if cls is Decimal:
+        # Decimal('1.0') == Decimal('1.00') but their words differ.
+        return cache(
+            _uncached_decimal_words, str(number), positive, negative,
+            decimal_separator, fraction_separator, ordinal_denominator,
+            scientific_separator,
+        )
+    return cache(
+        _uncached_words, number, positive, negative, decimal_separator,
+        fraction_separator, ordinal_denominator, scientific_separator,
+    )
+
+
+def _uncached_words(number, *options) -> str:
+    """Return words(number, *options) bypassing the cache.
+
+    Called by the cache on a miss. It takes the same fast paths as words,
+    so that only other types are dispatched by _dispatch_words.
+    """
+    cls = number.__class__
+    if cls is int and _FAST_INT:
+        return (_ENGINE or _engine()).signed_int_words(
+            number, options[0], options[1])
+    if cls is str and _FAST_STR:
+        return (_ENGINE or _engine()).str_words(number, *options)
+    return _dispatch_words(number, options)
+
+
+def _uncached_decimal_words(number: str, *options) -> str:
+    """Return words(Decimal(number), *options) bypassing the cache.
+
+    Decimals are cached by their str, which is converted back on a miss, so
+    that they are still dispatched as Decimals.
+    """
+    return _dispatch_words(Decimal(number), options)
+
+
+def _dispatch_words(number, options: tuple) -> str:
+    """Return words(number, *options) using the implementation for its type.
+
+    The implementations in this module take the options positionally. The
+    ones added by words.register are called the way the singledispatch words
+    function called them: only the options that differ from the defaults
+    are passed, as keyword arguments, so they may leave out the options.
+    """
+    cls = number.__class__
+    func = _WORDS_TYPES.get(cls) or _words.dispatch(cls)
+    if func in _OWN_WORDS:
+        return func(number, *options)
+    return func(number, **{
+        name: option for name, option, default in zip(
+            _OPTION_NAMES, options, words.__defaults__)
+        if option != default
+    })
+
+
+# noinspection PyUnusedLocal
+@_singledispatch
+def _words(
+    number: 'Union[int, float, str, Decimal, Fraction]',
+    positive: str = '',
+    negative: str = 'منفی ',
+    decimal_separator: str = ' و ',
+    fraction_separator: str = ' ',
+    ordinal_denominator: bool = True,
+    scientific_separator: str = ' در ده به توان ',
+) -> str:
+    if _register_types():
+        # number may be of a type that was not registered yet.
+        return _dispatch_words(number, (
+            positive, negative, decimal_separator, fraction_separator,
+            ordinal_denominator, scientific_separator,
+        ))
+    raise TypeError('invalid input type for words function', number)
+
+
+def _str_words(
+    number: str,
+    positive: str = '',
+    negative: str = 'منفی ',
+    decimal_separator: str = ' و ',
+    fraction_separator: str = ' ',
+    ordinal_denominator: bool = True,
+    scientific_separator: str = ' در ده به توان ',
+) -> str:
+    return (_ENGINE or _engine()).str_words(
+        number, positive, negative, decimal_separator, fraction_separator,
+        ordinal_denominator, scientific_separator,
+    )
+
+
+# noinspection PyUnusedLocal
+def _fraction_words(
+    number: 'Fraction',
+    positive: str = '',
+    negative: str = 'منفی ',
+    decimal_separator: str = ' و ',
+    fraction_separator: str = ' ',
+    ordinal_denominator: bool = True,
+    scientific_separator: str = ' در ده به توان ',
+) -> str:
+    return (_ENGINE or _engine()).fraction_words(
+        number, positive, negative, fraction_separator, ordinal_denominator,
+    )
+
+
+# noinspection PyUnusedLocal
+def _int_words(
+    number: int,
+    positive: str = '',
+    negative: str = 'منفی ',
+    decimal_separator: str = ' و ',
+    fraction_separator: str = ' ',
+    ordinal_denominator: bool = True,
+    scientific_separator: str = ' در ده به توان ',
+) -> str:
+    """Return the fa-word form for the given int."""
+    return (_ENGINE or _engine()).signed_int_words(number, positive, negative)
+
+
+# noinspection PyUnusedLocal
+def _float_words(
+    number: float,
+    positive: str = '',
+    negative: str = 'منفی ',
+    decimal_separator: str = ' و ',
+    fraction_separator: str = ' ',
+    ordinal_denominator: bool = True,
+    scientific_separator: str = ' در ده به توان ',
+) -> str:
+    """Return the fa-word form for the given float."""
+    return (_ENGINE or _engine()).float_words(
+        number, positive, negative, decimal_separator, scientific_separator,
+    )
+
+
+# Registering a type with singledispatch imports typing, which takes longer
+# than importing this module, so the types are registered with _words on
+# first use, see _register_types. Until then, and afterwards for speed,
+# words looks up the implementation of these exact types here.
+_WORDS_TYPES = {int: _int_words, float: _float_words, str: _str_words}
+# The implementations of words in this module, see _dispatch_words.
+_OWN_WORDS = frozenset((
+    _words.__wrapped__, _int_words, _float_words, _str_words, _fraction_words,
+))
+_OPTION_NAMES = (
+    'positive', 'negative', 'decimal_separator', 'fraction_separator',
+    'ordinal_denominator', 'scientific_separator',
+)
+# Whether the implementations of int and str are still the default ones.
+_FAST_INT = _FAST_STR = True
+
+# Whether Decimal and Fraction are imported, see _load_numbers.
+_NUMBERS_LOADED = False
+# Whether the types are registered with _words, see _register_types.
+_TYPES_REGISTERED = False
+
+
+def _load_numbers():
+    """Import Decimal and Fraction into the module namespace.
+
+    An instance of either cannot exist before its module is imported, so
+    they are only imported when they are needed, e.g. by parse_words.
+    """
+    global Decimal, Fraction, _NUMBERS_LOADED
+    from decimal import Decimal
+    from fractions import Fraction
+    _NUMBERS_LOADED = True
+
+
+def _register_types() -> bool:
+    """Register the implementations of words with _words.
+
+    Return False if they were already registered.
+    """
+    global _TYPES_REGISTERED
+    if _TYPES_REGISTERED:
+        return False
+    with _LOCK:
+        if _TYPES_REGISTERED:
+            return False
+        if not _NUMBERS_LOADED:
+            _load_numbers()
+        register = _words.register
+        for cls, func in _WORDS_TYPES.items():
+            register(cls, func)
+        register(Decimal, _str_words)
+        register(Fraction, _fraction_words)
+        _TYPES_REGISTERED = True
+    return True
+
+
+def _register(cls, func=None):
+    """Register func as the implementation of words for cls.
+
+    See functools.singledispatch for the forms of calling this function.
+    """
+    _register_types()
+    with _LOCK:
+        registered = _words.register(cls, func)
+        if func is None and registered is not cls:
+            # Used as @words.register(cls)
+            def decorator(f):
+                with _LOCK:
+                    f = registered(f)
+                    _update_words_types()
+                return f
+            return decorator
+        _update_words_types()
+    return registered
+
+
+def _update_words_types():
+    """Replace _WORDS_TYPES by the current implementations of its types.
+
+    The dict is replaced rather than updated, so words sees either all the
+    old implementations or all the new ones.
+    """
+    global _WORDS_TYPES, _FAST_INT, _FAST_STR
+    dispatch = _words.dispatch
+    _WORDS_TYPES = {cls: dispatch(cls) for cls in _WORDS_TYPES}
+    _FAST_INT = _WORDS_TYPES[int] is _int_words
+    _FAST_STR = _WORDS_TYPES[str] is _str_words
+    # The cached words may have been converted by the old implementations.
+    cache_clear()
+
+
+def _custom_types() -> bool:
+    """Return True if words.register added or replaced an implementation."""
+    if not _TYPES_REGISTERED:
+        return False
+    registry = _words.registry
+    return len(registry) != 6 or not (
+        _FAST_INT and _FAST_STR
+        and registry[float] is _float_words
+        and registry[Decimal] is _str_words
+        and registry[Fraction] is _fraction_words
+        and registry[object] is _words.__wrapped__
+    )
+
+
+def _dispatch(cls: type):
+    """Return the implementation of words for cls."""
+    _register_types()
+    return _words.dispatch(cls)
+
+
+words.register = _register
+words.registry = _words.registry  # incomplete until the first registration
+words.dispatch = _dispatch
+
+
+def __getattr__(name: str):
+    # Decimal and Fraction used to be imported eagerly.
+    if name == 'Decimal' or name == 'Fraction':
+        _load_numbers()
+        return globals()[name]
+    raise AttributeError(
+        'module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def ordinal_words(
+    number: 'Union[int, str]',
+    positive: str = '',
+    negative: str = 'منفی ',
+    *,
+    suffix: str = '',
+) -> str:
+    """Return the number converted to ordinal words form.
+
+    suffix is appended to the ordinal, e.g. ordinal_words(3, suffix='ین')
+    returns 'سومین' instead of 'سوم'. The suffixes in ORDINAL_SUFFIXES are
+    precomputed.
+    """
+    cache = _CACHE
+    if cache is None or number.__class__ is int and _C_ENGINE:
+        return (_ENGINE or _engine()).ordinal_words(
+            number, positive, negative, suffix)
+    return cache(_ordinal_words, number, positive, negative, suffix)
+
+
+def _ordinal_words(
+    number: 'Union[int, str]', positive: str, negative: str, suffix: str,
+):
+    return (_ENGINE or _engine()).ordinal_words(
+        number, positive, negative, suffix)
+
+
+def parse_words(
+    text: str,
+    *,
+    ordinal: bool = False,
+    positive: str = '',
+    negative: str = 'منفی ',
+    decimal_separator: str = ' و ',
+    fraction_separator: str = ' ',
+    scientific_separator: str = ' در ده به توان ',
+) -> 'Union[int, Decimal, Fraction]':
+    """Return the number that words (or ordinal_words) converted to text.
+
+    The options should be the same as the ones used to create the text.
+    Integers are returned as int, numbers with decimal places or exponents
+    as Decimal, and fractions as Fraction. If ordinal is true, text is
+    parsed as the output of ordinal_words and an int is returned.
+
+    Words that are both a fraction and a decimal, e.g. 'سه دهم' of
+    Fraction(3, 10) and Decimal('0.3'), are returned as a Decimal.
+
+    Raise ValueError if the text cannot be parsed.
+    """
+    return (_ENGINE or _engine()).parse_words(
+        text, ordinal, positive, negative, decimal_separator,
+        fraction_separator, scientific_separator,
+    )
+
+
+def words_many(
+    numbers: 'Iterable',
+    positive: str = '',
+    negative: str = 'منفی ',
+    decimal_separator: str = ' و ',
+    fraction_separator: str = ' ',
+    ordinal_denominator: bool = True,
+    scientific_separator: str = ' در ده به توان ',
+    *,
+    workers: int = 1,
+) -> list:
+    """Return the word form of each number in numbers.
+
+    The result is the same as calling words on each item. If numbers is a
+    NumPy array, an array of object dtype with the same shape is returned,
+    otherwise a list is returned.
+
+    If workers is not 1, numbers are split into chunks and converted in a
+    pool of that many processes, or one per CPU if workers is None. The
+    workers use a Formatter with the given options and the current tables.
+    Formatters do not use the implementations added by words.register, so
+    if there are any, numbers are converted in this process instead.
+    """
+    if workers != 1 and not _custom_types():
+        return Formatter(
+            positive, negative, decimal_separator, fraction_separator,
+            ordinal_denominator, scientific_separator,
+        ).words_many(numbers, workers=workers)
+
+    def convert(number):
+        return words(
+            number, positive, negative, decimal_separator, fraction_separator,
+            ordinal_denominator, scientific_separator,
+        )
+    # Columns of Decimals and Fractions are only converted in batch if the
+    # implementations of words for them have not been replaced.
+    batch = not _TYPES_REGISTERED or (
+        _words.dispatch(Fraction) is _fraction_words
+        and _words.dispatch(Decimal) is _str_words)
+    return _words_many(
+        numbers, convert, _ENGINE or _engine(), (
+            positive, negative, decimal_separator, fraction_separator,
+            ordinal_denominator, scientific_separator,
+        ), batch, _FAST_INT,
+    )
+
+
+def _words_many(
+    numbers: 'Iterable', convert, engine: _Engine, options: tuple,
+    batch: bool = True, int_batch: bool = True,
+):
+    """Convert numbers using convert, see words_many.
+
+    options are the options of words, positional. If batch is true, columns
+    of Decimals or Fractions are converted by _column_words. If int_batch is
+    true, integer NumPy arrays are converted by the int methods of engine.
+    """
+    numpy = _modules.get('numpy')
+    if numpy is not None and isinstance(numbers, numpy.ndarray):
+        result = numpy.empty(numbers.shape, dtype=object)
+        if numbers.dtype.kind in 'iu' and int_batch:
+            # The ufunc passes the items to the engine as Python ints and
+            # stores the words without building an intermediate list.
+            positive, negative = options[0], options[1]
+            if not positive and (
+                numbers.dtype.kind == 'u' or not (numbers < 0).any()
+            ):  # no signs, int_words is the cheapest to call
+                return numpy.frompyfunc(engine.int_words, 1, 1)(
+                    numbers, out=result)
+            return numpy.frompyfunc(engine.signed_int_words, 3, 1)(
+                numbers, positive, negative, out=result)
+        result.flat = _words_many(
+            numbers.ravel().tolist(), convert, engine, options, batch)
+        return result
+    if numbers.__class__ is not list:
+        numbers = list(numbers)
+    if batch and numbers and _NUMBERS_LOADED and (
+        numbers[0].__class__ is Fraction or numbers[0].__class__ is Decimal
+    ):
+        return _column_words(numbers, convert, engine, *options)
+    return [convert(n) for n in numbers]
+
+
+def _column_words(
+    numbers: list,
+    convert,
+    engine: _Engine,
+    positive: str,
+    negative: str,
+    decimal_separator: str,
+    fraction_separator: str,
+    ordinal_denominator: bool,
+    scientific_separator: str,
+) -> list:
+    """Convert a column of Fractions or Decimals.
+
+    The words of each distinct denominator and decimal place are built once
+    and shared by all the rows, only the numerators and digits are converted
+    per row. Items of other types, and Decimals in scientific notation, are
+    converted by convert. The result is the same as [convert(n) for n in
+    numbers].
+    """
+    int_words = engine.int_words
+    natural_words = engine.natural_words
+    ordinal_words = engine.ordinal_words
+    decimal_place = engine.decimal_place
+    denominators = {}  # denominator -> fraction_separator + its words
+    places = {}  # number of decimal places -> words of the place
+    results = []
+    append = results.append
+    for number in numbers:
+        cls = number.__class__
+        if cls is Fraction:
+            denominator = number.denominator
+            tail = denominators.get(denominator)
+            if tail is None:
+                tail = denominators[denominator] = fraction_separator + (
+                    ordinal_words(denominator, '', '') if ordinal_denominator
+                    else int_words(denominator))
+            numerator = number.numerator
+            if numerator < 0:
+                append(negative + int_words(-numerator) + tail)
+            else:
+                append(positive + int_words(numerator) + tail)
+            continue
+        if cls is not Decimal:
+            append(convert(number))
+            continue
+        integer, point, fraction = str(number).partition('.')
+        if integer[0] == '-':
+            sign = negative
+            integer = integer[1:]
+        elif integer[0] == '0':
+            sign = ''
+        else:
+            sign = positive
+        if not integer.isdigit() or not (
+            fraction.isdigit() or not fraction
+        ):  # scientific notation, infinity, or NaN
+            append(convert(number))
+            continue
+        if not fraction or fraction == '0':
+            append(sign + natural_words(integer))
+            continue
+        place = places.get(len(fraction))
+        if place is None:
+            place = places[len(fraction)] = decimal_place(len(fraction))
+        if integer == '0':
+            append(sign + natural_words(fraction) + place)
+        else:
+            append(
+                sign + natural_words(integer) + decimal_separator
+                + natural_words(fraction) + place)
+    return results
+
+
+def _array(typecode: str, initializer=()) -> 'array':
+    """Return array(typecode, initializer).
+
+    array is imported on first use and replaces this function.
+    """
+    global _array
+    from array import array as _array
+    return _array(typecode, initializer)
+
+
+def _groups(source) -> 'array':
+    """Return the groups of an int >= 0 or a digit string.
+
+    The groups are read the way int_words and natural_words read them: 0 and
+    '0' are array('H', [0]), whose words are 'صفر', and other zeros, e.g.
+    the '00' of '1.00', are an empty array, whose words are ''.
+    """
+    if source.__class__ is int:
+        return _array('H', _int_groups(source) if source else (0,))
+    if source == '0':
+        return _array('H', (0,))
+    if len(source) <= 1000:  # well below the digit limit of int
+        return _array('H', _int_groups(int(source)) if source else ())
+    groups = _array('H', [
+        int(source[max(i - 3, 0):i]) for i in range(len(source), 0, -3)])
+    while groups and not groups[-1]:
+        groups.pop()
+    return groups
+
+
+def _check_digits(digits: str) -> str:
+    """Return digits. Raise ValueError if it is not a digit string or ''."""
+    if not digits.isdigit() and digits:
+        raise ValueError('invalid digits', digits)
+    return digits
+
+
+class NumberWords:
+
+    """The word form of a number, stored as its parts and joined on demand.
+
+    Returned by lazy_words. str() returns the same words as the words
+    function, but they are only joined on first use. The parts are
+    available without joining anything, and each one is computed at most
+    once:
+
+    sign: the sign words, e.g. '' or 'منفی '.
+    integer: the three-digit groups of the integer part (or of the numerator
+        of a fraction), least significant first, as an array of unsigned
+        shorts, or None if the integer part is omitted as in 'پنج دهم'.
+    fraction: the groups of the digits after the decimal point or None.
+    places: the number of digits after the decimal point, 0 if none.
+    denominator: the groups of the denominator of a fraction or None. Its
+        sign, e.g. of '3/-4', is part of denominator_words.
+    exponent: the exponent of scientific notation as an int or None.
+    """
+
+    __slots__ = (
+        'sign', 'places', 'exponent', '_engine', '_options', '_words',
+        '_integer', '_fraction', '_denominator', '_denominator_sign',
+        '_groups', '_integer_words', '_fraction_words', '_denominator_words',
+    )
+
+    def __init__(
+        self, engine: _Engine, options: tuple, sign: str, integer,
+        fraction=None, places: int = 0, denominator=None,
+        exponent: int = None, denominator_sign: str = '',
+    ):
+        self._engine = engine
+        # positive, negative, decimal_separator, fraction_separator,
+        # ordinal_denominator, scientific_separator
+        self._options = options
+        self.sign = sign
+        # The integer, fraction, and denominator parts are each an int >= 0,
+        # a digit string, or None. Their words are converted by the engine
+        # and their groups by _groups, both only once and on demand.
+        self._integer = integer
+        self._fraction = fraction
+        self._denominator = denominator
+        self._denominator_sign = denominator_sign
+        self._groups = None  # {part index: groups}
+        self._integer_words = None
+        self._fraction_words = None
+        self._denominator_words = None
+        self.places = places
+        self.exponent = exponent
+        self._words = None
+
+    def _part_groups(self, i: int, source):
+        if source is None:
+            return None
+        groups = self._groups
+        if groups is None:
+            groups = self._groups = {}
+        elif i in groups:
+            return groups[i]
+        result = groups[i] = _groups(source)
+        return result
+
+    def _source_words(self, source) -> str:
+        if source is None:
+            return ''
+        if source.__class__ is int:
+            return self._engine.int_words(source)
+        return self._engine.natural_words(source)
+
+    @property
+    def integer(self):
+        return self._part_groups(0, self._integer)
+
+    @property
+    def fraction(self):
+        return self._part_groups(1, self._fraction)
+
+    @property
+    def denominator(self):
+        return self._part_groups(2, self._denominator)
+
+    def integer_classes(self, groups=None) -> list:
+        """Return the words of each non-zero group with its class name.
+
+        The groups are those of the integer part by default, most significant
+        first, e.g. ['دو میلیون', 'سیصد هزار', 'پنج'] for 2300005.
+        """
+        if groups is None:
+            groups = self.integer or ()
+        engine = self._engine
+        group_words = engine.group_words
+        classes = engine.classes
+        if len(groups) > len(classes):
+            classes = [engine.scale(i) for i in range(len(groups))]
+        return [
+            group_words[groups[i]] + classes[i]
+            for i in range(len(groups) - 1, -1, -1) if groups[i]
+        ]
+
+    @property
+    def integer_words(self) -> str:
+        """The words of the integer part without the sign, or ''."""
+        words = self._integer_words
+        if words is None:
+            integer = self._integer
+            if integer.__class__ is int:
+                words = self._engine.int_words(integer)
+            else:
+                words = self._source_words(integer)
+            self._integer_words = words
+        return words
+
+    @property
+    def fraction_words(self) -> str:
+        """The words of the decimal part including its place, or ''."""
+        words = self._fraction_words
+        if words is None:
+            fraction = self._fraction
+            words = self._source_words(fraction)
+            if fraction is not None:
+                words += self._engine.decimal_place(self.places)
+            self._fraction_words = words
+        return words
+
+    @property
+    def denominator_words(self) -> str:
+        """The words of the denominator of a fraction, or ''."""
+        words = self._denominator_words
+        if words is None:
+            denominator = self._denominator
+            if denominator is not None and self._options[4]:
+                # ordinal_denominator
+                if denominator.__class__ is not int:
+                    value = 0
+                    for group in reversed(self.denominator):
+                        value = value * 1000 + group
+                    denominator = value
+                words = self._denominator_sign + self._engine.ordinal_words(
+                    denominator, '', '')
+            else:
+                words = self._source_words(denominator)
+            self._denominator_words = words
+        return words
+
+    @property
+    def exponent_words(self) -> str:
+        """The signed words of the exponent, or ''."""
+        if self.exponent is None:
+            return ''
+        return self._engine.signed_int_words(
+            self.exponent, self._options[0], self._options[1])
+
+    def parts(self) -> list:
+        """Return the strings that str() joins, in order."""
+        positive, negative, decimal_separator, fraction_separator, _, \
+            scientific_separator = self._options
+        parts = [self.sign]
+        append = parts.append
+        if self._integer is not None:
+            append(self.integer_words)
+            if self._fraction is not None:
+                append(decimal_separator)
+        if self._fraction is not None:
+            append(self.fraction_words)
+        if self._denominator is not None:
+            append(fraction_separator)
+            append(self.denominator_words)
+        if self.exponent is not None:
+            append(scientific_separator)
+            append(self.exponent_words)
+        return parts
+
+    def __str__(self):
+        words = self._words
+        if words is None:
+            if (
+                self._fraction is None and self._denominator is None
+                and self.exponent is None
+            ):  # the common case of an integer
+                words = self.sign + self.integer_words
+            else:
+                words = ''.join(self.parts())
+            self._words = words
+        return words
+
+    def __len__(self):
+        words = self._words
+        return len(self.__str__() if words is None else words)
+
+    def __eq__(self, other):
+        if isinstance(other, (NumberWords, str)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __repr__(self):
+        return 'NumberWords({!r})'.format(str(self))
+
+
+def _lazy_words(
+    engine: _Engine, number: 'Union[int, float, str, Decimal, Fraction]',
+    options: tuple,
+) -> NumberWords:
+    positive, negative = options[0], options[1]
+    if isinstance(number, int):
+        number = int(number)  # e.g. True
+        if number < 0:
+            return NumberWords(engine, options, negative, -number)
+        return NumberWords(
+            engine, options, positive if number else '', number)
+    if isinstance(number, float):
+        return _lazy_float_words(engine, number, options)
+    if not isinstance(number, str):
+        if not _NUMBERS_LOADED:
+            _load_numbers()
+        if isinstance(number, Fraction):
+            numerator = number.numerator
+            if numerator < 0:
+                sign = negative
+                numerator = -numerator
+            else:
+                sign = positive
+            return NumberWords(
+                engine, options, sign, numerator,
+                denominator=number.denominator)
+        if not isinstance(number, Decimal):
+            raise TypeError('invalid input type for words function', number)
+    return _lazy_str_words(engine, str(number).strip(), options)
+
+
+def _lazy_float_words(
+    engine: _Engine, number: float, options: tuple,
+) -> NumberWords:
+    """Return the NumberWords of number, see _Engine.float_words."""
+    if number == 0:
+        return NumberWords(engine, options, '', 0)
+    if number < 0:
+        sign = options[1]
+        number = -number
+    else:
+        sign = options[0]
+    if number < 1e16 and number.is_integer():
+        return NumberWords(engine, options, sign, int(number))
+    str_num = repr(number)
+    mantissa, e, exponent = str_num.partition('e')
+    integer, point, fraction = mantissa.partition('.')
+    if not integer.isdigit():  # inf or nan
+        raise ValueError('invalid digits', str_num)
+    return _decimal_number_words(
+        engine, options, sign, integer, fraction, int(exponent) if e else None)
+
+
+def _lazy_str_words(
+    engine: _Engine, number: str, options: tuple,
+) -> NumberWords:
+    """Return the NumberWords of number, see _Engine.str_words."""
+    positive, negative = options[0], options[1]
+    if number.isdigit():
+        return NumberWords(
+            engine, options, '' if number[0] == '0' else positive, number)
+    match = _match_number(number)
+    if match is not None:
+        sign, integer, denominator, fraction, exponent = match.groups()
+        if not integer.isdigit():  # has grouping separators
+            integer = integer.translate(_NORMALIZATION_TABLE)
+        if sign == '-':
+            sign = negative
+        elif integer[0] == '0':
+            sign = ''
+        else:
+            sign = positive
+    else:
+        number = number.translate(_NORMALIZATION_TABLE)
+        c0 = number[0]
+        if c0 == '-':
+            sign = negative
+            number = number[1:]
+        elif c0 == '0':
+            sign = ''
+        else:
+            sign = positive
+        number, slash, denominator = number.partition('/')
+        if denominator:
+            # Like str_words, the numerator must be digits and only an
+            # ordinal denominator may have a sign, e.g. 'سه منفی چهارم'.
+            if denominator[0] == '-' and options[4]:
+                value = int(denominator)
+                return NumberWords(
+                    engine, options, sign, _check_digits(number),
+                    denominator=_check_digits(denominator[1:]),
+                    denominator_sign=negative if value else '')
+            return NumberWords(
+                engine, options, sign, _check_digits(number),
+                denominator=_check_digits(denominator))
+        denominator = None
+        number, e, exponent = number.partition('e')
+        if not exponent:
+            exponent = None
+        integer, point, fraction = number.partition('.')
+        if not fraction:
+            fraction = None
+    if denominator is not None:
+        return NumberWords(
+            engine, options, sign, _check_digits(integer),
+            denominator=_check_digits(denominator))
+    return _decimal_number_words(
+        engine, options, sign, integer, fraction,
+        None if exponent is None else int(exponent))
+
+
+def _decimal_number_words(
+    engine: _Engine, options: tuple, sign: str, integer: str, fraction: str,
+    exponent: int,
+) -> NumberWords:
+    """Return the NumberWords of the digits of a decimal number."""
+    _check_digits(integer)
+    if not fraction or fraction == '0':
+        return NumberWords(engine, options, sign, integer, exponent=exponent)
+    _check_digits(fraction)
+    if integer == '0':
+        return NumberWords(
+            engine, options, sign, None, fraction, len(fraction),
+            exponent=exponent)
+    return NumberWords(
+        engine, options, sign, integer, fraction, len(fraction),
+        exponent=exponent)
+
+
+def lazy_words(
+    number: 'Union[int, float, str, Decimal, Fraction]',
+    positive: str = '',
+    negative: str = 'منفی ',
+    decimal_separator: str = ' و ',
+    fraction_separator: str = ' ',
+    ordinal_denominator: bool = True,
+    scientific_separator: str = ' در ده به توان ',
+) -> NumberWords:
+    """Return the word form of number as a NumberWords object.
+
+    str() of the result is the same as the result of words, but the words
+    are only joined when needed. Use it when only the length or some parts
+    of the words are needed, e.g. just the integer part or its classes.
+    """
+    return _lazy_words(_ENGINE or _engine(), number, (
+        positive, negative, decimal_separator, fraction_separator,
+        ordinal_denominator, scientific_separator,
+    ))
+
+
+def transliterate_text(
+    stream,
+    positive: str = '',
+    negative: str = 'منفی ',
+    decimal_separator: str = ' و ',
+    fraction_separator: str = ' ',
+    ordinal_denominator: bool = True,
+    scientific_separator: str = ' در ده به توان ',
+):
+    """Yield the text of stream with the numbers in it replaced by words.
+
+    stream can be a text file or an iterable of str chunks. Numbers may be in
+    ASCII or Persian digits, grouped by ٬ or comma, with a decimal part after
+    . or ٫, or a fraction like 3/4. Numbers with more than one slash, e.g.
+    dates like ۱۴۰۲/۰۵/۱۲, have each of their parts replaced separately.
+    Numbers that cannot be converted are left unchanged.
+
+    The text is yielded in pieces as it is read, numbers that are split
+    between chunks are joined first.
+    """
+    def convert(number: str) -> str:
+        return str_words(
+            number, positive, negative, decimal_separator, fraction_separator,
+            ordinal_denominator, scientific_separator,
+        )
+    str_words = (_ENGINE or _engine()).str_words
+    return _transliterate_text(stream, convert)
+
+
+# Size of the chunks read by transliterate_text from file objects.
+_TEXT_CHUNK_SIZE = 1 << 16
+# Characters at the end of a chunk that may belong to a number continued in
+# the next chunk, in addition to digits.
+_NUMBER_CHARS = '-٬,.٫/'
+# Longest number-like text held back at the end of a chunk.
+_MAX_HELD_LENGTH = 1 << 10
+# The compiled pattern of numbers in text, see _text_number_pattern.
+_TEXT_NUMBER_PATTERN = None
+
+
+def _text_number_pattern():
+    """Return the pattern of numbers in text, compiling it on first use.
+
+    A hyphen is a sign only if it is not preceded by a word character, e.g.
+    in 10-12 it is not. Groups must have three digits, so that lists like
+    1,2 are not joined.
+    """
+    global _TEXT_NUMBER_PATTERN
+    pattern = _TEXT_NUMBER_PATTERN
+    if pattern is None:
+        from re import compile
+        pattern = _TEXT_NUMBER_PATTERN = compile(
+            r'(?:(?<![\w-])-)?\d+(?:[٬,]\d{3}(?!\d))*'
+            r'(?:(?:/\d+)+|[.٫]\d+)?'
+        )
+    return pattern
+
+
+def _transliterate_text(stream, convert):
+    if isinstance(stream, str):
+        stream = stream,
+    elif hasattr(stream, 'read'):
+        stream = iter(_partial(stream.read, _TEXT_CHUNK_SIZE), '')
+    finditer = _text_number_pattern().finditer
+
+    def replace(number: str) -> str:
+        try:
+            if number.count('/') > 1:
+                return '/'.join([convert(part) for part in number.split('/')])
+            return convert(number)
+        except (ValueError, IndexError):
+            return number
+
+    def rewrite(buffer: str, start: int, end: int) -> str:
+        parts = []
+        append = parts.append
+        position = start
+        for match in finditer(buffer, start, end):
+            append(buffer[position:match.start()])
+            append(replace(match.group()))
+            position = match.end()
+        append(buffer[position:end])
+        return ''.join(parts)
+
+    # The last character of the previous chunk is kept at the start of the
+    # buffer for the lookbehind of the pattern.
+    buffer = ''
+    start = 0
+    for chunk in stream:
+        if not chunk:
+            continue
+        buffer += chunk
+        # Hold back the number-like text at the end of the buffer.
+        end = cut = len(buffer)
+        while cut > start and (
+            buffer[cut - 1].isdecimal() or buffer[cut - 1] in _NUMBER_CHARS
+        ):
+            cut -= 1
+        if end - cut > _MAX_HELD_LENGTH:
+            cut = end
+        if cut == start:
+            continue
+        yield rewrite(buffer, start, cut)
+        buffer = buffer[cut - 1:]
+        start = 1
+    if len(buffer) > start:
+        yield rewrite(buffer, start, len(buffer))
+
+
+class Formatter:
+
+    """Convert numbers to words using a fixed set of options and tables.
+
+    The arguments are the same as those of the words function. The word
+    tables default to the current module tables and are copied, so later
+    changes to them, or calls to change_defaults, do not affect the formatter.
+
+    If places is given, floats are rounded to that many decimal places
+    instead of using the shortest digits that represent them, see
+    _Engine.fixed_float_words. If normalize_mantissa is True, strs and
+    Decimals in scientific notation are converted with one nonzero digit
+    before the point, see _normalize_mantissa. Floats already are.
+
+    Formatters are immutable and all their work is done once in the
+    constructor, so they are safe to share between threads and much cheaper
+    per call than passing the options to words. Use their words,
+    ordinal_words, and words_many methods, e.g.
+
+        >>> Formatter(decimal_separator=' ممیز ').words(1.5)
+        'یک ممیز پنج دهم'
+        >>> Formatter(places=2).words(2.5)
+        'دو و پنجاه صدم'
+        >>> Formatter(normalize_mantissa=True).words('12.5e3')
+        'یک و بیست و پنج صدم در ده به توان چهار'
+    """
+
+    __slots__ = (
+        'positive', 'negative', 'decimal_separator', 'fraction_separator',
+        'ordinal_denominator', 'scientific_separator', 'ones', 'tens',
+        'ten_to_twenty', 'hundreds', 'classes', 'decimal_places', 'places',
+        'normalize_mantissa', '_engine', '_converters', 'words',
+        'ordinal_words',
+    )
+
+    def __init__(
+        self,
+        positive: str = '',
+        negative: str = 'منفی ',
+        decimal_separator: str = ' و ',
+        fraction_separator: str = ' ',
+        ordinal_denominator: bool = True,
+        scientific_separator: str = ' در ده به توان ',
+        ones: 'Iterable' = None,
+        tens: 'Iterable' = None,
+        ten_to_twenty: 'Iterable' = None,
+        hundreds: 'Iterable' = None,
+        classes: 'Iterable' = None,
+        decimal_places: 'Iterable' = None,
+        places: int = None,
+        normalize_mantissa: bool = False,
+    ):
+        set_ = super().__setattr__
+        set_('positive', positive)
+        set_('negative', negative)
+        set_('decimal_separator', decimal_separator)
+        set_('fraction_separator', fraction_separator)
+        set_('ordinal_denominator', ordinal_denominator)
+        set_('scientific_separator', scientific_separator)
+        set_('ones', tuple(ONES if ones is None else ones))
+        set_('tens', tuple(TENS if tens is None else tens))
+        set_('ten_to_twenty', tuple(
+            TEN_TO_TWENTY if ten_to_twenty is None else ten_to_twenty))
+        set_('hundreds', tuple(HUNDREDS if hundreds is None else hundreds))
+        if classes is None:
+            classes = CLASSES
+            if decimal_places is None:
+                decimal_places = DECIMAL_PLACES
+        elif decimal_places is None:
+            decimal_places = _decimal_places(classes)
+        set_('classes', tuple(classes))
+        set_('decimal_places', tuple(decimal_places))
+        set_('places', places)
+        set_('normalize_mantissa', normalize_mantissa)
+        engine = _new_engine(
+            self.ones, self.tens, self.ten_to_twenty, self.hundreds,
+            self.classes, self.decimal_places,
+        )
+        set_('_engine', engine)
+
+        int_words = engine.signed_int_words
+        str_words = engine.str_words
+        float_words = engine.float_words
+        fraction_words = engine.fraction_words
+        engine_ordinal_words = engine.ordinal_words
+
+        def convert_int(number: int) -> str:
+            return int_words(number, positive, negative)
+
+        if normalize_mantissa:
+            def convert_str(number: str) -> str:
+                return str_words(
+                    _normalize_mantissa(str(number)), positive, negative,
+                    decimal_separator, fraction_separator,
+                    ordinal_denominator, scientific_separator,
+                )
+        else:
+            def convert_str(number: str) -> str:
+                return str_words(
+                    number, positive, negative, decimal_separator,
+                    fraction_separator, ordinal_denominator,
+                    scientific_separator,
+                )
+
+        if places is None:
+            def convert_float(number: float) -> str:
+                return float_words(
+                    number, positive, negative, decimal_separator,
+                    scientific_separator,
+                )
+        else:
+            fixed_float_words = engine.fixed_float_words
+
+            def convert_float(number: float) -> str:
+                return fixed_float_words(
+                    number, places, positive, negative, decimal_separator)
+
+        def convert_fraction(number: 'Fraction') -> str:
+            return fraction_words(
+                number, positive, negative, fraction_separator,
+                ordinal_denominator,
+            )
+
+        converters = {
+            int: convert_int,
+            str: convert_str,
+            float: convert_float,
+        }
+        set_('_converters', converters)
+
+        def add_number_types() -> bool:
+            # Decimal and Fraction are added on first use, see _load_numbers.
+            if not _NUMBERS_LOADED:
+                _load_numbers()
+            if Decimal in converters:
+                return False
+            converters[Decimal] = convert_str
+            converters[Fraction] = convert_fraction
+            return True
+
+        if _NUMBERS_LOADED:
+            add_number_types()
+
+        def words(number: 'Union[int, float, str, Decimal, Fraction]') -> str:
+            """Return the word form of number, see the words function."""
+            convert = converters.get(number.__class__)
+            if convert is None:
+                for cls in number.__class__.__mro__[1:]:
+                    convert = converters.get(cls)
+                    if convert is not None:
+                        break
+                else:
+                    if add_number_types():
+                        return words(number)
+                    raise TypeError(
+                        'invalid input type for words function', number)
+            return convert(number)
+
+        def ordinal_words(
+            number: 'Union[int, str]', *, suffix: str = '',
+        ) -> str:
+            """Return the number converted to ordinal words form.
+
+            See the ordinal_words function.
+            """
+            return engine_ordinal_words(number, positive, negative, suffix)
+
+        set_('words', words)
+        set_('ordinal_words', ordinal_words)
+
+    def words_many(self, numbers: 'Iterable', *, workers: int = 1) -> list:
+        """Return the word form of each number, see the words_many function.
+        """
+        if workers != 1:
+            return _parallel_words_many(self, numbers, workers)
+        return _words_many(numbers, self.words, self._engine, (
+            self.positive, self.negative, self.decimal_separator,
+            self.fraction_separator, self.ordinal_denominator,
+            self.scientific_separator,
+        ))
+
+    def lazy_words(
+        self, number: 'Union[int, float, str, Decimal, Fraction]',
+    ) -> NumberWords:
+        """Return the word form of number as a NumberWords object.
+
+        See the lazy_words function.
+        """
+        return _lazy_words(self._engine, number, (
+            self.positive, self.negative, self.decimal_separator,
+            self.fraction_separator, self.ordinal_denominator,
+            self.scientific_separator,
+        ))
+
+    def transliterate_text(self, stream):
+        """Yield the text of stream with the numbers in it replaced by words.
+
+        See the transliterate_text function.
+        """
+        return _transliterate_text(stream, self._converters[str])
+
+    def parse_words(
+        self, text: str, ordinal: bool = False,
+    ) -> 'Union[int, Decimal, Fraction]':
+        """Return the number that this formatter converted to text.
+
+        See the parse_words function.
+        """
+        return self._engine.parse_words(
+            text, ordinal, self.positive, self.negative,
+            self.decimal_separator, self.fraction_separator,
+            self.scientific_separator,
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Formatter objects are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('Formatter objects are immutable')
+
+    def __reduce__(self):
+        return Formatter, (
+            self.positive, self.negative, self.decimal_separator,
+            self.fraction_separator, self.ordinal_denominator,
+            self.scientific_separator, self.ones, self.tens,
+            self.ten_to_twenty, self.hundreds, self.classes,
+            self.decimal_places, self.places, self.normalize_mantissa,
+        )
+
+    def __repr__(self):
+        return (
+            'Formatter(positive={!r}, negative={!r}, decimal_separator={!r},'
+            ' fraction_separator={!r}, ordinal_denominator={!r},'
+            ' scientific_separator={!r}, places={!r},'
+            ' normalize_mantissa={!r})'
+        ).format(
+            self.positive, self.negative, self.decimal_separator,
+            self.fraction_separator, self.ordinal_denominator,
+            self.scientific_separator, self.places, self.normalize_mantissa,
+        )
+
+
+# The Formatter of the current worker process, see _parallel_convert.
+_WORKER_FORMATTER = None
+
+
+def _init_worker(formatter: Formatter):
+    global _WORKER_FORMATTER
+    _WORKER_FORMATTER = formatter
+
+
+def _convert_chunk(method: str, catch: bool, chunk):
+    """Convert chunk using a method of the worker's Formatter.
+
+    If catch is true, return ValueError and IndexError exceptions in place of
+    the invalid items instead of raising them.
+    """
+    convert = getattr(_WORKER_FORMATTER, method)
+    if method == 'words_many':
+        return convert(chunk)
+    if not catch:
+        return [convert(item) for item in chunk]
+    results = []
+    append = results.append
+    for item in chunk:
+        try:
+            append(convert(item))
+        except (ValueError, IndexError) as e:
+            append(e)
+    return results
+
+
+def _chunk_size(count, workers: int) -> int:
+    """Return the number of items per chunk for a parallel conversion.
+
+    Aim for about four chunks per worker so that uneven chunks balance out,
+    but keep chunks large enough to amortize the inter-process communication
+    and small enough to bound the memory used by each one. count is None if
+    the number of items is unknown.
+    """
+    if count is None:
+        return 16384
+    return max(1024, min(65536, -(-count // (workers * 4))))
+
+
+def _parallel_convert(
+    formatter: Formatter, method: str, chunks: 'Iterable', workers: int,
+    catch: bool = False,
+):
+    """Convert chunks using a pool of processes.
+
+    Yield (chunk, converted_chunk) pairs in the order of chunks. Only a few
+    chunks per worker are read ahead, so chunks can be a lazy stream.
+    """
+    from collections import deque
+    from multiprocessing import Pool
+    with Pool(workers, _init_worker, (formatter,)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, pool.apply_async(
+                _convert_chunk, (method, catch, chunk))))
+            if len(pending) > 2 * workers:
+                chunk, result = pending.popleft()
+                yield chunk, result.get()
+        while pending:
+            chunk, result = pending.popleft()
+            yield chunk, result.get()
+
+
+def _parallel_words_many(formatter: Formatter, numbers, workers: int):
+    if workers is None:
+        workers = _cpu_count() or 1
+    numpy = _modules.get('numpy')
+    if numpy is not None and isinstance(numbers, numpy.ndarray):
+        flat = numbers.ravel()
+        chunk_count = -(-flat.size // _chunk_size(flat.size, workers)) or 1
+        result = numpy.empty(flat.shape, dtype=object)
+        start = 0
+        for _, converted in _parallel_convert(
+            formatter, 'words_many', numpy.array_split(flat, chunk_count),
+            workers,
+        ):
+            result[start:start + converted.size] = converted
+            start += converted.size
+        return result.reshape(numbers.shape)
+    try:
+        size = _chunk_size(len(numbers), workers)
+    except TypeError:  # numbers has no len
+        size = _chunk_size(None, workers)
+    iterator = iter(numbers)
+    chunks = iter(lambda: list(_islice(iterator, size)), [])
+    result = []
+    for _, converted in _parallel_convert(
+        formatter, 'words_many', chunks, workers,
+    ):
+        result += converted
+    return result
+
+
+def change_defaults(
+    positive: str = '',
+    negative: str = 'منفی ',
+    decimal_separator: str = ' و ',
+    fraction_separator: str = ' ',
+    ordinal_denominator: bool = True,
+    scientific_separator: str = ' در ده به توان ',
+):
+    """The the default values for words, words_many, and ordinal_words.
+
+    Each function gets its new defaults in a single assignment, so calls in
+    other threads use either the old defaults or the new ones, never a mix.
+    Calls to different functions during the change may disagree; threads
+    that need consistent options should use a Formatter instead.
+    """
+    if _STATS is not None:
+        t0 = _perf_counter()
+    defaults = (
+        positive, negative, decimal_separator, fraction_separator,
+        ordinal_denominator, scientific_separator,
+    )
+    with _LOCK:
+        change_defaults.__defaults__ = defaults
+        words.__defaults__ = defaults
+        lazy_words.__defaults__ = defaults
+        for func in _chain(words.registry.values(), _WORDS_TYPES.values()):
+            func.__defaults__ = defaults
+        words_many.__defaults__ = defaults
+        transliterate_text.__defaults__ = defaults
+        ordinal_words.__defaults__ = (positive, negative)
+        parse_words.__kwdefaults__ = dict(
+            parse_words.__kwdefaults__,
+            positive=positive,
+            negative=negative,
+            decimal_separator=decimal_separator,
+            fraction_separator=fraction_separator,
+            scientific_separator=scientific_separator,
+        )
+    cache_clear()
+    if _STATS is not None:
+        seconds = _perf_counter() - t0
+        _record('change_defaults', seconds, seconds)
+
+
+# The module tables, see _Module.
+_TABLE_NAMES = frozenset((
+    'ONES', 'TENS', 'TEN_TO_TWENTY', 'HUNDREDS', 'CLASSES', 'DECIMAL_PLACES',
+))
+
+
+class _Module(_ModuleType):
+
+    """The type of this module.
+
+    Rebinding one of the tables, e.g. num2fawords.HUNDREDS = [...],
+    invalidates the engine like modifying it in place does. A list is
+    copied into a _WordList so that later in-place changes are seen too.
+    """
+
+    def __setattr__(self, name: str, value):
+        if name not in _TABLE_NAMES:
+            super().__setattr__(name, value)
+            return
+        if isinstance(value, list) and not isinstance(value, _WordList):
+            value = _WordList(value)
+        with _LOCK:
+            super().__setattr__(name, value)
+            _invalidate_tables()
+
+
+_modules[__name__].__class__ = _Module
@@ -1,20 +1,284 @@
 """Provide a command-line interface to use cardinal_words and ordinal_words."""
 
-from argparse import ArgumentParser
-
-from num2fawords import words, ordinal_words
-
-
-parser = ArgumentParser()
-parser.add_argument(
-    'number', help='the number that is going to be converted to words'
-)
-parser.add_argument(
-    '--ordinal', '-o',
-    help='convert to ordinal from', action='store_true',
-)
-args = parser.parse_args()
-if args.ordinal:
-    print(ordinal_words(args.number))
-else:
-    print(words(args.number))
+import sys
+from itertools import islice
+from os import cpu_count
+
+from num2fawords import Formatter, _chunk_size, _parallel_convert
+
+# argparse is only imported when the arguments need it, see _simple_args.
+if False:  # pragma: no cover, typing.TYPE_CHECKING
+    from argparse import ArgumentParser, Namespace
+
+# Number of converted records that are joined and written at once.
+_WRITE_BATCH_SIZE = 1024
+# Size of the chunks read from NUL-delimited input.
+_READ_CHUNK_SIZE = 1 << 16
+
+
+def _parser() -> 'ArgumentParser':
+    # argparse is imported here as it is not needed by _simple_args.
+    from argparse import ArgumentParser
+    parser = ArgumentParser(
+        prog='python -m num2fawords',
+        epilog='To convert a column of a CSV or Parquet file, see'
+        ' python -m num2fawords column --help',
+    )
+    parser.add_argument(
+        'number', nargs='?',
+        help='the number that is going to be converted to words, use - to'
+        ' read numbers from the standard input, one per line',
+    )
+    parser.add_argument(
+        '--ordinal', '-o',
+        help='convert to ordinal from', action='store_true',
+    )
+    parser.add_argument(
+        '--stdin', action='store_true',
+        help='read numbers from the standard input, one per line',
+    )
+    parser.add_argument(
+        '--null', '-0', action='store_true',
+        help='input and output records are delimited by NUL characters'
+        ' instead of newlines',
+    )
+    parser.add_argument(
+        '--keep-going', '-k', action='store_true',
+        help='when reading from the standard input, write an empty record for'
+        ' invalid numbers and continue instead of stopping at the first one',
+    )
+    parser.add_argument(
+        '--workers', '-j', type=int, default=1, metavar='N',
+        help='when reading from the standard input, convert the numbers in N'
+        ' processes, 0 means one per CPU',
+    )
+    _add_formatter_arguments(parser)
+    return parser
+
+
+def _add_formatter_arguments(parser: 'ArgumentParser'):
+    parser.add_argument('--positive', default='', help='the positive sign')
+    parser.add_argument(
+        '--negative', default='منفی ', help='the negative sign',
+    )
+    parser.add_argument(
+        '--decimal-separator', default=' و ', help='the decimal separator',
+    )
+    parser.add_argument(
+        '--fraction-separator', default=' ', help='the fraction separator',
+    )
+    parser.add_argument(
+        '--no-ordinal-denominator', dest='ordinal_denominator',
+        action='store_false',
+        help='use cardinal words for the denominator of fractions',
+    )
+    parser.add_argument(
+        '--scientific-separator', default=' در ده به توان ',
+        help='the separator between the base and the exponent',
+    )
+
+
+def _formatter(args: 'Namespace') -> Formatter:
+    return Formatter(
+        args.positive, args.negative, args.decimal_separator,
+        args.fraction_separator, args.ordinal_denominator,
+        args.scientific_separator,
+    )
+
+
+def _column_parser() -> 'ArgumentParser':
+    from argparse import ArgumentParser
+    from num2fawords.columns import BATCH_SIZE
+    parser = ArgumentParser(
+        prog='python -m num2fawords column',
+        description='Copy a CSV or Parquet file adding the word form of one'
+        ' of its columns. The file is converted in batches of rows, so large'
+        ' files do not need to fit in memory.',
+    )
+    parser.add_argument(
+        'source', help='the input file, - for CSV from the standard input',
+    )
+    parser.add_argument(
+        'destination',
+        help='the output file, - for CSV to the standard output',
+    )
+    parser.add_argument('column', help='the name of the column to convert')
+    parser.add_argument(
+        '--output-column', metavar='NAME',
+        help='the name of the added column, COLUMN_words by default',
+    )
+    parser.add_argument(
+        '--format', dest='file_format', choices=('csv', 'parquet'),
+        help='the file format, by default parquet if SOURCE ends with'
+        ' .parquet or .pq and csv otherwise',
+    )
+    parser.add_argument(
+        '--delimiter', '-d', default=',', help='the CSV field delimiter',
+    )
+    parser.add_argument(
+        '--batch-size', type=int, default=BATCH_SIZE, metavar='N',
+        help='the number of rows converted at once (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--ordinal', '-o',
+        help='convert to ordinal from', action='store_true',
+    )
+    parser.add_argument(
+        '--keep-going', '-k', action='store_true',
+        help='leave the cells of invalid numbers empty and continue instead'
+        ' of stopping at the first one',
+    )
+    _add_formatter_arguments(parser)
+    return parser
+
+
+def _column_main(args: list) -> int:
+    """Run the column subcommand and return the exit status."""
+    from num2fawords.columns import convert_column
+    args = _column_parser().parse_args(args)
+    try:
+        errors = convert_column(
+            sys.stdin if args.source == '-' else args.source,
+            sys.stdout if args.destination == '-' else args.destination,
+            args.column, _formatter(args),
+            output_column=args.output_column, ordinal=args.ordinal,
+            batch_size=args.batch_size, file_format=args.file_format,
+            keep_going=args.keep_going, delimiter=args.delimiter,
+        )
+    except (ValueError, ImportError) as e:
+        print('error: {}'.format(e), file=sys.stderr)
+        return 1
+    sys.stdout.flush()
+    return 1 if errors else 0
+
+
+def _is_negative_number(arg: str) -> bool:
+    """Return True if argparse would take arg as a negative number."""
+    integer, point, fraction = arg[1:].partition('.')
+    if point:
+        return (not integer or integer.isdecimal()) and fraction.isdecimal()
+    return integer.isdecimal()
+
+
+def _simple_args(args: list):
+    """Return (number, ordinal) if args do not need argparse, else None.
+
+    Converting a single number is the most common use in shell scripts, and
+    importing argparse and building the parser takes longer than that.
+    """
+    if len(args) == 1:
+        number, ordinal = args[0], False
+    elif len(args) == 2 and args[0] in ('-o', '--ordinal'):
+        number, ordinal = args[1], True
+    elif len(args) == 2 and args[1] in ('-o', '--ordinal'):
+        number, ordinal = args[0], True
+    else:
+        return None
+    if number[:1] == '-' and not _is_negative_number(number):
+        return None
+    return number, ordinal
+
+
+def _read_records(file, delimiter: str):
+    """Yield the records of file without reading all of it into memory."""
+    if delimiter == '\n':
+        for line in file:
+            yield line.rstrip('\r\n')
+        return
+    read = file.read
+    remainder = ''
+    while True:
+        chunk = read(_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        records = (remainder + chunk).split(delimiter)
+        remainder = records.pop()
+        yield from records
+    if remainder:
+        yield remainder
+
+
+def _converted(convert, records):
+    """Yield (record, words) pairs, or (record, exception) for errors."""
+    for record in records:
+        try:
+            yield record, convert(record)
+        except (ValueError, IndexError) as e:
+            yield record, e
+
+
+def _parallel_converted(formatter, method: str, records, workers: int):
+    """Yield the same pairs as _converted using a pool of processes."""
+    size = _chunk_size(None, workers)
+    chunks = iter(lambda: list(islice(records, size)), [])
+    for chunk, converted in _parallel_convert(
+        formatter, method, chunks, workers, catch=True,
+    ):
+        yield from zip(chunk, converted)
+
+
+def _write_stream(converted, output, delimiter: str, keep_going) -> int:
+    """Write the converted records to output. Return the number of errors."""
+    errors = 0
+    batch = []
+    append = batch.append
+    for record_number, (record, result) in enumerate(converted, 1):
+        if isinstance(result, Exception):
+            print(
+                'invalid number on record {}: {!r} ({})'.format(
+                    record_number, record, result),
+                file=sys.stderr,
+            )
+            errors += 1
+            if not keep_going:
+                break
+            result = ''
+        append(result)
+        if len(batch) >= _WRITE_BATCH_SIZE:
+            output.write(delimiter.join(batch) + delimiter)
+            batch.clear()
+    if batch:
+        output.write(delimiter.join(batch) + delimiter)
+    return errors
+
+
+def main(args=None) -> int:
+    """Run the command-line interface and return the exit status."""
+    if args is None:
+        args = sys.argv[1:]
+    if args[:1] == ['column']:
+        return _column_main(args[1:])
+    simple_args = _simple_args(args)
+    if simple_args is not None:
+        number, ordinal = simple_args
+        formatter = Formatter()
+        print((formatter.ordinal_words if ordinal else formatter.words)(
+            number))
+        return 0
+    parser = _parser()
+    args = parser.parse_args(args)
+    formatter = _formatter(args)
+    method = 'ordinal_words' if args.ordinal else 'words'
+    convert = getattr(formatter, method)
+    if args.stdin or args.number == '-':
+        delimiter = '\0' if args.null else '\n'
+        records = _read_records(sys.stdin, delimiter)
+        if args.workers == 1:
+            converted = _converted(convert, records)
+        else:
+            converted = _parallel_converted(
+                formatter, method, records, args.workers or cpu_count() or 1,
+            )
+        errors = _write_stream(
+            converted, sys.stdout, delimiter, args.keep_going,
+        )
+        sys.stdout.flush()
+        return 1 if errors else 0
+    if args.number is None:
+        parser.error('a number, -, or --stdin is required')
+    print(convert(args.number))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,468 @@
+/* Optional C implementation of num2fawords._PyEngineBase.
+ *
+ * EngineBase converts ints and digit strings to three-digit groups and
+ * joins their words using the group_words and classes tables of the
+ * engine. Anything it does not handle, e.g. int subclasses, non-ASCII
+ * digits, invalid input, or numbers with more groups than classes, is
+ * passed to the pure Python methods of the engine (_py_int_words,
+ * _py_signed_int_words, _py_natural_words, and _py_ordinal_int_words) so
+ * that both paths return the same results and raise the same errors.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <structmember.h>
+
+/* Numbers with more groups than this are handled in Python. */
+#define MAX_GROUPS 64
+
+typedef struct {
+    PyObject_HEAD
+    PyObject *group_words;  /* tuple of the words of 0..999 */
+    PyObject *classes;      /* tuple of the names of 1000 ** i */
+} EngineBase;
+
+static PyObject *separator;         /* ' و ' */
+static PyObject *zero_words;        /* 'صفر' */
+static PyObject *empty;             /* '' */
+static PyObject *ten_to_18;         /* 10 ** 18 */
+static PyObject *py_int_words;      /* '_py_int_words' */
+static PyObject *py_signed_int_words;
+static PyObject *py_natural_words;
+static PyObject *py_ordinal_int_words;
+static PyObject *three_words;       /* 'سه' */
+static PyObject *third_words;       /* 'سوم' */
+static PyObject *ordinal_suffix;    /* 'م' */
+
+static int
+tables_ok(EngineBase *self)
+{
+    return (
+        self->group_words != NULL && PyTuple_CheckExact(self->group_words)
+        && PyTuple_GET_SIZE(self->group_words) == 1000
+        && self->classes != NULL && PyTuple_CheckExact(self->classes)
+    );
+}
+
+/* Return the words of groups, least significant first. n >= 1 and the
+   most significant group is not zero. Return NULL with no exception set if
+   there are more groups than classes. */
+static PyObject *
+join_groups(EngineBase *self, const int *groups, Py_ssize_t n)
+{
+    PyObject *group_words = self->group_words;
+    PyObject *classes = self->classes;
+    PyObject *parts, *result;
+    Py_ssize_t i;
+
+    if (n > PyTuple_GET_SIZE(classes)) {
+        return NULL;
+    }
+    if (n == 1) {
+        result = PyTuple_GET_ITEM(group_words, groups[0]);
+        Py_INCREF(result);
+        return result;
+    }
+    /* [group, class, separator, group, class, ..., group] joined by '' */
+    parts = PyList_New(0);
+    if (parts == NULL) {
+        return NULL;
+    }
+    for (i = n - 1; i > 0; i--) {
+        if (!groups[i]) {
+            continue;
+        }
+        if (PyList_GET_SIZE(parts)
+            && PyList_Append(parts, separator) < 0) {
+            goto error;
+        }
+        if (PyList_Append(
+                parts, PyTuple_GET_ITEM(group_words, groups[i])) < 0
+            || PyList_Append(parts, PyTuple_GET_ITEM(classes, i)) < 0) {
+            goto error;
+        }
+    }
+    if (groups[0]) {
+        if (PyList_Append(parts, separator) < 0
+            || PyList_Append(
+                parts, PyTuple_GET_ITEM(group_words, groups[0])) < 0) {
+            goto error;
+        }
+    }
+    result = PyUnicode_Join(empty, parts);
+    Py_DECREF(parts);
+    return result;
+error:
+    Py_DECREF(parts);
+    return NULL;
+}
+
+/* Append the groups of 0 <= value < 10 ** 18, padded to width groups. */
+static Py_ssize_t
+split_groups(unsigned long long value, int *groups, Py_ssize_t n, int width)
+{
+    int i;
+    for (i = 0; i < width || value; i++) {
+        groups[n++] = (int)(value % 1000);
+        value /= 1000;
+    }
+    return n;
+}
+
+/* Return the words of an exact int >= 0, or NULL with no exception set if
+   it should be handled in Python. */
+static PyObject *
+long_words(EngineBase *self, PyObject *number)
+{
+    int groups[MAX_GROUPS + 7];
+    Py_ssize_t n = 0;
+    int overflow;
+    long long value = PyLong_AsLongLongAndOverflow(number, &overflow);
+    PyObject *quotient, *result;
+
+    if (value == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    if (!overflow) {
+        if (value < 0) {
+            return NULL;
+        }
+        if (value < 1000) {
+            result = value ? PyTuple_GET_ITEM(self->group_words, value)
+                           : zero_words;
+            Py_INCREF(result);
+            return result;
+        }
+        n = split_groups((unsigned long long)value, groups, 0, 0);
+        result = join_groups(self, groups, n);
+        return result;
+    }
+    if (overflow < 0) {
+        return NULL;
+    }
+    /* Peel off 18 digits at a time using Python ints. */
+    Py_INCREF(number);
+    quotient = number;
+    for (;;) {
+        PyObject *pair;
+        unsigned long long low;
+
+        if (n + 6 > MAX_GROUPS) {
+            Py_DECREF(quotient);
+            return NULL;
+        }
+        pair = PyNumber_Divmod(quotient, ten_to_18);
+        Py_DECREF(quotient);
+        if (pair == NULL) {
+            return NULL;
+        }
+        quotient = PyTuple_GET_ITEM(pair, 0);
+        Py_INCREF(quotient);
+        low = PyLong_AsUnsignedLongLong(PyTuple_GET_ITEM(pair, 1));
+        Py_DECREF(pair);
+        if (low == (unsigned long long)-1 && PyErr_Occurred()) {
+            Py_DECREF(quotient);
+            return NULL;
+        }
+        n = split_groups(low, groups, n, 6);
+        value = PyLong_AsLongLongAndOverflow(quotient, &overflow);
+        if (value == -1 && PyErr_Occurred()) {
+            Py_DECREF(quotient);
+            return NULL;
+        }
+        if (!overflow) {
+            Py_DECREF(quotient);
+            n = split_groups((unsigned long long)value, groups, n, 0);
+            break;
+        }
+    }
+    while (n && !groups[n - 1]) {
+        n--;
+    }
+    return join_groups(self, groups, n);
+}
+
+static PyObject *
+EngineBase_int_words(EngineBase *self, PyObject *number)
+{
+    PyObject *result;
+
+    if (PyLong_CheckExact(number) && tables_ok(self)) {
+        result = long_words(self, number);
+        if (result != NULL || PyErr_Occurred()) {
+            return result;
+        }
+    }
+    return PyObject_CallMethodOneArg((PyObject *)self, py_int_words, number);
+}
+
+/* Return the ordinal form of the cardinal words, see _ordinal_form. */
+static PyObject *
+ordinal_form(PyObject *words)
+{
+    Py_ssize_t length = PyUnicode_GET_LENGTH(words);
+    Py_ssize_t match = PyUnicode_Tailmatch(words, three_words, 0, length, 1);
+    PyObject *stem, *result;
+
+    if (match < 0) {
+        return NULL;
+    }
+    if (!match) {
+        return PyUnicode_Concat(words, ordinal_suffix);
+    }
+    stem = PyUnicode_Substring(words, 0, length - 2);
+    if (stem == NULL) {
+        return NULL;
+    }
+    result = PyUnicode_Concat(stem, third_words);
+    Py_DECREF(stem);
+    return result;
+}
+
+static PyObject *
+EngineBase_ordinal_int_words(EngineBase *self, PyObject *number)
+{
+    PyObject *words, *result;
+
+    if (PyLong_CheckExact(number) && tables_ok(self)) {
+        words = long_words(self, number);
+        if (words != NULL) {
+            result = ordinal_form(words);
+            Py_DECREF(words);
+            return result;
+        }
+        if (PyErr_Occurred()) {
+            return NULL;
+        }
+    }
+    return PyObject_CallMethodOneArg(
+        (PyObject *)self, py_ordinal_int_words, number);
+}
+
+static PyObject *
+EngineBase_signed_int_words(
+    EngineBase *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *number, *sign, *magnitude, *words, *result;
+    long long value;
+    int overflow;
+
+    if (nargs != 3) {
+        PyErr_Format(
+            PyExc_TypeError,
+            "signed_int_words() takes 3 arguments (%zd given)", nargs);
+        return NULL;
+    }
+    number = args[0];
+    if (!PyLong_CheckExact(number) || !tables_ok(self)) {
+        goto fallback;
+    }
+    value = PyLong_AsLongLongAndOverflow(number, &overflow);
+    if (value == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    if (value == 0 && !overflow) {
+        Py_INCREF(zero_words);
+        return zero_words;
+    }
+    if (overflow < 0 || value < 0) {
+        sign = args[2];
+        magnitude = PyNumber_Negative(number);
+        if (magnitude == NULL) {
+            return NULL;
+        }
+    }
+    else {
+        sign = args[1];
+        magnitude = number;
+        Py_INCREF(magnitude);
+    }
+    words = long_words(self, magnitude);
+    Py_DECREF(magnitude);
+    if (words == NULL) {
+        if (PyErr_Occurred()) {
+            return NULL;
+        }
+        goto fallback;
+    }
+    if (!PyUnicode_Check(sign)) {
+        Py_DECREF(words);
+        goto fallback;
+    }
+    result = PyUnicode_Concat(sign, words);
+    Py_DECREF(words);
+    return result;
+fallback:
+    return PyObject_VectorcallMethod(
+        py_signed_int_words,
+        (PyObject *[]){(PyObject *)self, args[0], args[1], args[2]},
+        4, NULL);
+}
+
+static PyObject *
+EngineBase_natural_words(EngineBase *self, PyObject *digits)
+{
+    int groups[MAX_GROUPS];
+    Py_ssize_t length, n = 0, i, end;
+    const Py_UCS1 *data;
+    PyObject *result;
+
+    if (!PyUnicode_CheckExact(digits) || !PyUnicode_IS_ASCII(digits)
+        || !tables_ok(self)) {
+        goto fallback;
+    }
+    length = PyUnicode_GET_LENGTH(digits);
+    if (length == 0 || length > 3 * MAX_GROUPS
+        || length > 3 * PyTuple_GET_SIZE(self->classes)) {
+        goto fallback;
+    }
+    data = PyUnicode_1BYTE_DATA(digits);
+    for (i = 0; i < length; i++) {
+        if (data[i] < '0' || data[i] > '9') {
+            goto fallback;
+        }
+    }
+    if (length == 1 && data[0] == '0') {
+        Py_INCREF(zero_words);
+        return zero_words;
+    }
+    for (end = length; end > 0; end -= 3) {
+        int group = 0;
+        for (i = end > 3 ? end - 3 : 0; i < end; i++) {
+            group = group * 10 + (data[i] - '0');
+        }
+        groups[n++] = group;
+    }
+    while (n && !groups[n - 1]) {
+        n--;
+    }
+    if (n == 0) {  /* e.g. the '00' of '1.00' */
+        Py_INCREF(empty);
+        return empty;
+    }
+    result = join_groups(self, groups, n);
+    if (result != NULL || PyErr_Occurred()) {
+        return result;
+    }
+fallback:
+    return PyObject_CallMethodOneArg(
+        (PyObject *)self, py_natural_words, digits);
+}
+
+static int
+EngineBase_traverse(EngineBase *self, visitproc visit, void *arg)
+{
+    Py_VISIT(self->group_words);
+    Py_VISIT(self->classes);
+    return 0;
+}
+
+static int
+EngineBase_clear(EngineBase *self)
+{
+    Py_CLEAR(self->group_words);
+    Py_CLEAR(self->classes);
+    return 0;
+}
+
+static void
+EngineBase_dealloc(EngineBase *self)
+{
+    PyTypeObject *type = Py_TYPE(self);
+
+    PyObject_GC_UnTrack(self);
+    EngineBase_clear(self);
+    type->tp_free((PyObject *)self);
+}
+
+static PyMethodDef EngineBase_methods[] = {
+    {"int_words", (PyCFunction)EngineBase_int_words, METH_O,
+     "Return the words of number >= 0."},
+    {"signed_int_words", (PyCFunction)(void (*)(void))
+     EngineBase_signed_int_words, METH_FASTCALL,
+     "Return the words of number with positive or negative before it."},
+    {"natural_words", (PyCFunction)EngineBase_natural_words, METH_O,
+     "Return the words of a string of digits."},
+    {"ordinal_int_words", (PyCFunction)EngineBase_ordinal_int_words, METH_O,
+     "Return the ordinal words of number >= 0."},
+    {NULL, NULL, 0, NULL}
+};
+
+static PyMemberDef EngineBase_members[] = {
+    {"group_words", T_OBJECT_EX, offsetof(EngineBase, group_words), 0,
+     "The words of all three-digit groups, indexed by their value."},
+    {"classes", T_OBJECT_EX, offsetof(EngineBase, classes), 0,
+     "The names of the powers of 1000."},
+    {NULL, 0, 0, 0, NULL}
+};
+
+static PyTypeObject EngineBaseType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "num2fawords._speedups.EngineBase",
+    .tp_doc = "The C implementation of num2fawords._PyEngineBase.",
+    .tp_basicsize = sizeof(EngineBase),
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC,
+    .tp_new = PyType_GenericNew,
+    .tp_dealloc = (destructor)EngineBase_dealloc,
+    .tp_traverse = (traverseproc)EngineBase_traverse,
+    .tp_clear = (inquiry)EngineBase_clear,
+    .tp_methods = EngineBase_methods,
+    .tp_members = EngineBase_members,
+};
+
+static struct PyModuleDef speedups_module = {
+    PyModuleDef_HEAD_INIT,
+    .m_name = "num2fawords._speedups",
+    .m_doc = "Optional C implementation of the grouping engine.",
+    .m_size = -1,
+};
+
+PyMODINIT_FUNC
+PyInit__speedups(void)
+{
+    PyObject *module;
+
+    separator = PyUnicode_FromString(" \xd9\x88 ");
+    zero_words = PyUnicode_FromString("\xd8\xb5\xd9\x81\xd8\xb1");
+    empty = PyUnicode_FromString("");
+    ten_to_18 = PyLong_FromUnsignedLongLong(1000000000000000000ULL);
+    py_int_words = PyUnicode_InternFromString("_py_int_words");
+    py_signed_int_words = PyUnicode_InternFromString("_py_signed_int_words");
+    py_natural_words = PyUnicode_InternFromString("_py_natural_words");
+    py_ordinal_int_words = PyUnicode_InternFromString(
+        "_py_ordinal_int_words");
+    three_words = PyUnicode_FromString("\xd8\xb3\xd9\x87");
+    third_words = PyUnicode_FromString("\xd8\xb3\xd9\x88\xd9\x85");
+    ordinal_suffix = PyUnicode_FromString("\xd9\x85");
+    if (separator == NULL || zero_words == NULL || empty == NULL
+        || ten_to_18 == NULL || py_int_words == NULL
+        || py_signed_int_words == NULL || py_natural_words == NULL
+        || py_ordinal_int_words == NULL || three_words == NULL
+        || third_words == NULL || ordinal_suffix == NULL) {
+        return NULL;
+    }
+    if (PyType_Ready(&EngineBaseType) < 0) {
+        return NULL;
+    }
+    module = PyModule_Create(&speedups_module);
+    if (module == NULL) {
+        return NULL;
+    }
+#ifdef Py_GIL_DISABLED
+    /* The methods only read the tables of the engine, which are set once by
+       _Engine.__init__ before the engine is published, and the constants
+       above. */
+    if (PyUnstable_Module_SetGIL(module, Py_MOD_GIL_NOT_USED) < 0) {
+        Py_DECREF(module);
+        return NULL;
+    }
+#endif
+    Py_INCREF(&EngineBaseType);
+    if (PyModule_AddObject(
+            module, "EngineBase", (PyObject *)&EngineBaseType) < 0) {
+        Py_DECREF(&EngineBaseType);
+        Py_DECREF(module);
+        return NULL;
+    }
+    return module;
+}
@@ -0,0 +1,100 @@
+"""Convert numbers to words inside asyncio event loops without blocking them.
+
+awords and awords_many take a Formatter instead of the options of words, so
+concurrent tasks with different options do not affect each other the way
+change_defaults does, e.g.
+
+    >>> from num2fawords import Formatter
+    >>> from num2fawords.aio import awords_many
+    >>> async def handle(request):
+    ...     formatter = Formatter(decimal_separator=request['separator'])
+    ...     return await awords_many(request['amounts'], formatter)
+"""
+
+from asyncio import get_running_loop as _get_running_loop, sleep as _sleep
+
+from num2fawords import Formatter
+
+# Numbers with more digits than this take more than about half a millisecond
+# to convert and are converted in an executor, see awords.
+OFFLOAD_DIGITS = 1000
+
+# The number of items that awords_many converts between yielding to the
+# event loop.
+CHUNK_SIZE = 256
+
+# The default formatter, created on first use.
+_FORMATTER = None
+
+
+def _default_formatter() -> Formatter:
+    global _FORMATTER
+    if _FORMATTER is None:
+        _FORMATTER = Formatter()
+    return _FORMATTER
+
+
+def _is_large(number, digits: int) -> bool:
+    """Return True if number has more than about digits digits."""
+    if number.__class__ is int:
+        # 3.3219 bits per decimal digit
+        return number.bit_length() > digits * 33219 // 10000
+    if number.__class__ is float:
+        return False
+    return len(str(number)) > digits
+
+
+async def awords(
+    number, formatter: Formatter = None, *, executor=None,
+    offload_digits: int = OFFLOAD_DIGITS,
+) -> str:
+    """Return the word form of number, see Formatter.words.
+
+    If formatter is None a Formatter with the default options and the
+    module tables at the time of the first call is used. Numbers with more
+    than offload_digits digits are converted using run_in_executor with
+    executor, the default executor of the loop if it is None.
+    """
+    if formatter is None:
+        formatter = _default_formatter()
+    if _is_large(number, offload_digits):
+        return await _get_running_loop().run_in_executor(
+            executor, formatter.words, number)
+    return formatter.words(number)
+
+
+async def awords_many(
+    numbers, formatter: Formatter = None, *, executor=None,
+    offload_digits: int = OFFLOAD_DIGITS, offload_size: int = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> list:
+    """Return the word form of each number, see Formatter.words_many.
+
+    The numbers are converted in chunks of chunk_size items and control is
+    given back to the event loop after each chunk. Numbers with more than
+    offload_digits digits are converted in executor, see awords.
+
+    If offload_size is not None and there are at least that many numbers,
+    they are all converted by a single call to formatter.words_many in
+    executor instead, which is cheaper than yielding after each chunk but
+    only keeps the loop responsive if executor runs in other processes or
+    releases the GIL often enough.
+    """
+    if formatter is None:
+        formatter = _default_formatter()
+    numbers = list(numbers)
+    if offload_size is not None and len(numbers) >= offload_size:
+        return await _get_running_loop().run_in_executor(
+            executor, formatter.words_many, numbers)
+    convert = formatter.words
+    results = []
+    append = results.append
+    for start in range(0, len(numbers), chunk_size):
+        for number in numbers[start:start + chunk_size]:
+            if _is_large(number, offload_digits):
+                append(await _get_running_loop().run_in_executor(
+                    executor, convert, number))
+            else:
+                append(convert(number))
+        await _sleep(0)
+    return results
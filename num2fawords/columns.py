@@ -0,0 +1,225 @@
+"""Convert a column of a CSV or Parquet file to words.
+
+The file is read and written in batches of rows, so memory use does not
+depend on the size of the file, e.g.
+
+    >>> from num2fawords.columns import convert_column
+    >>> convert_column('payments.csv', 'out.csv', 'amount')
+    0
+
+adds an amount_words column with the word form of each amount. Parquet
+files require pyarrow (``pip install num2fawords[parquet]``).
+"""
+
+import csv
+import sys
+
+from num2fawords import Formatter
+
+# The number of rows that are read, converted, and written at once.
+BATCH_SIZE = 1 << 13
+
+_PARQUET_SUFFIXES = ('.parquet', '.pq')
+
+
+class _Converter:
+
+    """Convert batches of cells using a formatter.
+
+    Empty cells become empty (or null) cells. Invalid numbers raise a
+    ValueError with their row number, or with keep_going become empty cells
+    and are reported on stderr and counted in errors.
+    """
+
+    __slots__ = (
+        'convert', 'convert_many', 'takes_arrays', 'keep_going', 'errors',
+        'rows',
+    )
+
+    def __init__(self, formatter: Formatter, ordinal: bool, keep_going: bool):
+        if ordinal:
+            convert = self.convert = formatter.ordinal_words
+            self.convert_many = lambda values: [convert(v) for v in values]
+            self.takes_arrays = False
+        else:
+            self.convert = formatter.words
+            self.convert_many = formatter.words_many
+            # Integer NumPy arrays need no checks for empty cells, and
+            # words_many converts them without dispatching on each item.
+            self.takes_arrays = True
+        self.keep_going = keep_going
+        self.errors = 0
+        self.rows = 0
+
+    def __call__(self, values) -> list:
+        """Return the words of values, the cells of a batch.
+
+        values is a list, or an integer NumPy array if takes_arrays is True.
+        """
+        if values.__class__ is not list:
+            # Integers are always valid.
+            self.rows += len(values)
+            return self.convert_many(values)
+        indices = [
+            i for i, value in enumerate(values)
+            if value is not None and value != ''
+        ]
+        if len(indices) == len(values):
+            result = self._convert(values, range(len(values)))
+        else:
+            result = [None] * len(values)
+            for i, words in zip(indices, self._convert(
+                [values[i] for i in indices], indices,
+            )):
+                result[i] = words
+        self.rows += len(values)
+        return result
+
+    def _convert(self, values, indices) -> list:
+        try:
+            return self.convert_many(values)
+        except (ValueError, IndexError, TypeError):
+            # Find the invalid numbers.
+            pass
+        result = []
+        append = result.append
+        convert = self.convert
+        for i, value in zip(indices, values):
+            try:
+                append(convert(value))
+            except (ValueError, IndexError, TypeError) as e:
+                message = 'invalid number in row {}: {!r} ({})'.format(
+                    self.rows + i + 1, value, e)
+                if not self.keep_going:
+                    raise ValueError(message) from e
+                print(message, file=sys.stderr)
+                self.errors += 1
+                append(None)
+        return result
+
+
+def _is_parquet(path) -> bool:
+    return isinstance(path, str) and path.lower().endswith(_PARQUET_SUFFIXES)
+
+
+def convert_column(
+    source, destination, column: str, formatter: Formatter = None, *,
+    output_column: str = None, ordinal: bool = False,
+    batch_size: int = BATCH_SIZE, file_format: str = None,
+    keep_going: bool = False, delimiter: str = ',',
+) -> int:
+    """Copy source to destination adding the word form of column.
+
+    The words are written to output_column, column + '_words' by default.
+    If ordinal is True the ordinal word forms are used. If formatter is None
+    a Formatter with the default options is used.
+
+    file_format is 'csv' or 'parquet', by default it is 'parquet' if
+    source ends with .parquet or .pq and 'csv' otherwise. CSV source and
+    destination may also be text files opened with newline=''; the first
+    row is the header and delimiter separates the fields. Parquet files are
+    read batch_size rows at a time and each batch becomes a row group.
+
+    Return the number of invalid numbers, which is always 0 unless
+    keep_going is True, see _Converter.
+    """
+    if formatter is None:
+        formatter = Formatter()
+    if output_column is None:
+        output_column = column + '_words'
+    if file_format is None:
+        file_format = 'parquet' if _is_parquet(source) else 'csv'
+    converter = _Converter(formatter, ordinal, keep_going)
+    if file_format == 'csv':
+        _convert_csv(
+            source, destination, column, output_column, converter,
+            batch_size, delimiter,
+        )
+    elif file_format == 'parquet':
+        _convert_parquet(
+            source, destination, column, output_column, converter, batch_size,
+        )
+    else:
+        raise ValueError('unknown file format: {!r}'.format(file_format))
+    return converter.errors
+
+
+def _convert_csv(
+    source, destination, column: str, output_column: str, converter,
+    batch_size: int, delimiter: str,
+):
+    if isinstance(source, str):
+        with open(source, newline='', encoding='utf8') as f:
+            return _convert_csv(
+                f, destination, column, output_column, converter,
+                batch_size, delimiter,
+            )
+    if isinstance(destination, str):
+        with open(destination, 'w', newline='', encoding='utf8') as f:
+            return _convert_csv(
+                source, f, column, output_column, converter, batch_size,
+                delimiter,
+            )
+    reader = csv.reader(source, delimiter=delimiter)
+    writer = csv.writer(destination, delimiter=delimiter)
+    header = next(reader, None)
+    if header is None:
+        raise ValueError('the CSV file is empty')
+    try:
+        index = header.index(column)
+    except ValueError:
+        raise ValueError('no column named {!r}'.format(column)) from None
+    width = len(header)
+    writer.writerow(header + [output_column])
+    writerows = writer.writerows
+    while True:
+        rows = []
+        append = rows.append
+        for row in reader:
+            append(row)
+            if len(rows) == batch_size:
+                break
+        if not rows:
+            return
+        for row in rows:
+            if len(row) < width:
+                # Keep the words in the last column.
+                row += [''] * (width - len(row))
+        for row, words in zip(rows, converter([row[index] for row in rows])):
+            row.append(words)
+        writerows(rows)
+
+
+def _convert_parquet(
+    source, destination, column: str, output_column: str, converter,
+    batch_size: int,
+):
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            'converting Parquet files requires pyarrow,'
+            ' pip install num2fawords[parquet]'
+        ) from e
+    parquet_file = pyarrow.parquet.ParquetFile(source)
+    schema = parquet_file.schema_arrow
+    index = schema.get_field_index(column)
+    if index == -1:
+        raise ValueError('no column named {!r}'.format(column))
+    string = pyarrow.string()
+    output_schema = schema.append(pyarrow.field(output_column, string))
+    takes_arrays = converter.takes_arrays and pyarrow.types.is_integer(
+        schema.field(index).type)
+    with pyarrow.parquet.ParquetWriter(destination, output_schema) as writer:
+        for batch in parquet_file.iter_batches(batch_size=batch_size):
+            cells = batch.column(index)
+            if takes_arrays and not cells.null_count:
+                values = cells.to_numpy()
+            else:
+                values = cells.to_pylist()
+            words = pyarrow.array(converter(values), type=string)
+            writer.write_table(pyarrow.Table.from_batches([
+                pyarrow.RecordBatch.from_arrays(
+                    batch.columns + [words], schema=output_schema),
+            ]))
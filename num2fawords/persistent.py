@@ -0,0 +1,215 @@
+"""A persistent cache of the words of a Formatter, stored in SQLite.
+
+Use it when the same numbers are converted again and again across process
+restarts, e.g.
+
+    >>> from num2fawords.persistent import PersistentCache
+    >>> with PersistentCache('words.sqlite') as cache:
+    ...     cache.words_many([1403, 2.5, '۱۲'])
+    ['یک هزار و چهارصد و سه', 'دو و پنج دهم', 'دوازده']
+
+Opening the cache only reads the SQLite header, the database pages are
+memory-mapped (see PersistentCache) and read on demand.
+"""
+
+import sqlite3
+from functools import partial as _partial
+from hashlib import sha256 as _sha256
+
+from num2fawords import Formatter
+
+# Bump when the words of a number, or the key of a value, change for the
+# same formatter options so that older entries are not used anymore.
+_FORMAT_VERSION = 2
+
+# The tag of each cached type, so that e.g. 1, 1.0, and '1' have different
+# keys. Decimal and Fraction are added by _key on first use.
+_TAGS = {int: 'i', float: 'f', str: 's'}
+
+
+def fingerprint(formatter: Formatter) -> str:
+    """Return a hash of the options and word tables of formatter."""
+    return _sha256(repr(
+        (_FORMAT_VERSION,) + formatter.__reduce__()[1]
+    ).encode()).hexdigest()
+
+
+def _key(number):
+    """Return the cache key of number or None if it should not be cached."""
+    tag = _TAGS.get(number.__class__)
+    if tag is None:
+        if 'd' in _TAGS.values():
+            return None
+        from decimal import Decimal
+        from fractions import Fraction
+        _TAGS[Decimal] = 'd'
+        _TAGS[Fraction] = 'q'
+        return _key(number)
+    if tag == 'i':
+        # str fails for ints with more digits than sys.int_info allows.
+        return 'i{:x}'.format(number)
+    if tag == 'q':
+        return 'q{:x}/{:x}'.format(number.numerator, number.denominator)
+    if tag == 'f':
+        return 'f' + repr(number)
+    return tag + str(number)
+
+
+class PersistentCache:
+
+    """Memoize the results of a Formatter in an SQLite database at path.
+
+    If formatter is None a Formatter with the default options is used. The
+    entries of each formatter are keyed by a fingerprint of its options and
+    word tables, so different formatters can share the same file.
+
+    Up to mmap_size bytes of the database are memory-mapped instead of read
+    into the page cache of SQLite. New entries are written in a single
+    transaction that is committed by commit, close, or on leaving a with
+    block, and by words_many after each call.
+
+    A lookup costs a few microseconds, about as much as converting a small
+    int, so the cache pays off for long decimals, fractions, and large
+    numbers rather than for small ints.
+
+    Like sqlite3 connections, a PersistentCache may only be used in the
+    thread that created it.
+    """
+
+    __slots__ = ('path', 'formatter', '_connection', '_id')
+
+    def __init__(
+        self, path: str, formatter: Formatter = None,
+        mmap_size: int = 1 << 30,
+    ):
+        if formatter is None:
+            formatter = Formatter()
+        self.path = path
+        self.formatter = formatter
+        connection = self._connection = sqlite3.connect(path)
+        connection.execute('PRAGMA mmap_size = {:d}'.format(mmap_size))
+        connection.execute('PRAGMA journal_mode = WAL')
+        connection.execute('PRAGMA synchronous = NORMAL')
+        with connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS formatters'
+                ' (id INTEGER PRIMARY KEY, fingerprint TEXT UNIQUE NOT NULL)'
+            )
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS words (formatter INTEGER,'
+                ' key TEXT, words TEXT NOT NULL, PRIMARY KEY (formatter, key))'
+                ' WITHOUT ROWID'
+            )
+            hash_ = fingerprint(formatter)
+            connection.execute(
+                'INSERT OR IGNORE INTO formatters (fingerprint) VALUES (?)',
+                (hash_,),
+            )
+            self._id, = connection.execute(
+                'SELECT id FROM formatters WHERE fingerprint = ?', (hash_,),
+            ).fetchone()
+
+    def words(self, number) -> str:
+        """Return the word form of number, see Formatter.words."""
+        key = _key(number)
+        if key is None:
+            return self.formatter.words(number)
+        return self._get(key, self.formatter.words, number)
+
+    def ordinal_words(self, number, *, suffix: str = '') -> str:
+        """Return the ordinal word form of number, see ordinal_words."""
+        key = _key(number)
+        convert = self.formatter.ordinal_words
+        if suffix:
+            convert = _partial(convert, suffix=suffix)
+        if key is None:
+            return convert(number)
+        return self._get('o' + suffix + key, convert, number)
+
+    def _get(self, key: str, convert, number) -> str:
+        row = self._connection.execute(
+            'SELECT words FROM words WHERE formatter = ? AND key = ?',
+            (self._id, key),
+        ).fetchone()
+        if row is not None:
+            return row[0]
+        result = convert(number)
+        self._connection.execute(
+            'INSERT OR REPLACE INTO words VALUES (?, ?, ?)',
+            (self._id, key, result),
+        )
+        return result
+
+    def words_many(self, numbers) -> list:
+        """Return the word form of each number, see Formatter.words_many.
+
+        The cached entries are looked up in a single query and the missing
+        ones are converted and stored in a single transaction.
+        """
+        numbers = list(numbers)
+        keys = [_key(n) for n in numbers]
+        execute = self._connection.execute
+        # Joining a temporary table of the keys is several times faster than
+        # a query per key, or per batch of keys, once there are many keys.
+        execute(
+            'CREATE TEMP TABLE IF NOT EXISTS wanted (key TEXT PRIMARY KEY)'
+            ' WITHOUT ROWID'
+        )
+        self._connection.executemany(
+            'INSERT OR IGNORE INTO wanted VALUES (?)',
+            [(k,) for k in keys if k is not None],
+        )
+        found = dict(execute(
+            'SELECT key, words FROM words JOIN wanted USING (key)'
+            ' WHERE formatter = ?', (self._id,),
+        ))
+        execute('DELETE FROM wanted')
+        convert = self.formatter.words
+        results = []
+        append = results.append
+        new = {}
+        for number, key in zip(numbers, keys):
+            result = found.get(key)
+            if result is None:
+                result = convert(number)
+                if key is not None:
+                    found[key] = new[key] = result
+            append(result)
+        if new:
+            formatter = self._id
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO words VALUES (?, ?, ?)',
+                [(formatter, k, w) for k, w in new.items()],
+            )
+        self.commit()
+        return results
+
+    def __len__(self) -> int:
+        """Return the number of entries of this formatter."""
+        return self._connection.execute(
+            'SELECT count(*) FROM words WHERE formatter = ?', (self._id,),
+        ).fetchone()[0]
+
+    def commit(self):
+        """Write the new entries to the database."""
+        self._connection.commit()
+
+    def clear(self):
+        """Remove all the entries of this formatter."""
+        with self._connection:
+            self._connection.execute(
+                'DELETE FROM words WHERE formatter = ?', (self._id,))
+
+    def close(self):
+        """Commit the new entries and close the database."""
+        self._connection.commit()
+        self._connection.close()
+
+    def __enter__(self) -> 'PersistentCache':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __repr__(self):
+        return 'PersistentCache({!r}, {!r})'.format(self.path, self.formatter)
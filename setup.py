@@ -1,7 +1,7 @@
 """A setuptools based setup module."""
 
 from os.path import dirname, abspath, join
-from setuptools import setup, find_packages
+from setuptools import Extension, setup, find_packages
 
 here = abspath(dirname(__file__))
 with open(join(here, 'README.rst'), encoding='utf-8') as f:
@@ -25,16 +25,29 @@ setup(
         'GNU General Public License v3 or later (GPLv3+)',
         'Natural Language :: English',
         'Natural Language :: Persian',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
         'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12',
+        'Programming Language :: Python :: 3.13',
         'Topic :: Text Processing :: General',
     ],
     keywords='convert number words farsi persian',
     packages=find_packages(),
-    install_requires=[
-        'typing;python_version<"3.5"',
-    ],
-    zip_safe=True,
+    # The C implementation of the grouping engine is optional, the pure
+    # Python one is used if it cannot be built.
+    ext_modules=[Extension(
+        'num2fawords._speedups', ['num2fawords/_speedups.c'], optional=True,
+    )],
+    # aio uses asyncio.get_running_loop and the module __getattr__ is PEP
+    # 562, both are new in Python 3.7.
+    python_requires='>=3.7',
+    extras_require={
+        'parquet': ['pyarrow>=3'],
+    },
+    zip_safe=False,
 )
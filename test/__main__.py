@@ -1,9 +1,46 @@
+from asyncio import run
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from os.path import dirname
 from fractions import Fraction
 from decimal import Decimal
+from io import StringIO
 from math import pi
-from unittest import TestCase, main
+from random import Random
+from pickle import dumps, loads
+from os import environ
+from subprocess import STDOUT, check_output
+from tempfile import TemporaryDirectory
+from sys import executable, getswitchinterval, setswitchinterval
+from threading import Event, Thread
+from unittest import TestCase, main, skipUnless
+from unittest.mock import patch
 
-from num2fawords import words, ordinal_words, change_defaults
+import num2fawords
+from num2fawords import (
+    words, ordinal_words, change_defaults, words_many, Formatter, HUNDREDS,
+    enable_cache, disable_cache, cache_info, cache_clear, parse_words,
+    transliterate_text, enable_stats, disable_stats, stats_info, stats_clear,
+    lazy_words, NumberWords,
+)
+from num2fawords.__main__ import main as cli_main
+from num2fawords.aio import awords, awords_many
+from num2fawords.columns import convert_column
+from num2fawords.persistent import PersistentCache
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+
+def reset_defaults():
+    change_defaults('', 'منفی ', ' و ', ' ', True, ' در ده به توان ')
 
 
 class Number2FarsiWord(TestCase):
@@ -108,6 +145,31 @@ class Number2FarsiWord(TestCase):
             'نهصد و نود و نه هزار و پانصد و پنجاه و پنجم',
         )
         assert_equal(ordinal_words(1000000), 'یک میلیونم')
+        assert_equal(ordinal_words(2001000), 'دو میلیون و یک هزارم')
+        assert_equal(ordinal_words(10 ** 40), 'ده میلیون کوانتینیاردم')
+
+    def test_ordinal_words_suffix(self):
+        assert_equal = self.assertEqual
+        assert_equal(ordinal_words(3, suffix='ین'), 'سومین')
+        assert_equal(ordinal_words(-23, suffix='ین'), 'منفی بیست و سومین')
+        assert_equal(ordinal_words(1000, suffix='ین'), 'یک هزارمین')
+        assert_equal(ordinal_words(0, suffix='ین'), 'صفرمین')
+        assert_equal(ordinal_words(0, positive='مثبت '), 'صفرم')
+        assert_equal(ordinal_words(0, 'مثبت ', suffix='ین'), 'صفرمین')
+        assert_equal(Formatter(positive='مثبت ').ordinal_words(0), 'صفرم')
+        assert_equal(Formatter(positive='مثبت ').ordinal_words(1), 'مثبت یکم')
+        assert_equal(ordinal_words('12', suffix=' ام'), 'دوازدهم ام')
+        assert_equal(
+            Formatter().ordinal_words(1403, suffix='ین'),
+            'یک هزار و چهارصد و سومین',
+        )
+        assert_equal(parse_words('بیست و سومین', ordinal=True), 23)
+        random = Random(0)
+        for _ in range(200):
+            n = random.randrange(-10 ** 40, 10 ** 40)
+            w = ordinal_words(n)
+            assert_equal(w, num2fawords._ordinal_form(words(n)))
+            assert_equal(ordinal_words(n, suffix='ین'), w + 'ین')
 
     def test_float(self):
         assert_equal = self.assertEqual
@@ -148,13 +210,172 @@ class Number2FarsiWord(TestCase):
         assert_equal(
             words('0.000001111'), 'یک هزار و یکصد و یازده میلیاردم'
         )
+        assert_equal(words(1e16), 'یک در ده به توان شانزده')
+        assert_equal(words(-1e15), 'منفی یک بیلیارد')
+        assert_equal(words(2.5e-300), 'دو و پنج دهم در ده به توان منفی سیصد')
+        for number in (float('inf'), float('-inf'), float('nan')):
+            self.assertRaises(ValueError, words, number)
+        # Floats convert like their repr
+        random = Random(0)
+        for _ in range(1000):
+            number = random.uniform(-1e6, 1e6) * 10.0 ** random.randint(
+                -20, 20)
+            assert_equal(words(number), words(repr(number)))
+
+    def test_float_places(self):
+        assert_equal = self.assertEqual
+        formatter = Formatter(places=2)
+        assert_equal(formatter.words(2.5), 'دو و پنجاه صدم')
+        assert_equal(formatter.words(-0.05), 'منفی پنج صدم')
+        assert_equal(formatter.words(3.0), 'سه')
+        assert_equal(formatter.words(-0.001), 'صفر')
+        # Rounded like format(number, '.2f')
+        assert_equal(formatter.words(0.125), 'دوازده صدم')
+        assert_equal(formatter.words(2.675), 'دو و شصت و هفت صدم')
+        assert_equal(Formatter(places=0).words(1.5), 'دو')
+        assert_equal(formatter.words(7), 'هفت')
+        assert_equal(formatter.words_many([1.25, 0.5]), [
+            'یک و بیست و پنج صدم', 'پنجاه صدم'])
+        self.assertRaises(ValueError, formatter.words, float('inf'))
+        copy = loads(dumps(formatter))
+        assert_equal(copy.places, 2)
+        assert_equal(copy.words(1.5), 'یک و پنجاه صدم')
+        random = Random(0)
+        for _ in range(1000):
+            number = random.uniform(-1e4, 1e4)
+            places = random.randrange(1, 6)
+            integer, fraction = format(abs(number), '.{}f'.format(
+                places)).split('.')
+            expected = formatter.words(int(integer)) if int(integer) else ''
+            if int(fraction):
+                expected += (' و ' if expected else '') + words(
+                    '0.' + fraction)
+            if number < 0 and expected:
+                expected = 'منفی ' + expected
+            assert_equal(
+                Formatter(places=places).words(number), expected or 'صفر')
+
+    def test_exponent_words(self):
+        assert_equal = self.assertEqual
+        engine = num2fawords._engine()
+        for exponent in range(-450, 451):
+            for text in (
+                str(exponent), '{:+d}'.format(exponent),
+                '{:+03d}'.format(exponent),
+            ):
+                assert_equal(
+                    engine.exponent_words(text, 'مثبت ', 'منفی '),
+                    engine.signed_int_words(exponent, 'مثبت ', 'منفی '),
+                )
+        assert_equal(words(1e-07), 'یک در ده به توان منفی هفت')
+        assert_equal(words('2e+0'), 'دو در ده به توان صفر')
+        assert_equal(words('2e۱۲'), 'دو در ده به توان دوازده')
+        assert_equal(
+            words(5e-324, positive='مثبت '),
+            'مثبت پنج در ده به توان منفی سیصد و بیست و چهار')
+
+    def test_normalize_mantissa(self):
+        assert_equal = self.assertEqual
+        formatter = Formatter(normalize_mantissa=True)
+        for number, normalized in (
+            ('12.50e3', '1.25e4'),
+            ('-0.0025E-3', '-2.5e-6'),
+            ('+1,200.0e+2', '+1.2e5'),
+            ('۱۲٫۵e۳', '1.25e4'),
+            (Decimal('1.20E+5'), '1.2e5'),
+            ('0e5', '0e5'),
+            ('1.5', '1.5'),
+            ('1/20', '1/20'),
+            (1.5e-07, 1.5e-07),
+        ):
+            assert_equal(formatter.words(number), words(normalized))
+        assert_equal(formatter.words_many(['12e3', Decimal('1E+2')]), [
+            words('1.2e4'), words('1e2')])
+        self.assertRaises(ValueError, formatter.words, '1e5x')
+        copy = loads(dumps(formatter))
+        self.assertIs(copy.normalize_mantissa, True)
+        assert_equal(copy.words('10e1'), words('1e2'))
+        assert_equal(Formatter().words('10e1'), words('10e1'))
 
     def test_value_errors(self):
-        self.assertRaises(
-            ValueError,
-            words,
-            1234567890123456789012345678901234567
+        self.assertRaises(ValueError, words, '۱۲a')
+        self.assertRaises(ValueError, words, '1.2.3')
+        # Without the classes there is nothing to compose larger scales from
+        self.assertRaises(ValueError, Formatter(classes=['']).words, 1000)
+
+    def test_large_numbers(self):
+        assert_equal = self.assertEqual
+        assert_equal(words(10 ** 33), 'یک کوانتینیارد')
+        assert_equal(words(10 ** 36), 'یک هزار کوانتینیارد')
+        assert_equal(
+            words(1234567890123456789012345678901234567),
+            'یک هزار و دویست و سی و چهار کوانتینیارد و'
+            ' پانصد و شصت و هفت کوینتیلیون و هشتصد و نود کادریلیارد و'
+            ' یکصد و بیست و سه کوآدریلیون و چهارصد و پنجاه و شش ترلیارد و'
+            ' هفتصد و هشتاد و نه تریلیون و دوازده بیلیارد و سیصد و چهل و پنج'
+            ' بیلیون و ششصد و هفتاد و هشت میلیارد و نهصد و یک میلیون و'
+            ' دویست و سی و چهار هزار و پانصد و شصت و هفت',
+        )
+        assert_equal(
+            words(-2 * 10 ** 66 - 1),
+            'منفی دو کوانتینیارد کوانتینیارد و یک',
         )
+        assert_equal(
+            ordinal_words(10 ** 69), 'یک هزار کوانتینیارد کوانتینیاردم')
+        assert_equal(words('0.' + '0' * 36 + '5'), 'پنج ده هزار کوانتینیاردم')
+        assert_equal(parse_words('پنج ده هزار کوانتینیاردم'), Decimal('5E-37'))
+        # Strings longer than the digit limit of int
+        assert_equal(words('12' + '0' * 6000), words(12 * 10 ** 6000))
+        # The names of the last class nest, so the words grow linearly
+        assert_equal(
+            words(2 * 10 ** 69 + 3 * 10 ** 33 + 4),
+            'دو هزار کوانتینیارد و سه کوانتینیارد و چهار',
+        )
+        assert_equal(
+            words(10 ** 69 + 2 * 10 ** 39),
+            'یک هزار کوانتینیارد و دو میلیون کوانتینیارد',
+        )
+        assert_equal(len(words('7' * 16000)), 163866)
+        for n in (
+            10 ** 36, 7 ** 100, 10 ** 99 + 10 ** 40, 10 ** 69 + 2 * 10 ** 39,
+            int('123' * 100),
+        ):
+            assert_equal(parse_words(words(n)), n)
+            assert_equal(parse_words(words(-n)), -n)
+            assert_equal(parse_words(ordinal_words(n), ordinal=True), n)
+
+    def test_int_groups(self):
+        assert_equal = self.assertEqual
+        int_groups = num2fawords._int_groups
+        split_bits = num2fawords._SPLIT_BITS
+
+        def peeled_groups(number):
+            groups = []
+            while number:
+                number, group = divmod(number, 1000)
+                groups.append(group)
+            return groups
+
+        random = Random(0)
+        numbers = [
+            1 << split_bits, (1 << split_bits) - 1, 1000 ** 400 * 7 + 5,
+            10 ** 3000, 10 ** 3000 - 1, 999 * 1000 ** 2000 + 1,
+        ]
+        numbers += [random.getrandbits(bits) | 1 << bits - 1 for bits in (
+            split_bits + 1, 2 * split_bits, 5 * split_bits + 7, 20000)]
+        for n in numbers:
+            self.assertGreater(n.bit_length(), split_bits - 1)
+            groups = int_groups(n)
+            assert_equal(groups, peeled_groups(n))
+            self.assertTrue(groups[-1])
+        # The halves are padded with zero groups
+        assert_equal(int_groups(1000 ** 400 * 7 + 5), [5] + [0] * 399 + [7])
+        groups = []
+        num2fawords._split_groups(10 ** 3000 + 1, groups, 1005)
+        assert_equal(groups, [1] + [0] * 999 + [1, 0, 0, 0, 0])
+        n = 10 ** 600 + 1
+        assert_equal(parse_words(words(n)), n)
+        assert_equal(words(n), words(str(n)))
 
     def test_str_input(self):
         assert_equal = self.assertEqual
@@ -174,11 +395,51 @@ class Number2FarsiWord(TestCase):
         self.assertTrue(beyond_float.endswith(''))
         # Decimal(float('1.1'))
         # == Decimal('1.100000000000000088817841970012523233890533447265625')
-        self.assertRaises(ValueError, words, Decimal(1.1))
+        self.assertTrue(words(Decimal(1.1)).endswith(
+            ' و ششصد و بیست و پنج تریلیون کوانتینیاردم'))
 
     def test_unsupported_input_type(self):
         self.assertRaises(TypeError, words, [])
 
+    def test_register_builtin_type(self):
+        original = words.dispatch(int)
+        words.register(int, lambda number, *args: 'int')
+        try:
+            self.assertEqual(words(1), 'int')
+            self.assertEqual(words(True), 'int')
+        finally:
+            words.register(int, original)
+        self.assertEqual(words(1), 'یک')
+
+    def test_register_without_options(self):
+        class Point:
+            pass
+
+        class Amount:
+            def __init__(self, value):
+                self.value = value
+
+        @words.register(Point)
+        def point_words(point):
+            return 'نقطه'
+
+        @words.register(Amount)
+        def amount_words(amount, positive='', negative='منفی ', *args):
+            return words(amount.value, positive, negative) + ' ریال'
+
+        self.assertEqual(words(Point()), 'نقطه')
+        self.assertEqual(words_many([Point(), 1]), ['نقطه', 'یک'])
+        # Only the options that differ from the defaults are passed.
+        self.assertRaises(TypeError, words, Point(), negative='منهای ')
+        self.assertEqual(
+            words(Amount(-2), negative='منهای '), 'منهای دو ریال')
+        enable_cache()
+        try:
+            self.assertEqual(words(Point()), 'نقطه')
+            self.assertEqual(words(Amount(5)), 'پنج ریال')
+        finally:
+            disable_cache()
+
     def test_fractions(self):
         assert_equal = self.assertEqual
         assert_equal(words(Fraction(16, -10)), 'منفی هشت پنجم')
@@ -192,6 +453,14 @@ class Number2FarsiWord(TestCase):
         assert_equal(words('۱'), 'یک')
         assert_equal(words('۱٫۱'), 'یک و یک دهم')
         assert_equal(words('۱٬۰۰۰'), 'یک هزار')
+        assert_equal(
+            words('-۱۲۳٬۴۵۶٫۷۸'),
+            'منفی یکصد و بیست و سه هزار و چهارصد و پنجاه و شش'
+            ' و هفتاد و هشت صدم',
+        )
+        assert_equal(words('1_000E-۳'), 'یک هزار در ده به توان منفی سه')
+        assert_equal(words('۶/-۵'), 'شش منفی پنجم')
+        assert_equal(words('+0.5', positive='مثبت '), 'پنج دهم')
 
     def test_negative_float(self):
         assert_equal = self.assertEqual
@@ -300,6 +569,803 @@ class Number2FarsiWord(TestCase):
         assert_equal(words('1/2'), 'یک دوم')
         assert_equal(words('1e2'), 'یک در ده به توان دو')
 
+    def test_customized_tables(self):
+        assert_equal = self.assertEqual
+        assert_equal(words(170), 'یکصد و هفتاد')
+        HUNDREDS[1] = 'صد'
+        try:
+            assert_equal(words(170), 'صد و هفتاد')
+            assert_equal(words(100100), 'صد هزار و صد')
+        finally:
+            HUNDREDS[1] = 'یکصد'
+        assert_equal(words(170), 'یکصد و هفتاد')
+        # Rebinding a table
+        hundreds = list(HUNDREDS)
+        hundreds[1] = 'صد'
+        num2fawords.HUNDREDS = hundreds
+        try:
+            assert_equal(words(170), 'صد و هفتاد')
+            num2fawords.HUNDREDS[2] = 'دوصد'
+            assert_equal(words(270), 'دوصد و هفتاد')
+            with patch.object(num2fawords, 'CLASSES', ['', ' هزار']):
+                assert_equal(words(10 ** 6), 'یک هزار هزار')
+            assert_equal(words(10 ** 6), 'یک میلیون')
+        finally:
+            num2fawords.HUNDREDS = HUNDREDS
+        assert_equal(words(270), 'دویست و هفتاد')
+        assert_equal(Formatter().words(170), 'یکصد و هفتاد')
+
+    def test_words_many(self):
+        assert_equal = self.assertEqual
+        numbers = [0, 7, -12, 1000, 1.5, '۱/۲', Decimal('-3.14')]
+        assert_equal(words_many(numbers), [words(n) for n in numbers])
+        assert_equal(words_many(iter([2, -2]), negative='منهای '), [
+            'دو', 'منهای دو',
+        ])
+        assert_equal(words_many([]), [])
+
+    def test_words_many_columns(self):
+        assert_equal = self.assertEqual
+        random = Random(0)
+        fractions = [
+            Fraction(random.randrange(-999, 999), random.choice((3, 100, 360)))
+            for _ in range(200)]
+        decimals = [
+            Decimal(random.randrange(-10 ** 9, 10 ** 9)).scaleb(
+                -random.randrange(12)) for _ in range(200)
+        ] + [Decimal('1.00'), Decimal('-0.0'), Decimal('1E+5'), Decimal(0)]
+        mixed = [Fraction(1, 2), 7, '3/4', Decimal('2.5'), 1.5]
+        options = {
+            'positive': 'مثبت ', 'decimal_separator': ' ممیز ',
+            'fraction_separator': ' بر ', 'ordinal_denominator': False,
+        }
+        for numbers in (fractions, decimals, mixed):
+            assert_equal(words_many(numbers), [words(n) for n in numbers])
+            assert_equal(
+                words_many(numbers, **options),
+                [words(n, **options) for n in numbers])
+            formatter = Formatter(**options)
+            assert_equal(
+                formatter.words_many(numbers),
+                [formatter.words(n) for n in numbers])
+        self.assertRaises(ValueError, words_many, [Decimal('NaN')])
+        words.register(Fraction, lambda *_: 'custom')
+        try:
+            assert_equal(words_many([Fraction(1, 2)]), ['custom'])
+        finally:
+            words.register(Fraction, num2fawords._fraction_words)
+
+    def test_words_many_workers(self):
+        assert_equal = self.assertEqual
+        numbers = list(range(-3000, 3000)) + [1.5, '۱/۲', Fraction(1, 3)]
+        HUNDREDS[1] = 'صد'
+        try:
+            assert_equal(
+                words_many(numbers, negative='منهای ', workers=2),
+                words_many(numbers, negative='منهای '),
+            )
+        finally:
+            HUNDREDS[1] = 'یکصد'
+        assert_equal(
+            words_many(iter(numbers), workers=2), words_many(numbers),
+        )
+        self.assertRaises(ValueError, words_many, ['1', 'x'], workers=2)
+        # Custom implementations are not available to the workers, the
+        # numbers are converted serially instead.
+        words.register(Fraction, lambda *_: 'custom')
+        try:
+            self.assertIs(num2fawords._custom_types(), True)
+            assert_equal(
+                words_many([Fraction(1, 2)] * 2, workers=2),
+                ['custom', 'custom'],
+            )
+        finally:
+            words.register(Fraction, num2fawords._fraction_words)
+
+    @skipUnless(numpy, 'requires numpy')
+    def test_words_many_ndarray(self):
+        assert_equal = self.assertEqual
+        ints = numpy.array([
+            [0, 1, -5, 1001, 123456789],
+            [10 ** 18, -2 ** 63, 2 ** 63 - 1, 1000000, -999],
+        ])
+        result = words_many(ints, positive='مثبت ')
+        assert_equal(result.dtype, object)
+        assert_equal(result.shape, ints.shape)
+        assert_equal(result.tolist(), [
+            [words(n, positive='مثبت ') for n in row]
+            for row in ints.tolist()
+        ])
+        uints = numpy.array([2 ** 64 - 1, 0, 20], dtype=numpy.uint64)
+        assert_equal(
+            words_many(uints).tolist(), [words(n) for n in uints.tolist()],
+        )
+        naturals = numpy.arange(2000, dtype=numpy.int32)
+        assert_equal(
+            words_many(naturals).tolist(), [words(n) for n in range(2000)])
+        assert_equal(words_many(numpy.array(-7)).tolist(), 'منفی هفت')
+        words.register(int, lambda number, *args: 'int')
+        try:
+            assert_equal(words_many(uints).tolist(), ['int'] * 3)
+        finally:
+            words.register(int, num2fawords._int_words)
+        floats = numpy.array([1.5, -0.25])
+        assert_equal(
+            words_many(floats).tolist(),
+            ['یک و پنج دهم', 'منفی بیست و پنج صدم'],
+        )
+        many = numpy.arange(-5000, 5000).reshape(100, 100)
+        assert_equal(
+            words_many(many, workers=2).tolist(), words_many(many).tolist(),
+        )
+
+    def test_transliterate_text(self):
+        assert_equal = self.assertEqual
+        text = (
+            'سال ۱۴۰۲، مبلغ 1,250,000 ریال (۱۲٫۵ درصد) برای ۳/۴ سهم،'
+            ' صفحه 10-12، -3 و 1,2 در ۱۴۰۲/۰۵/۱۲.'
+        )
+        expected = (
+            'سال یک هزار و چهارصد و دو، مبلغ یک میلیون و دویست و پنجاه هزار'
+            ' ریال (دوازده و پنج دهم درصد) برای سه چهارم سهم، صفحه'
+            ' ده-دوازده، منفی سه و یک,دو در یک هزار و چهارصد و دو/پنج/دوازده.'
+        )
+        assert_equal(''.join(transliterate_text(text)), expected)
+        assert_equal(''.join(transliterate_text(StringIO(text))), expected)
+        # Numbers split between chunks
+        for i in range(len(text) + 1):
+            chunks = [text[:i], text[i:i + 3], text[i + 3:]]
+            assert_equal(''.join(transliterate_text(chunks)), expected)
+        assert_equal(
+            ''.join(transliterate_text(['1.5'], decimal_separator=' ممیز ')),
+            'یک ممیز پنج دهم',
+        )
+        assert_equal(
+            ''.join(Formatter(negative='منهای ').transliterate_text(['-2'])),
+            'منهای دو',
+        )
+        # Numbers that cannot be converted are left unchanged
+        assert_equal(
+            ''.join(Formatter(classes=['']).transliterate_text(['1 1000'])),
+            'یک 1000',
+        )
+
+    def test_lazy_words(self):
+        assert_equal = self.assertEqual
+        w = lazy_words(-2300005.25)
+        self.assertIsInstance(w, NumberWords)
+        assert_equal(w.sign, 'منفی ')
+        assert_equal(list(w.integer), [5, 300, 2])
+        assert_equal(list(w.fraction), [25])
+        assert_equal(w.places, 2)
+        self.assertIsNone(w.denominator)
+        self.assertIsNone(w.exponent)
+        assert_equal(
+            w.integer_classes(), ['دو میلیون', 'سیصد هزار', 'پنج'])
+        assert_equal(w.integer_words, 'دو میلیون و سیصد هزار و پنج')
+        assert_equal(w.fraction_words, 'بیست و پنج صدم')
+        assert_equal(len(w), len(words(-2300005.25)))
+        assert_equal(w, words(-2300005.25))
+        # the parts and their words are only computed once
+        self.assertIs(w.integer, w.integer)
+        self.assertIs(w.integer_words, w.integer_words)
+        self.assertIs(str(w), str(w))
+        w = lazy_words('12345' * 300 + '.5')  # more than 1000 digits
+        assert_equal(len(w.integer), 500)
+        assert_equal(str(w), words('12345' * 300 + '.5'))
+        w = lazy_words('۱٫۵e-7', scientific_separator=' ضرب در ده به توان ')
+        assert_equal(w.exponent, -7)
+        assert_equal(w.exponent_words, 'منفی هفت')
+        assert_equal(str(w), 'یک و پنج دهم ضرب در ده به توان منفی هفت')
+        w = lazy_words('0.5')
+        self.assertIsNone(w.integer)
+        assert_equal(w.integer_words, '')
+        w = lazy_words(Fraction(-1, 3))
+        assert_equal(w.denominator_words, 'سوم')
+        assert_equal(repr(w), "NumberWords('منفی یک سوم')")
+        assert_equal(
+            Formatter(negative='منهای ').lazy_words(-5), 'منهای پنج')
+        random = Random(0)
+        values = [
+            '1.00', '00', '-0', '1_000', '3/04', '1,234.5', 0, -0.0, 1e300,
+            True, 10 ** 200, Decimal('0E-7'),
+        ] + [random.randrange(-10 ** 40, 10 ** 40) for _ in range(100)] + [
+            random.random() * 10 ** random.randrange(-30, 30)
+            for _ in range(100)
+        ] + [
+            Decimal(random.randrange(-10 ** 12, 10 ** 12)).scaleb(
+                -random.randrange(20)) for _ in range(100)
+        ] + [
+            Fraction(random.randrange(-999, 999), random.randrange(1, 10 ** 6))
+            for _ in range(100)
+        ]
+        options = {
+            'positive': 'مثبت ', 'decimal_separator': ' ممیز ',
+            'fraction_separator': ' بر ', 'ordinal_denominator': False,
+        }
+        for value in values:
+            assert_equal(str(lazy_words(value)), words(value))
+            assert_equal(
+                str(lazy_words(value, **options)), words(value, **options))
+        self.assertRaises(ValueError, lazy_words, 'inf')
+        self.assertRaises(TypeError, lazy_words, [1])
+        # Fractions with a decimal or scientific numerator, and signed
+        # denominators, are handled the same way by words.
+        for value in ('1.5/2', '1e5/2', '-1.5/2', '۱٫۵/۲', '3/-4', '3/-0'):
+            for kwargs in ({}, options, {'negative': 'منهای '}):
+                try:
+                    expected = words(value, **kwargs)
+                except ValueError as e:
+                    with self.assertRaises(ValueError) as cm:
+                        str(lazy_words(value, **kwargs))
+                    assert_equal(cm.exception.args, e.args)
+                else:
+                    assert_equal(str(lazy_words(value, **kwargs)), expected)
+        assert_equal(lazy_words('3/-4').denominator_words, 'منفی چهارم')
+
+    def test_formatter(self):
+        assert_equal = self.assertEqual
+        default = Formatter()
+        for number in (
+            0, -7, 1235, 1.1, -1.1e-9, '۱٬۰۰۰', '-1/2', '1e2', Decimal('3.14'),
+            Fraction(-2, 5),
+        ):
+            assert_equal(default.words(number), words(number))
+        assert_equal(default.ordinal_words(23), 'بیست و سوم')
+        assert_equal(default.words(True), 'یک')
+        self.assertRaises(TypeError, default.words, [])
+
+        options = {
+            'positive': 'مثبت ',
+            'negative': 'منهای ',
+            'decimal_separator': ' ممیز ',
+            'fraction_separator': ' روی ',
+            'ordinal_denominator': False,
+            'scientific_separator': ' در ده به نمای ',
+        }
+        formatter = Formatter(
+            hundreds=HUNDREDS[:1] + ['صد'] + HUNDREDS[2:], **options)
+        for number in (7, -1.5, '+9', '-1/10', '1e2', Fraction(1, 3)):
+            assert_equal(formatter.words(number), words(number, **options))
+        assert_equal(formatter.words(170), 'مثبت صد و هفتاد')
+        assert_equal(formatter.ordinal_words(-100), 'منهای صدم')
+        assert_equal(formatter.words_many([1, '-2']), ['مثبت یک', 'منهای دو'])
+
+    def test_formatter_is_independent(self):
+        assert_equal = self.assertEqual
+        formatter = Formatter(decimal_separator=' ممیز ')
+        HUNDREDS[1] = 'صد'
+        change_defaults(decimal_separator=' و ')
+        try:
+            assert_equal(formatter.words(100.5), 'یکصد ممیز پنج دهم')
+        finally:
+            HUNDREDS[1] = 'یکصد'
+            reset_defaults()
+        with self.assertRaises(AttributeError):
+            formatter.positive = 'مثبت '
+        copy = loads(dumps(formatter))
+        assert_equal(copy.words(100.5), 'یکصد ممیز پنج دهم')
+        assert_equal(repr(copy), repr(formatter))
+
+    def test_cache(self):
+        assert_equal = self.assertEqual
+        self.assertIsNone(cache_info())
+        enable_cache(2)
+        try:
+            assert_equal(words('170'), 'یکصد و هفتاد')
+            assert_equal(words('170'), 'یکصد و هفتاد')
+            assert_equal(cache_info()[:2], (1, 1))
+            # Equal values of different types or precisions are not mixed up
+            assert_equal(words(170.0), 'یکصد و هفتاد')
+            assert_equal(words(Decimal('1.0')), 'یک')
+            assert_equal(words(Decimal('1.10')), 'یک و ده صدم')
+            assert_equal(words('1', positive='مثبت '), 'مثبت یک')
+            assert_equal(cache_info().currsize, 2)
+            assert_equal(ordinal_words('3'), 'سوم')
+            assert_equal(ordinal_words('3'), 'سوم')
+            # The C engine converts ints faster than they are looked up
+            hits, misses = cache_info()[:2]
+            assert_equal(words(170), 'یکصد و هفتاد')
+            assert_equal(ordinal_words(3), 'سوم')
+            assert_equal(
+                cache_info()[:2] == (hits, misses), num2fawords._C_ENGINE)
+            # Results are never stale
+            HUNDREDS[1] = 'صد'
+            try:
+                assert_equal(words('170'), 'صد و هفتاد')
+                assert_equal(words(170), 'صد و هفتاد')
+            finally:
+                HUNDREDS[1] = 'یکصد'
+            assert_equal(words('170'), 'یکصد و هفتاد')
+            change_defaults(negative='منهای ')
+            try:
+                assert_equal(words('-170'), 'منهای یکصد و هفتاد')
+                assert_equal(words(-170), 'منهای یکصد و هفتاد')
+            finally:
+                reset_defaults()
+            assert_equal(cache_info().currsize, 0)
+            cache_clear()
+            assert_equal(cache_info()[:], (0, 0, 2, 0))
+            # Misses take the same paths as uncached calls
+            numbers = [7, -7, '۱۲', 2.5, Decimal('2.50'), Fraction(1, 3)]
+            expected = [words(n, negative='منهای ') for n in numbers]
+            with patch.object(num2fawords, '_CACHE', None):
+                assert_equal(
+                    [words(n, negative='منهای ') for n in numbers], expected)
+            # Registering an implementation clears the cache, and Decimals
+            # are still dispatched by type.
+            assert_equal(words(Fraction(1, 2)), 'یک دوم')
+            assert_equal(words(Decimal('2.50')), 'دو و پنجاه صدم')
+            words.register(Fraction, lambda number: 'کسر')
+            words.register(Decimal, lambda number: 'اعشاری')
+            try:
+                assert_equal(words(Fraction(1, 2)), 'کسر')
+                assert_equal(words(Decimal('2.50')), 'اعشاری')
+                assert_equal(words('2.50'), 'دو و پنجاه صدم')
+            finally:
+                words.register(Fraction, num2fawords._fraction_words)
+                words.register(Decimal, num2fawords._str_words)
+            assert_equal(words(Fraction(1, 2)), 'یک دوم')
+            assert_equal(words(Decimal('2.50')), 'دو و پنجاه صدم')
+        finally:
+            disable_cache()
+        self.assertIsNone(cache_info())
+
+    def test_stats(self):
+        assert_equal = self.assertEqual
+        self.assertIsNone(stats_info())
+        events = []
+        enable_stats(lambda name, seconds: events.append(name))
+        try:
+            assert_equal(words(12), 'دوازده')
+            assert_equal(words('۱٬۲۰۰'), 'یک هزار و دویست')
+            assert_equal(ordinal_words(3), 'سوم')
+            assert_equal(Formatter().words(Fraction(1, 3)), 'یک سوم')
+            change_defaults()
+            info = stats_info()
+            assert_equal(info['type:int']['calls'], 2)
+            assert_equal(info['type:str']['calls'], 1)
+            assert_equal(info['type:Fraction']['calls'], 1)
+            assert_equal(info['str_words']['calls'], 1)
+            assert_equal(info['natural_words']['calls'], 1)
+            assert_equal(info['ordinal_words']['calls'], 2)
+            assert_equal(info['build_engine']['calls'], 2)
+            assert_equal(info['change_defaults']['calls'], 1)
+            str_words = info['str_words']
+            self.assertLessEqual(
+                str_words['self_seconds'], str_words['seconds'])
+            assert_equal(sorted(set(events)), sorted(info))
+            stats_clear()
+            assert_equal(stats_info(), {})
+        finally:
+            disable_stats()
+        self.assertIsNone(stats_info())
+        self.assertIs(type(num2fawords._engine()), num2fawords._Engine)
+
+    def run_cli(self, args, stdin=''):
+        stdout, stderr = StringIO(), StringIO()
+        with patch('sys.stdin', StringIO(stdin)), redirect_stdout(stdout), \
+                redirect_stderr(stderr):
+            status = cli_main(args)
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_persistent_cache(self):
+        assert_equal = self.assertEqual
+        numbers = [1403, 1403.0, '1403', Decimal('2.50'), Fraction(1, 3), 1]
+        expected = [words(n) for n in numbers]
+        with TemporaryDirectory() as directory:
+            path = directory + '/words.sqlite'
+            with PersistentCache(path) as cache:
+                assert_equal(cache.words_many(numbers), expected)
+                assert_equal(len(cache), 6)
+                assert_equal(cache.words(-7), 'منفی هفت')
+                assert_equal(cache.ordinal_words(3), 'سوم')
+                assert_equal(cache.words(True), 'یک')  # not cached
+                assert_equal(len(cache), 8)
+            with PersistentCache(path) as cache:
+                assert_equal(len(cache), 8)
+                with patch.object(
+                    cache, 'formatter', Formatter(negative='منهای '),
+                ):  # every value is read from the database
+                    assert_equal(cache.words_many(numbers), expected)
+                    assert_equal(cache.words(-7), 'منفی هفت')
+                    assert_equal(cache.ordinal_words(3), 'سوم')
+            formatter = Formatter(negative='منهای ')
+            with PersistentCache(path, formatter) as cache:
+                assert_equal(len(cache), 0)
+                assert_equal(cache.words(-7), 'منهای هفت')
+                cache.clear()
+                assert_equal(len(cache), 0)
+            with PersistentCache(path) as cache:
+                assert_equal(len(cache), 8)
+                # more digits than str(int) allows
+                large = [10 ** 4400 + 1, -10 ** 4400, Fraction(1, 10 ** 4400)]
+                expected = [words(n) for n in large]
+                assert_equal(cache.words_many(large), expected)
+                assert_equal(len(cache), 11)
+                assert_equal(cache.words_many(large), expected)
+
+    def test_aio(self):
+        assert_equal = self.assertEqual
+        formatter = Formatter(decimal_separator=' ممیز ')
+        numbers = [1.5, '۱۲', Decimal('-2.5'), Fraction(1, 3), 10 ** 40]
+        expected = formatter.words_many(numbers)
+        assert_equal(run(awords(1.5, formatter)), 'یک ممیز پنج دهم')
+        assert_equal(run(awords(1.5)), 'یک و پنج دهم')
+        assert_equal(run(awords_many(numbers, formatter)), expected)
+        assert_equal(
+            run(awords_many(numbers, formatter, chunk_size=2)), expected)
+        with ThreadPoolExecutor(1) as executor:
+            assert_equal(run(awords_many(
+                numbers, formatter, executor=executor, offload_digits=10,
+            )), expected)
+            assert_equal(run(awords_many(
+                numbers, formatter, executor=executor, offload_size=5,
+            )), expected)
+            assert_equal(run(awords(
+                10 ** 40, formatter, executor=executor, offload_digits=10,
+            )), formatter.words(10 ** 40))
+
+    def test_cli(self):
+        assert_equal = self.assertEqual
+        assert_equal(self.run_cli(['42']), (0, 'چهل و دو\n', ''))
+        assert_equal(self.run_cli(['3', '-o']), (0, 'سوم\n', ''))
+        assert_equal(self.run_cli(['-o', '-3']), (0, 'منفی سوم\n', ''))
+        assert_equal(self.run_cli(['-.5']), (0, 'منفی  و پنج دهم\n', ''))
+        assert_equal(
+            self.run_cli(['1.5', '--decimal-separator', ' ممیز ']),
+            (0, 'یک ممیز پنج دهم\n', ''),
+        )
+
+    def test_cli_stdin(self):
+        assert_equal = self.assertEqual
+        assert_equal(
+            self.run_cli(['-'], '1\n۲۳\r\n-1/2\n'),
+            (0, 'یک\nبیست و سه\nمنفی یک دوم\n', ''),
+        )
+        assert_equal(
+            self.run_cli(
+                ['--stdin', '-0', '--ordinal', '--negative', 'منهای '],
+                '1\0-3',
+            ),
+            (0, 'یکم\0منهای سوم\0', ''),
+        )
+        assert_equal(
+            self.run_cli(['--stdin', '--no-ordinal-denominator'], '1/2\n'),
+            (0, 'یک دو\n', ''),
+        )
+        # Stop at the first invalid number by default
+        status, stdout, stderr = self.run_cli(['-'], '1\nabc\n2\n')
+        assert_equal((status, stdout), (1, 'یک\n'))
+        self.assertIn("record 2: 'abc'", stderr)
+        status, stdout, stderr = self.run_cli(['-', '-k'], '1\n\n2\n')
+        assert_equal((status, stdout), (1, 'یک\n\nدو\n'))
+        self.assertIn("record 2: ''", stderr)
+        status, stdout, stderr = self.run_cli(
+            ['-', '-k', '-j', '2'], '1\n\n2\n')
+        assert_equal((status, stdout), (1, 'یک\n\nدو\n'))
+        self.assertIn("record 2: ''", stderr)
+
+    def test_convert_column(self):
+        assert_equal = self.assertEqual
+        source = 'id;amount\r\n1;1403\r\n2;\r\n3;-2.5\r\n4;1/3\r\n5\r\n'
+        expected = (
+            'id;amount;words\r\n1;1403;{}\r\n2;;\r\n3;-2.5;{}\r\n'
+            '4;1/3;{}\r\n5;;\r\n'
+        ).format(words(1403), words(-2.5), words(Fraction(1, 3)))
+        for batch_size in (1, 2, 100):
+            destination = StringIO()
+            assert_equal(convert_column(
+                StringIO(source), destination, 'amount', delimiter=';',
+                output_column='words', batch_size=batch_size,
+            ), 0)
+            assert_equal(destination.getvalue(), expected)
+        with TemporaryDirectory() as directory:
+            path = directory + '/in.csv'
+            with open(path, 'w', encoding='utf8') as f:
+                f.write('n,x\n1,۲\n3,a\n')
+            assert_equal(convert_column(
+                path, directory + '/out.csv', 'n', ordinal=True,
+                formatter=Formatter(negative='منهای '),
+            ), 0)
+            with open(directory + '/out.csv', encoding='utf8') as f:
+                assert_equal(f.read(), 'n,x,n_words\n1,۲,یکم\n3,a,سوم\n')
+            with self.assertRaisesRegex(ValueError, "row 2: 'a'"):
+                convert_column(path, StringIO(), 'x')
+            with redirect_stderr(StringIO()) as stderr:
+                destination = StringIO()
+                assert_equal(convert_column(
+                    path, destination, 'x', keep_going=True), 1)
+            assert_equal(
+                destination.getvalue(), 'n,x,x_words\r\n1,۲,دو\r\n3,a,\r\n')
+            self.assertIn("row 2: 'a'", stderr.getvalue())
+        with self.assertRaisesRegex(ValueError, "no column named 'y'"):
+            convert_column(StringIO('x\n1\n'), StringIO(), 'y')
+        with self.assertRaisesRegex(ValueError, 'empty'):
+            convert_column(StringIO(''), StringIO(), 'y')
+        with self.assertRaisesRegex(ValueError, 'unknown file format'):
+            convert_column(StringIO(''), StringIO(), 'y', file_format='xls')
+        assert_equal(
+            self.run_cli(['column', '-', '-', 'n', '-o'], 'n\n1\n'),
+            (0, 'n,n_words\r\n1,یکم\r\n', ''),
+        )
+        status, stdout, stderr = self.run_cli(
+            ['column', '-', '-', 'n'], 'n\n1\nabc\n')
+        assert_equal((status, stdout), (1, 'n,n_words\r\n'))
+        self.assertIn("row 2: 'abc'", stderr)
+
+    @skipUnless(pyarrow, 'requires pyarrow')
+    def test_convert_column_parquet(self):
+        table = pyarrow.table({
+            'int': [1, 2, -3, 10 ** 12],
+            'nullable': [1, None, 3, 4],
+            'str': ['1.5', '', None, '۱۲'],
+        })
+        with TemporaryDirectory() as directory:
+            source = directory + '/in.parquet'
+            destination = directory + '/out.parquet'
+            pyarrow.parquet.write_table(table, source)
+            for column, ordinal in (
+                ('int', False), ('int', True), ('nullable', False),
+                ('nullable', True), ('str', False),
+            ):
+                convert = ordinal_words if ordinal else words
+                self.assertEqual(convert_column(
+                    source, destination, column, batch_size=3,
+                    ordinal=ordinal,
+                ), 0)
+                result = pyarrow.parquet.read_table(destination)
+                self.assertEqual(
+                    result.column_names,
+                    table.column_names + [column + '_words'],
+                )
+                self.assertEqual(
+                    result.column(column + '_words').to_pylist(),
+                    [None if v in (None, '') else convert(v)
+                     for v in table.column(column).to_pylist()],
+                )
+
+    def test_threads(self):
+        """Convert in threads while other threads change the module state.
+
+        Formatters must not be affected at all. Module functions must use
+        either the old or the new tables and defaults, never a mix, and
+        after the changes they must use the final ones.
+        """
+        random = Random(0)
+        numbers = [random.randrange(10 ** 12) for _ in range(50)]
+        numbers += [str(n) for n in numbers[:20]] + [
+            -105.5, Fraction(-101, 7), Decimal('100.25'), '1.5e-7']
+        formatter = Formatter()
+        hundreds = HUNDREDS[:1] + ['صد'] + HUNDREDS[2:]
+        accepted = {n: set() for n in numbers}
+        for options in ({}, {'negative': 'منهای '}):
+            for tables in ({}, {'hundreds': hundreds}):
+                other = Formatter(**options, **tables)
+                for n in numbers:
+                    accepted[n].add(other.words(n))
+        expected = formatter.words_many(numbers)
+        failures = []
+
+        def convert():
+            for _ in range(30):
+                if formatter.words_many(numbers) != expected:
+                    failures.append('formatter')
+                for n in numbers:
+                    if words(n) not in accepted[n]:
+                        failures.append(n)
+
+        def change_tables():
+            for i in range(200):
+                hundred = 'صد' if i % 2 else 'یکصد'
+                HUNDREDS[1] = hundred
+                # An engine built from the old tables must not be used.
+                if words(100) != hundred:
+                    failures.append(i)
+
+        def change_defaults_():
+            for i in range(100):
+                change_defaults(negative='منهای ' if i % 2 else 'منفی ')
+
+        interval = getswitchinterval()
+        setswitchinterval(1e-6)
+        threads = [Thread(target=convert) for _ in range(4)]
+        threads += [Thread(target=change_tables), Thread(
+            target=change_defaults_)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            setswitchinterval(interval)
+            HUNDREDS[1] = 'یکصد'
+            reset_defaults()
+        self.assertEqual(failures, [])
+        self.assertEqual([words(n) for n in numbers], expected)
+
+    def test_engine_publication(self):
+        """An engine built while the tables change must not be published."""
+        building, proceed = Event(), Event()
+        new_engine = num2fawords._new_engine
+
+        def slow_new_engine(*tables):
+            engine = new_engine(*tables)
+            building.set()
+            proceed.wait(5)
+            return engine
+
+        num2fawords._invalidate_tables()
+        with patch.object(num2fawords, '_new_engine', slow_new_engine):
+            converter = Thread(target=words, args=(100,))
+            converter.start()
+            building.wait(5)
+            modifier = Thread(target=HUNDREDS.__setitem__, args=(1, 'صد'))
+            modifier.start()
+            # The modification waits for the engine to be published.
+            modifier.join(0.1)
+            proceed.set()
+            converter.join()
+            modifier.join()
+        try:
+            self.assertEqual(words(100), 'صد')
+        finally:
+            HUNDREDS[1] = 'یکصد'
+
+    def test_lazy_imports(self):
+        deferred = ('decimal', 'fractions', 'typing', 're', 'argparse')
+        code = (
+            'import sys\n'
+            'from num2fawords import words, Formatter\n'
+            'from num2fawords.__main__ import main\n'
+            "words(1); words(-1.5); words('۱۲'); Formatter().words(2)\n"
+            "main(['-o', '-3'])\n"
+            'print(*[m for m in {!r} if m in sys.modules])'
+        ).format(deferred)
+        output = check_output(
+            [executable, '-S', '-c', code], universal_newlines=True,
+            env={'PYTHONPATH': dirname(dirname(num2fawords.__file__))},
+        )
+        self.assertEqual(output, 'منفی سوم\n\n')
+        # They are still available when needed.
+        self.assertIs(num2fawords.Decimal, Decimal)
+        self.assertEqual(parse_words('یک سوم'), Fraction(1, 3))
+
+        class Numbers(list):
+            pass
+
+        @words.register(Numbers)
+        def numbers_words(numbers, *args):
+            return ' '.join(map(words, numbers))
+        self.assertEqual(words(Numbers([1, 2])), 'یک دو')
+        self.assertIs(words.dispatch(Numbers), numbers_words)
+
+    def test_engine_base(self):
+        engine = num2fawords._engine()
+        python = num2fawords._PyEngineBase
+        random = Random(0)
+        numbers = [0, 7, 1000, 2 ** 63, 10 ** 36 - 1, 10 ** 36, 10 ** 200] + [
+            random.randrange(10 ** random.randrange(1, 40)) for _ in range(500)
+        ]
+        for n in numbers:
+            self.assertEqual(engine.int_words(n), python.int_words(engine, n))
+            self.assertEqual(
+                engine.signed_int_words(-n, 'مثبت ', 'منفی '),
+                python.signed_int_words(engine, -n, 'مثبت ', 'منفی '))
+            self.assertEqual(
+                engine.natural_words('0' + str(n)),
+                python.natural_words(engine, '0' + str(n)))
+            self.assertEqual(
+                engine.ordinal_int_words(n),
+                python.ordinal_int_words(engine, n))
+            self.assertEqual(
+                engine.ordinal_int_words(n * 10 + 3),
+                engine.ordinal_words(n * 10 + 3, '', ''))
+        for digits in ('', '0', '00', '۱۲', '1' * 37, '1' * 300):
+            self.assertEqual(
+                engine.natural_words(digits),
+                python.natural_words(engine, digits))
+        self.assertRaises(ValueError, engine.natural_words, '1a')
+
+    @skipUnless(
+        num2fawords._EngineBase is not num2fawords._PyEngineBase,
+        'the C implementation is not built',
+    )
+    def test_pure_python(self):
+        """Run all the tests using the pure Python implementation too."""
+        env = dict(environ, NUM2FAWORDS_PURE_PYTHON='1')
+        env['PYTHONPATH'] = dirname(dirname(num2fawords.__file__))
+        check_output(
+            [executable, dirname(__file__)], env=env, stderr=STDOUT)
+
+    def test_parse_words(self):
+        assert_equal = self.assertEqual
+        assert_equal(parse_words('صفر'), 0)
+        assert_equal(parse_words('منفی پنج'), -5)
+        assert_equal(parse_words('یک هزار و دویست و سی و پنج'), 1235)
+        assert_equal(parse_words('یک و یک دهم'), Decimal('1.1'))
+        assert_equal(parse_words('پنج و چهل و پنج صدم'), Decimal('5.45'))
+        assert_equal(parse_words('یازده ده میلیونم'), Decimal('0.0000011'))
+        assert_equal(
+            parse_words('یک و یک دهم در ده به توان منفی شش'),
+            Decimal('1.1e-6'),
+        )
+        assert_equal(parse_words('منفی هشت پنجم'), Fraction(-8, 5))
+        assert_equal(parse_words('صفر یکم'), Fraction(0, 1))
+        assert_equal(parse_words('یک دو'), Fraction(1, 2))
+        assert_equal(parse_words('بیست و سوم', ordinal=True), 23)
+        assert_equal(parse_words('یک میلیونم', ordinal=True), 1000000)
+        assert_equal(parse_words('منفی پنجم', ordinal=True), -5)
+        # Ambiguous words, both 0.1001 and 1000.0001
+        assert_equal(parse_words('یک هزار و یک ده هزارم'), Decimal('0.1001'))
+        # Fractions with a power of ten denominator read as decimals
+        assert_equal(words(Fraction(63, 10)), words(Decimal('60.3')))
+        assert_equal(parse_words('شصت و سه دهم'), Decimal('60.3'))
+        assert_equal(parse_words('سه دهم'), Decimal('0.3'))
+        assert_equal(
+            parse_words('شصت و سه دهم', decimal_separator=' ممیز '),
+            Fraction(63, 10))
+        assert_equal(
+            parse_words('سه دهم', decimal_separator=' ممیز '), Decimal('0.3'))
+        for text in ('', 'منفی', 'سلام', 'یک و', 'یک یک یک'):
+            self.assertRaises(ValueError, parse_words, text)
+        # Zero denominators and exponents of fractions
+        for text in ('سه صفر', 'یک صفرم', 'ده بیست در ده به توان ده'):
+            self.assertRaises(ValueError, parse_words, text)
+        self.assertRaises(
+            ValueError, parse_words, 'یک روی صفرم', fraction_separator=' روی ')
+
+    def test_parse_words_options(self):
+        assert_equal = self.assertEqual
+        options = {
+            'positive': 'مثبت ',
+            'negative': 'منهای ',
+            'decimal_separator': ' ممیز ',
+            'fraction_separator': ' روی ',
+            'scientific_separator': ' در ده به نمای ',
+        }
+        assert_equal(parse_words('مثبت نه', **options), 9)
+        assert_equal(
+            parse_words('یک هزار ممیز یک ده هزارم', **options),
+            Decimal('1000.0001'),
+        )
+        assert_equal(
+            parse_words('منهای یک روی ده', **options), Fraction(-1, 10))
+        assert_equal(
+            parse_words('یک در ده به نمای منهای دو', **options),
+            Decimal('0.01'),
+        )
+        change_defaults(decimal_separator=' ممیز ')
+        try:
+            assert_equal(parse_words('یک ممیز یک دهم'), Decimal('1.1'))
+        finally:
+            reset_defaults()
+        formatter = Formatter(hundreds=HUNDREDS[:1] + ['صد'] + HUNDREDS[2:])
+        assert_equal(formatter.parse_words('صد و پنج دهم'), Decimal('100.5'))
+
+    def test_parse_words_round_trip(self):
+        assert_equal = self.assertEqual
+        random = Random(0)
+        options = {
+            'negative': 'منهای ',
+            'decimal_separator': ' ممیز ',
+            'fraction_separator': ' روی ',
+        }
+        for _ in range(300):
+            n = random.randrange(-10 ** 36 + 1, 10 ** 36)
+            assert_equal(parse_words(words(n)), n)
+            assert_equal(parse_words(ordinal_words(n), ordinal=True), n)
+            d = Decimal(random.randrange(-10 ** 9, 10 ** 9)).scaleb(
+                -random.randrange(10)).normalize()
+            # With the default decimal separator the words of some decimals
+            # are ambiguous, but they must be the same words.
+            assert_equal(words(parse_words(words(d))), words(d))
+            assert_equal(parse_words(words(d, **options), **options), d)
+            f = Fraction(
+                random.randrange(-999, 999), random.randrange(1, 10 ** 6))
+            assert_equal(words(parse_words(words(f))), words(f))
+            assert_equal(parse_words(words(f, **options), **options), f)
+
 
 if __name__ == '__main__':  # pragma: no cover
     main()